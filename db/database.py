@@ -9,10 +9,13 @@ Since table names are unique across both databases, all existing SQL queries
 work transparently through a single connection object.
 """
 
+import atexit
 import sqlite3
-import shutil
+import threading
+from contextlib import contextmanager
 from pathlib import Path
 from datetime import datetime
+from types import MappingProxyType
 
 GAME_DATA_DIR = Path(__file__).parent.parent / "game_data"
 UNIVERSE_DB_PATH = GAME_DATA_DIR / "universe.db"
@@ -54,258 +57,715 @@ STARBASE_HP_PER_MODULE = 50
 # CONNECTION MANAGEMENT
 # ======================================================================
 
+# Per-connection tuning. Turn processing is dominated by many small commits,
+# so relax fsync to NORMAL (safe under WAL), keep temp B-trees in memory and
+# give each connection a 64 MB page cache plus 256 MB of mmap I/O. The WAL
+# file is truncated back to 64 MB after checkpoints rather than left at its
+# high-water mark.
+_CONNECTION_PRAGMAS = """
+PRAGMA busy_timeout = 5000;
+PRAGMA synchronous = NORMAL;
+PRAGMA temp_store = MEMORY;
+PRAGMA cache_size = -65536;
+PRAGMA mmap_size = 268435456;
+PRAGMA journal_size_limit = 67108864;
+PRAGMA foreign_keys = ON;
+"""
+
+# Database files already switched to WAL. journal_mode is persistent in the
+# file header, so it only needs setting once per file per process.
+_WAL_DATABASES = set()
+
+# Prepared statements kept per connection by the sqlite3 module (default 128).
+# A turn run (resolver, combat, reports) issues well over 128 distinct
+# statements, so the default cache churns and re-prepares SQL each pass.
+STATEMENT_CACHE_SIZE = 512
+
+
+def _enable_wal(conn, db_path, schema="main"):
+    """Switch a database file to WAL journaling (no-op for :memory:)."""
+    key = str(db_path)
+    if key == ":memory:" or key in _WAL_DATABASES:
+        return
+    mode = conn.execute(f"PRAGMA {schema}.journal_mode = WAL").fetchone()[0]
+    if mode.lower() == "wal":
+        _WAL_DATABASES.add(key)
+
+
+def _configure_connection(conn, db_path):
+    """Apply the standard row factory, PRAGMAs and WAL mode to a new connection."""
+    conn.row_factory = sqlite3.Row
+    conn.executescript(_CONNECTION_PRAGMAS)
+    _enable_wal(conn, db_path)
+
+
+# Secondary indexes on per-ship and per-turn lookup columns. Also part of
+# STATE_SCHEMA; listed here so get_connection() can add them to older DBs.
+STATE_LOOKUP_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_ships_game_system ON ships(game_id, system_id)",
+    "CREATE INDEX IF NOT EXISTS idx_ships_owner ON ships(owner_prefect_id, game_id)",
+    "CREATE INDEX IF NOT EXISTS idx_ships_docked ON ships(docked_at_base_id)",
+    "CREATE INDEX IF NOT EXISTS idx_turn_log_turn ON turn_log(game_id, turn_year, turn_week)",
+    "CREATE UNIQUE INDEX IF NOT EXISTS idx_market_prices_key ON market_prices(game_id, base_id, item_id)",
+    "CREATE INDEX IF NOT EXISTS idx_cargo_ship ON cargo_items(ship_id, item_type_id)",
+    "CREATE INDEX IF NOT EXISTS idx_installed_items_ship ON installed_items(ship_id, component_id)",
+    "CREATE INDEX IF NOT EXISTS idx_officers_ship ON officers(ship_id)",
+    "CREATE INDEX IF NOT EXISTS idx_players_email ON players(email, game_id)",
+    "CREATE INDEX IF NOT EXISTS idx_prefects_player ON prefects(player_id)",
+    "CREATE INDEX IF NOT EXISTS idx_prefects_game ON prefects(game_id)",
+    "CREATE INDEX IF NOT EXISTS idx_starbases_game ON starbases(game_id)",
+    "CREATE INDEX IF NOT EXISTS idx_starbases_port ON starbases(surface_port_id)",
+    "CREATE INDEX IF NOT EXISTS idx_modules_starbase ON installed_modules(starbase_id)",
+    "CREATE INDEX IF NOT EXISTS idx_modules_port ON installed_modules(port_id)",
+    "CREATE INDEX IF NOT EXISTS idx_modules_outpost ON installed_modules(outpost_id)",
+    "CREATE INDEX IF NOT EXISTS idx_inventory_starbase ON base_inventory(starbase_id)",
+    "CREATE INDEX IF NOT EXISTS idx_inventory_port ON base_inventory(port_id)",
+    "CREATE INDEX IF NOT EXISTS idx_inventory_outpost ON base_inventory(outpost_id)",
+    "CREATE INDEX IF NOT EXISTS idx_trade_config_game ON base_trade_config(game_id, base_id)",
+    "CREATE INDEX IF NOT EXISTS idx_pending_subject ON pending_orders(game_id, subject_type, subject_id)",
+    "CREATE INDEX IF NOT EXISTS idx_starbases_owner ON starbases(owner_prefect_id, game_id)",
+    "CREATE INDEX IF NOT EXISTS idx_ports_owner ON surface_ports(owner_prefect_id, game_id)",
+    "CREATE INDEX IF NOT EXISTS idx_outposts_owner ON outposts(owner_prefect_id, game_id)",
+    "CREATE INDEX IF NOT EXISTS idx_ports_body ON surface_ports(body_id)",
+    "CREATE INDEX IF NOT EXISTS idx_outposts_body ON outposts(body_id)",
+    "CREATE INDEX IF NOT EXISTS idx_messages_recipient ON messages(game_id, recipient_type, recipient_id, delivered)",
+    "CREATE INDEX IF NOT EXISTS idx_faction_requests_prefect ON faction_requests(game_id, prefect_id, status)",
+    "CREATE INDEX IF NOT EXISTS idx_contacts_object ON known_contacts(prefect_id, object_type, object_id)",
+]
+
+# Ships joined to their owning prefect, for the many reads that need a ship's
+# faction_id. A plain view: ships change throughout a turn, so the join is
+# evaluated per query rather than stored. Factions themselves live in
+# universe.db, which a view here cannot reference; use get_faction().
+SHIP_FULL_VIEW = """
+CREATE VIEW IF NOT EXISTS ship_full AS
+SELECT s.*, pp.faction_id, pp.name AS owner_name
+FROM ships s LEFT JOIN prefects pp ON s.owner_prefect_id = pp.prefect_id
+"""
+
+
+# Combat tables and indexes, created on connect for databases that predate
+# them (kept at module level so each new connection reuses the same strings)
+COMBAT_TABLES_DDL = [
+    """CREATE TABLE IF NOT EXISTS ship_combat_lists (
+        list_entry_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        game_id TEXT NOT NULL,
+        ship_id INTEGER NOT NULL,
+        list_type TEXT NOT NULL,
+        entry_type TEXT NOT NULL,
+        entry_id INTEGER NOT NULL,
+        added_turn_year INTEGER,
+        added_turn_week INTEGER,
+        UNIQUE(game_id, ship_id, list_type, entry_type, entry_id)
+    )""",
+    """CREATE TABLE IF NOT EXISTS base_combat_lists (
+        list_entry_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        game_id TEXT NOT NULL,
+        base_kind TEXT NOT NULL,
+        base_id INTEGER NOT NULL,
+        list_type TEXT NOT NULL,
+        entry_type TEXT NOT NULL,
+        entry_id INTEGER NOT NULL,
+        added_turn_year INTEGER,
+        added_turn_week INTEGER,
+        UNIQUE(game_id, base_kind, base_id, list_type, entry_type, entry_id)
+    )""",
+    """CREATE TABLE IF NOT EXISTS combat_engagements (
+        engagement_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        game_id TEXT NOT NULL,
+        started_turn_year INTEGER NOT NULL,
+        started_turn_week INTEGER NOT NULL,
+        started_on_round INTEGER NOT NULL,
+        last_active_turn_year INTEGER,
+        last_active_turn_week INTEGER,
+        system_id INTEGER NOT NULL,
+        grid_col TEXT,
+        grid_row INTEGER,
+        status TEXT DEFAULT 'active',
+        resolution TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS combat_participants (
+        participant_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        engagement_id INTEGER NOT NULL,
+        participant_kind TEXT NOT NULL,
+        participant_id_value INTEGER NOT NULL,
+        owner_prefect_id INTEGER,
+        joined_turn_year INTEGER,
+        joined_turn_week INTEGER,
+        joined_on_round INTEGER,
+        left_turn_year INTEGER,
+        left_turn_week INTEGER,
+        left_on_round INTEGER,
+        integrity_at_join REAL,
+        integrity_at_end REAL,
+        status TEXT DEFAULT 'active',
+        UNIQUE(engagement_id, participant_kind, participant_id_value)
+    )""",
+    """CREATE TABLE IF NOT EXISTS combat_log (
+        log_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        engagement_id INTEGER NOT NULL,
+        turn_year INTEGER NOT NULL,
+        turn_week INTEGER NOT NULL,
+        round_number INTEGER NOT NULL,
+        actor_kind TEXT NOT NULL,
+        actor_id INTEGER,
+        action TEXT NOT NULL,
+        target_kind TEXT,
+        target_id INTEGER,
+        damage REAL,
+        integrity_after REAL,
+        detail TEXT
+    )""",
+    """CREATE TABLE IF NOT EXISTS combat_projectiles (
+        projectile_id INTEGER PRIMARY KEY AUTOINCREMENT,
+        engagement_id INTEGER NOT NULL,
+        launched_turn_year INTEGER,
+        launched_turn_week INTEGER,
+        launched_on_round INTEGER,
+        arrives_on_round INTEGER,
+        attacker_kind TEXT,
+        attacker_id INTEGER,
+        attacker_name TEXT,
+        target_kind TEXT,
+        target_id INTEGER,
+        damage INTEGER,
+        accuracy REAL,
+        ammo_type TEXT,
+        status TEXT DEFAULT 'in-flight'
+    )""",
+]
+COMBAT_INDEXES = [
+    "CREATE INDEX IF NOT EXISTS idx_combat_lists_ship ON ship_combat_lists(game_id, ship_id)",
+    "CREATE INDEX IF NOT EXISTS idx_combat_lists_base ON base_combat_lists(game_id, base_kind, base_id)",
+    "CREATE INDEX IF NOT EXISTS idx_engagement_active ON combat_engagements(game_id, status)",
+    "CREATE INDEX IF NOT EXISTS idx_participants_engagement ON combat_participants(engagement_id)",
+    "CREATE INDEX IF NOT EXISTS idx_combat_log_engagement ON combat_log(engagement_id, turn_year, turn_week, round_number)",
+    "CREATE INDEX IF NOT EXISTS idx_projectiles_engagement ON combat_projectiles(engagement_id, status, arrives_on_round)",
+]
+
+
+# Pool of idle state connections, keyed by (state_path, universe_path);
+# get_universe_connection() parks its own under ('universe', path, readonly).
+# Callers still call conn.close() as before; that parks the connection here
+# so the next get_connection() for the same files skips the open/ATTACH/
+# migrate work and keeps SQLite's page cache warm. Up to CONNECTION_POOL_SIZE
+# connections are parked per key (turn runs hold several at once), and a
+# parked connection is only ever handed to one caller at a time.
+CONNECTION_POOL_SIZE = 8
+_CONN_CACHE = {}
+_CONN_CACHE_LOCK = threading.Lock()
+
+# (state, universe) keys whose migrations have already run in this process
+_MIGRATED_KEYS = set()
+_MIGRATION_LOCK = threading.Lock()
+
+
+class _ReusableConnection(sqlite3.Connection):
+    """sqlite3 connection whose close() returns it to _CONN_CACHE."""
+
+    cache_key = None
+
+    def close(self):
+        if self.cache_key is not None:
+            # Same semantics as a real close: uncommitted work is discarded
+            if self.in_transaction:
+                self.rollback()
+            self.row_factory = sqlite3.Row
+            with _CONN_CACHE_LOCK:
+                pool = _CONN_CACHE.setdefault(self.cache_key, [])
+                if any(parked is self for parked in pool):
+                    return  # already parked (double close)
+                if len(pool) < CONNECTION_POOL_SIZE:
+                    pool.append(self)
+                    return
+        super().close()
+
+    def close_for_real(self):
+        """Close the underlying handle, bypassing the reuse cache."""
+        self.cache_key = None
+        super().close()
+
+
+def _discard_cached_connection(key):
+    """
+    Drop (and really close) the parked connections for a key, along with
+    this thread's reader for it. The files may be about to be rebuilt, so
+    the next connection re-runs the migration probes too.
+    """
+    with _CONN_CACHE_LOCK:
+        pool = _CONN_CACHE.pop(key, [])
+        for readonly in (False, True):
+            pool += _CONN_CACHE.pop(('universe', key[1], readonly), [])
+    with _MIGRATION_LOCK:
+        _MIGRATED_KEYS.discard(key)
+    for conn in pool:
+        conn.close_for_real()
+    reader = getattr(_READERS, 'conns', {}).pop(key, None)
+    if reader is not None:
+        with _READER_CONNS_LOCK:
+            _READER_CONNS.remove(reader)
+        reader.close_for_real()
+
+
+def close_all():
+    """Close every parked connection. Registered to run at interpreter exit."""
+    with _CONN_CACHE_LOCK:
+        pools = list(_CONN_CACHE.values())
+        _CONN_CACHE.clear()
+    for pool in pools:
+        for conn in pool:
+            conn.close_for_real()
+
+
+atexit.register(close_all)
+
+
+def tuple_cursor(conn):
+    """
+    Cursor on conn that yields plain tuples instead of sqlite3.Row, for
+    scan-heavy reads that only need positional access.
+    """
+    cur = conn.cursor()
+    cur.row_factory = None
+    return cur
+
+
+def _schema_columns(conn):
+    """
+    Column names of every table in one query, as {table: frozenset}.
+    Tables missing from the result do not exist.
+    """
+    cols = {}
+    for table, column in conn.execute("""
+        SELECT m.name, p.name FROM sqlite_master m, pragma_table_info(m.name) p
+        WHERE m.type = 'table'
+    """):
+        cols.setdefault(table, set()).add(column)
+    return {table: frozenset(names) for table, names in cols.items()}
+
+
+def _columns(conn, table, schema=None):
+    """
+    Column names of a table as a frozenset (empty if the table is missing).
+    Without a schema SQLite searches main then attached databases.
+    """
+    pragma = f"PRAGMA {schema}.table_info({table})" if schema else f"PRAGMA table_info({table})"
+    return frozenset(r[1] for r in conn.execute(pragma).fetchall())
+
+
+def _has_column(conn, table, column, schema=None):
+    """
+    Whether a table has a column: a single pragma_table_info probe, for
+    migration checks that only care about one column.
+    """
+    if schema:
+        sql = "SELECT 1 FROM pragma_table_info(?, ?) WHERE name = ?"
+        args = (table, schema, column)
+    else:
+        sql = "SELECT 1 FROM pragma_table_info(?) WHERE name = ?"
+        args = (table, column)
+    return conn.execute(sql, args).fetchone() is not None
+
+
+def _add_column(conn, table, definition):
+    """
+    ALTER TABLE ... ADD COLUMN in one statement, treating an existing column
+    as already migrated. Returns True if the column was added.
+    """
+    try:
+        conn.execute(f"ALTER TABLE {table} ADD COLUMN {definition}")
+    except sqlite3.OperationalError as e:
+        if 'duplicate column' not in str(e):
+            raise
+        return False
+    conn.commit()
+    return True
+
+
+# Directories already created this process, so repeat opens skip the mkdir
+_ENSURED_DIRS = set()
+
+
+def _ensure_dir(path):
+    key = str(path)
+    if key not in _ENSURED_DIRS:
+        Path(path).mkdir(parents=True, exist_ok=True)
+        _ENSURED_DIRS.add(key)
+
+
+_URI_CACHE = {}
+_RESOLVED_PATHS = {}
+# universe.db files seen next to a state DB; the game never deletes them, so
+# only a miss needs to hit the filesystem again
+_SIBLING_UNIVERSES = set()
+
+
+def _resolved(path):
+    """Path.resolve(), memoized per path string."""
+    key = str(path)
+    resolved = _RESOLVED_PATHS.get(key)
+    if resolved is None:
+        resolved = _RESOLVED_PATHS[key] = Path(path).resolve()
+    return resolved
+
+
+def _db_uri(path, mode="rwc"):
+    """file: URI for a database path (resolved once per path and mode)."""
+    key = (str(path), mode)
+    uri = _URI_CACHE.get(key)
+    if uri is None:
+        uri = _URI_CACHE[key] = f"{_resolved(path).as_uri()}?mode={mode}"
+    return uri
+
+
+def _resolve_universe_path(state_path, universe_db_path=None):
+    """Determine universe.db path: explicit > alongside state DB > default."""
+    if universe_db_path:
+        return Path(universe_db_path)
+    uni_path = state_path.parent / "universe.db"
+    if str(uni_path) in _SIBLING_UNIVERSES:
+        return uni_path
+    if not uni_path.exists():
+        return UNIVERSE_DB_PATH
+    _SIBLING_UNIVERSES.add(str(uni_path))
+    return uni_path
+
+
 def get_connection(state_db_path=None, universe_db_path=None):
     """
     Open game_state.db and ATTACH universe.db — returns one connection
     that can query tables from both databases seamlessly.
+
+    Connections are reused: close() parks the connection for the next
+    caller rather than closing it (see _CONN_CACHE). Parked connections are
+    opened with check_same_thread=False so they may be picked up by another
+    thread, but a connection must still only be used by one thread at a time.
     """
     state_path = Path(state_db_path) if state_db_path else STATE_DB_PATH
-    state_path.parent.mkdir(parents=True, exist_ok=True)
+    uni_path = _resolve_universe_path(state_path, universe_db_path)
 
-    conn = sqlite3.connect(str(state_path))
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON")
+    key = (str(state_path), str(uni_path))
+    with _CONN_CACHE_LOCK:
+        pool = _CONN_CACHE.get(key)
+        conn = pool.pop() if pool else None
+    if conn is not None:
+        return conn
 
-    # Determine universe.db path: explicit > alongside state DB > default
-    if universe_db_path:
-        uni_path = Path(universe_db_path)
-    else:
-        uni_path = state_path.parent / "universe.db"
-        if not uni_path.exists():
-            uni_path = UNIVERSE_DB_PATH
+    _ensure_dir(state_path.parent)
+
+    conn = sqlite3.connect(_db_uri(state_path), uri=True,
+                           factory=_ReusableConnection, check_same_thread=False,
+                           cached_statements=STATEMENT_CACHE_SIZE)
+    _configure_connection(conn, state_path)
 
     # ATTACH universe.db if it exists and is a separate file
-    if uni_path.exists() and uni_path.resolve() != state_path.resolve():
+    if uni_path.exists() and _resolved(uni_path) != _resolved(state_path):
         conn.execute("ATTACH DATABASE ? AS universe", (str(uni_path),))
-        # Migrate universe.db: add origin_system_id to trade_goods if missing
-        tg_cols = [r[1] for r in conn.execute("PRAGMA universe.table_info(trade_goods)").fetchall()]
-        if 'origin_system_id' not in tg_cols:
-            conn.execute("ALTER TABLE universe.trade_goods ADD COLUMN origin_system_id INTEGER DEFAULT NULL")
-            conn.commit()
-        # Migrate universe.db: add resource_id to celestial_bodies if missing
-        cb_cols = [r[1] for r in conn.execute("PRAGMA universe.table_info(celestial_bodies)").fetchall()]
-        if 'resource_id' not in cb_cols:
-            conn.execute("ALTER TABLE universe.celestial_bodies ADD COLUMN resource_id INTEGER DEFAULT NULL")
-            conn.commit()
-        # Migrate universe.db: create resources table if missing
-        has_resources = conn.execute(
-            "SELECT name FROM universe.sqlite_master WHERE type='table' AND name='resources'"
-        ).fetchone()
-        if not has_resources:
-            conn.execute("""CREATE TABLE IF NOT EXISTS universe.resources (
-                resource_id INTEGER PRIMARY KEY,
-                name TEXT NOT NULL,
-                description TEXT DEFAULT '',
-                produces_item_id INTEGER DEFAULT NULL
-            )""")
-            conn.commit()
+        # synchronous and journal_size_limit are tracked per schema, so the
+        # attached file needs its own
+        conn.execute("PRAGMA universe.synchronous = NORMAL")
+        conn.execute("PRAGMA universe.journal_size_limit = 67108864")
+        _enable_wal(conn, uni_path, schema="universe")
 
-        # Cleanup: if ship_components was incorrectly created in game_state.db (main),
-        # drop it — it belongs in universe.db only
-        main_has_components = conn.execute(
-            "SELECT name FROM main.sqlite_master WHERE type='table' AND name='ship_components'"
-        ).fetchone()
-        if main_has_components:
-            conn.execute("DROP TABLE IF EXISTS main.ship_components")
-            conn.commit()
+    _migrate_once(conn, key)
 
-        # Cleanup: same for resources table
-        main_has_resources = conn.execute(
-            "SELECT name FROM main.sqlite_master WHERE type='table' AND name='resources'"
-        ).fetchone()
-        if main_has_resources:
-            conn.execute("DROP TABLE IF EXISTS main.resources")
-            conn.commit()
+    conn.cache_key = key
+    return conn
 
-        # Migrate: fix star_systems with star_name but NULL grid positions (default to M13)
-        conn.execute("""
-            UPDATE universe.star_systems
-            SET star_grid_col = 'M', star_grid_row = 13
-            WHERE star_name IS NOT NULL AND (star_grid_col IS NULL OR star_grid_row IS NULL)
-        """)
+
+def _migrate_once(conn, key):
+    """
+    Run the attach-time schema migrations the first time this process opens
+    a given (state, universe) pair. They are idempotent, so later connections
+    (and other threads, once the first run finishes) skip straight past.
+    """
+    with _MIGRATION_LOCK:
+        if key in _MIGRATED_KEYS:
+            return
+        if conn.execute(
+            "SELECT 1 FROM pragma_database_list WHERE name = 'universe'"
+        ).fetchone():
+            _migrate_universe(conn)
+        _migrate_state(conn)
+        _MIGRATED_KEYS.add(key)
+
+
+def _migrate_universe(conn):
+    """Bring the attached universe.db (and stray main-side copies) up to date."""
+    # Migrate universe.db: add origin_system_id to trade_goods if missing
+    _add_column(conn, 'universe.trade_goods', "origin_system_id INTEGER DEFAULT NULL")
+    # Migrate universe.db: add resource_id to celestial_bodies if missing
+    _add_column(conn, 'universe.celestial_bodies', "resource_id INTEGER DEFAULT NULL")
+    # Migrate universe.db: create resources table if missing
+    has_resources = conn.execute(
+        "SELECT name FROM universe.sqlite_master WHERE type='table' AND name='resources'"
+    ).fetchone()
+    if not has_resources:
+        conn.execute("""CREATE TABLE IF NOT EXISTS universe.resources (
+            resource_id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            description TEXT DEFAULT '',
+            produces_item_id INTEGER DEFAULT NULL
+        )""")
         conn.commit()
 
-        # Migrate universe.db: create ship_components table if missing
-        has_components = conn.execute(
-            "SELECT name FROM universe.sqlite_master WHERE type='table' AND name='ship_components'"
-        ).fetchone()
-        if not has_components:
-            conn.execute("""CREATE TABLE IF NOT EXISTS universe.ship_components (
-                component_id INTEGER PRIMARY KEY,
-                name TEXT NOT NULL,
-                category TEXT NOT NULL,
-                st_cost INTEGER NOT NULL,
-                cargo_capacity INTEGER DEFAULT 0,
-                crew_capacity INTEGER DEFAULT 0,
-                life_capacity INTEGER DEFAULT 0,
-                thrust INTEGER DEFAULT 0,
-                engine_efficiency REAL DEFAULT 0,
-                sensor_rating INTEGER DEFAULT 0,
-                jump_range INTEGER DEFAULT 0,
-                jump_oc_cost INTEGER DEFAULT 0,
-                hull_restriction TEXT DEFAULT NULL,
-                base_price INTEGER DEFAULT 0,
-                description TEXT DEFAULT ''
-            )""")
-            # Seed default components
-            seed_components = [
-                (100, 'Standard Bridge', 'bridge', 50, 0, 0, 0, 0, 0, 0, 0, 0, None, 500, 'Basic command centre.'),
-                (110, 'Thruster Array', 'thruster', 20, 0, 0, 0, 5, 0, 0, 0, 0, None, 800, 'Standard thruster pack.'),
-                (111, 'Heavy Thruster Pack', 'thruster', 30, 0, 0, 0, 10, 0, 0, 0, 0, None, 1500, 'High-output thrusters.'),
-                (120, 'Commercial Sublight Engine', 'engine', 10, 0, 0, 0, 0, 1.0, 0, 0, 0, None, 1200, 'Standard propulsion.'),
-                (121, 'Military Sublight Engine', 'engine', 10, 0, 0, 0, 0, 1.5, 0, 0, 0, 'military', 2500, 'High-performance drive.'),
-                (130, 'Cargo Bay', 'cargo', 25, 20, 0, 0, 0, 0, 0, 0, 0, None, 600, 'Standard cargo bay.'),
-                (131, 'Reinforced Cargo Bay', 'cargo', 30, 20, 0, 0, 0, 0, 0, 0, 0, None, 900, 'Armoured cargo storage.'),
-                (140, 'Crew Quarters', 'quarters', 30, 0, 20, 20, 0, 0, 0, 0, 0, None, 400, 'Standard crew accommodation.'),
-                (141, 'Military Bunks', 'quarters', 30, 0, 40, 25, 0, 0, 0, 0, 0, 'military', 500, 'Compact military berths.'),
-                (142, 'Luxury Cabins', 'quarters', 30, 0, 10, 15, 0, 0, 0, 0, 0, None, 700, 'Comfortable passenger cabins.'),
-                (150, 'Basic Sensor Array', 'sensor', 10, 0, 0, 0, 0, 0, 5, 0, 0, None, 300, 'Standard detection suite.'),
-                (151, 'Military Sensor Suite', 'sensor', 15, 0, 0, 0, 0, 0, 10, 0, 0, 'military', 1000, 'Advanced military sensors.'),
-                (152, 'Deep Space Scanner', 'sensor', 20, 0, 0, 0, 0, 0, 15, 0, 0, None, 1800, 'Long-range detection.'),
-                (160, 'Jump Drive Mk1', 'jump_drive', 50, 0, 0, 0, 0, 0, 0, 5, 50, None, 5000, 'Basic hyperspace drive.'),
-                (161, 'Jump Drive Mk2', 'jump_drive', 60, 0, 0, 0, 0, 0, 0, 6, 40, None, 12000, 'Advanced jump drive.'),
-            ]
-            for c in seed_components:
-                conn.execute("""INSERT OR IGNORE INTO universe.ship_components VALUES
-                    (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)""", c)
-            conn.commit()
+    # Cleanup: if ship_components was incorrectly created in game_state.db (main),
+    # drop it — it belongs in universe.db only
+    main_has_components = conn.execute(
+        "SELECT name FROM main.sqlite_master WHERE type='table' AND name='ship_components'"
+    ).fetchone()
+    if main_has_components:
+        conn.execute("DROP TABLE IF EXISTS main.ship_components")
+        conn.commit()
 
-        # Migrate: update jump drive OC costs (was 150/100, now 50/40)
-        conn.execute("UPDATE universe.ship_components SET jump_oc_cost = 50 WHERE component_id = 160 AND jump_oc_cost > 50")
-        conn.execute("UPDATE universe.ship_components SET jump_oc_cost = 40 WHERE component_id = 161 AND jump_oc_cost > 40")
-        # Migrate: rebalance thruster thrust values (was 20/40, now 5/10)
-        conn.execute("UPDATE universe.ship_components SET thrust = 5 WHERE component_id = 110 AND thrust = 20")
-        conn.execute("UPDATE universe.ship_components SET thrust = 10 WHERE component_id = 111 AND thrust = 40")
+    # Cleanup: same for resources table
+    main_has_resources = conn.execute(
+        "SELECT name FROM main.sqlite_master WHERE type='table' AND name='resources'"
+    ).fetchone()
+    if main_has_resources:
+        conn.execute("DROP TABLE IF EXISTS main.resources")
         conn.commit()
 
-        # Migrate: add sensor_rating column to base_modules if missing,
-        # and seed the Sensor Suite / Deep Scan Array entries.
-        bm_cols = [r[1] for r in conn.execute("PRAGMA universe.table_info(base_modules)").fetchall()]
-        if bm_cols and 'sensor_rating' not in bm_cols:
-            conn.execute("ALTER TABLE universe.base_modules ADD COLUMN sensor_rating INTEGER DEFAULT 0")
-            conn.commit()
-            bm_cols.append('sensor_rating')
-        if bm_cols:
-            # If prior seed runs inserted sensor modules with wrong column
-            # ordering (before this fix), clean them up so we can re-insert.
-            bad = conn.execute(
-                "SELECT module_id FROM universe.base_modules WHERE module_id IN (590, 591) "
-                "AND (category != 'sensor' OR sensor_rating NOT IN (15, 35) OR base_price NOT IN (4000, 9000))"
-            ).fetchall()
-            if bad:
-                conn.execute("DELETE FROM universe.base_modules WHERE module_id IN (590, 591)")
-                conn.commit()
-            # Seed new sensor modules using explicit column names so the
-            # row survives any past or future ALTER TABLE column additions.
-            sensor_modules = [
-                {'module_id': 590, 'name': 'Sensor Suite', 'category': 'sensor',
-                 'employees_required': 5, 'location_restriction': None,
-                 'docking_slots': 0, 'mining_capacity': 0, 'factory_capacity': 0,
-                 'repair_capacity': 0, 'market_income': 0, 'storage_capacity': 0,
-                 'habitat_capacity': 0, 'defence_rating': 0,
-                 'sensor_rating': 15, 'base_price': 4000,
-                 'description': 'Passive sensor array. Detects nearby ships and objects. Multiple suites stack with diminishing returns.'},
-                {'module_id': 591, 'name': 'Deep Scan Array', 'category': 'sensor',
-                 'employees_required': 10, 'location_restriction': None,
-                 'docking_slots': 0, 'mining_capacity': 0, 'factory_capacity': 0,
-                 'repair_capacity': 0, 'market_income': 0, 'storage_capacity': 0,
-                 'habitat_capacity': 0, 'defence_rating': 0,
-                 'sensor_rating': 35, 'base_price': 9000,
-                 'description': 'High-power sensor array with greater range and accuracy.'},
-            ]
-            for m in sensor_modules:
-                cols = ', '.join(m.keys())
-                placeholders = ', '.join(['?'] * len(m))
-                conn.execute(
-                    f"INSERT OR IGNORE INTO universe.base_modules ({cols}) VALUES ({placeholders})",
-                    tuple(m.values())
-                )
-            conn.commit()
+    # Migrate: fix star_systems with star_name but NULL grid positions (default to M13)
+    conn.execute("""
+        UPDATE universe.star_systems
+        SET star_grid_col = 'M', star_grid_row = 13
+        WHERE star_name IS NOT NULL AND (star_grid_col IS NULL OR star_grid_row IS NULL)
+    """)
+    conn.commit()
 
-        # Migrate universe.db: create base_modules table if missing
-        has_base_modules = conn.execute(
-            "SELECT name FROM universe.sqlite_master WHERE type='table' AND name='base_modules'"
-        ).fetchone()
-        if not has_base_modules:
-            conn.execute("""CREATE TABLE IF NOT EXISTS universe.base_modules (
-                module_id INTEGER PRIMARY KEY, name TEXT NOT NULL, category TEXT NOT NULL,
-                employees_required INTEGER DEFAULT 10, location_restriction TEXT DEFAULT NULL,
-                docking_slots INTEGER DEFAULT 0, mining_capacity INTEGER DEFAULT 0,
-                factory_capacity INTEGER DEFAULT 0, repair_capacity INTEGER DEFAULT 0,
-                market_income INTEGER DEFAULT 0, storage_capacity INTEGER DEFAULT 0,
-                habitat_capacity INTEGER DEFAULT 0, defence_rating INTEGER DEFAULT 0,
-                base_price INTEGER DEFAULT 0, description TEXT DEFAULT ''
-            )""")
-            seed_modules = [
-                (500, 'Command Module', 'command', 10, None, 0, 0, 0, 0, 0, 0, 0, 0, 2000, '1 per 100 modules for 100% command efficiency.'),
-                (510, 'Docking Bay', 'dock', 20, 'starbase', 1, 0, 0, 0, 0, 0, 0, 0, 5000, 'Allows one ship to dock. Starbase only.'),
-                (511, 'Heavy Docking Bay', 'dock', 30, 'starbase', 1, 0, 0, 0, 0, 0, 0, 0, 8000, 'Reinforced bay. Starbase only.'),
-                (520, 'Mining Rig', 'mining', 15, 'surface', 0, 10, 0, 0, 0, 0, 0, 0, 3000, 'Extracts resources. Surface only.'),
-                (521, 'Deep Core Drill', 'mining', 25, 'surface', 0, 25, 0, 0, 0, 0, 0, 0, 7000, 'Heavy mining. Surface only.'),
-                (530, 'Assembly Plant', 'factory', 25, None, 0, 0, 10, 0, 0, 0, 0, 0, 6000, 'Constructs items.'),
-                (531, 'Advanced Fabricator', 'factory', 40, None, 0, 0, 25, 0, 0, 0, 0, 0, 12000, 'High-tech manufacturing.'),
-                (540, 'Repair Bay', 'maintenance', 15, 'starbase', 0, 0, 0, 5, 0, 0, 0, 0, 4000, 'Repairs ships. Starbase only.'),
-                (541, 'Shipyard', 'maintenance', 30, 'starbase', 0, 0, 0, 15, 0, 0, 0, 0, 10000, 'Full shipyard. Starbase only.'),
-                (550, 'Trade Market', 'market', 10, 'surface', 0, 0, 0, 0, 100, 0, 0, 0, 3000, 'Trade with population. Surface only.'),
-                (551, 'Commerce Hub', 'market', 20, 'surface', 0, 0, 0, 0, 250, 0, 0, 0, 8000, 'Large trade hub. Surface only.'),
-                (560, 'Storage Warehouse', 'storage', 5, None, 0, 0, 0, 0, 0, 500, 0, 0, 1500, 'Bulk storage. 500 ST.'),
-                (561, 'Secure Vault', 'storage', 8, None, 0, 0, 0, 0, 0, 200, 0, 0, 3000, 'Armoured storage. 200 ST.'),
-                (570, 'Habitat Block', 'habitat', 2, None, 0, 0, 0, 0, 0, 0, 50, 0, 2000, 'Housing for 50.'),
-                (571, 'Life Dome', 'habitat', 3, 'surface', 0, 0, 0, 0, 0, 0, 100, 0, 4000, 'Dome for 100. Surface only.'),
-                (580, 'Defence Turret', 'defence', 10, None, 0, 0, 0, 0, 0, 0, 0, 5, 3500, 'Defensive weapon.'),
-                (581, 'Shield Generator', 'defence', 15, None, 0, 0, 0, 0, 0, 0, 0, 10, 6000, 'Energy shield.'),
-            ]
-            for m in seed_modules:
-                conn.execute("""INSERT OR IGNORE INTO universe.base_modules VALUES
-                    (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)""", m)
-            conn.commit()
+    # Migrate universe.db: create ship_components table if missing
+    has_components = conn.execute(
+        "SELECT name FROM universe.sqlite_master WHERE type='table' AND name='ship_components'"
+    ).fetchone()
+    if not has_components:
+        conn.execute("""CREATE TABLE IF NOT EXISTS universe.ship_components (
+            component_id INTEGER PRIMARY KEY,
+            name TEXT NOT NULL,
+            category TEXT NOT NULL,
+            st_cost INTEGER NOT NULL,
+            cargo_capacity INTEGER DEFAULT 0,
+            crew_capacity INTEGER DEFAULT 0,
+            life_capacity INTEGER DEFAULT 0,
+            thrust INTEGER DEFAULT 0,
+            engine_efficiency REAL DEFAULT 0,
+            sensor_rating INTEGER DEFAULT 0,
+            jump_range INTEGER DEFAULT 0,
+            jump_oc_cost INTEGER DEFAULT 0,
+            hull_restriction TEXT DEFAULT NULL,
+            base_price INTEGER DEFAULT 0,
+            description TEXT DEFAULT ''
+        )""")
+        # Seed default components
+        seed_components = [
+            (100, 'Standard Bridge', 'bridge', 50, 0, 0, 0, 0, 0, 0, 0, 0, None, 500, 'Basic command centre.'),
+            (110, 'Thruster Array', 'thruster', 20, 0, 0, 0, 5, 0, 0, 0, 0, None, 800, 'Standard thruster pack.'),
+            (111, 'Heavy Thruster Pack', 'thruster', 30, 0, 0, 0, 10, 0, 0, 0, 0, None, 1500, 'High-output thrusters.'),
+            (120, 'Commercial Sublight Engine', 'engine', 10, 0, 0, 0, 0, 1.0, 0, 0, 0, None, 1200, 'Standard propulsion.'),
+            (121, 'Military Sublight Engine', 'engine', 10, 0, 0, 0, 0, 1.5, 0, 0, 0, 'military', 2500, 'High-performance drive.'),
+            (130, 'Cargo Bay', 'cargo', 25, 20, 0, 0, 0, 0, 0, 0, 0, None, 600, 'Standard cargo bay.'),
+            (131, 'Reinforced Cargo Bay', 'cargo', 30, 20, 0, 0, 0, 0, 0, 0, 0, None, 900, 'Armoured cargo storage.'),
+            (140, 'Crew Quarters', 'quarters', 30, 0, 20, 20, 0, 0, 0, 0, 0, None, 400, 'Standard crew accommodation.'),
+            (141, 'Military Bunks', 'quarters', 30, 0, 40, 25, 0, 0, 0, 0, 0, 'military', 500, 'Compact military berths.'),
+            (142, 'Luxury Cabins', 'quarters', 30, 0, 10, 15, 0, 0, 0, 0, 0, None, 700, 'Comfortable passenger cabins.'),
+            (150, 'Basic Sensor Array', 'sensor', 10, 0, 0, 0, 0, 0, 5, 0, 0, None, 300, 'Standard detection suite.'),
+            (151, 'Military Sensor Suite', 'sensor', 15, 0, 0, 0, 0, 0, 10, 0, 0, 'military', 1000, 'Advanced military sensors.'),
+            (152, 'Deep Space Scanner', 'sensor', 20, 0, 0, 0, 0, 0, 15, 0, 0, None, 1800, 'Long-range detection.'),
+            (160, 'Jump Drive Mk1', 'jump_drive', 50, 0, 0, 0, 0, 0, 0, 5, 50, None, 5000, 'Basic hyperspace drive.'),
+            (161, 'Jump Drive Mk2', 'jump_drive', 60, 0, 0, 0, 0, 0, 0, 6, 40, None, 12000, 'Advanced jump drive.'),
+        ]
+        for c in seed_components:
+            conn.execute("""INSERT OR IGNORE INTO universe.ship_components VALUES
+                (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)""", c)
+        conn.commit()
 
-        # Migrate planet_surface: create in universe.db if missing
-        has_planet_surface = conn.execute(
-            "SELECT name FROM universe.sqlite_master WHERE type='table' AND name='planet_surface'"
-        ).fetchone()
-        if not has_planet_surface:
-            conn.execute("""CREATE TABLE IF NOT EXISTS universe.planet_surface (
-                body_id INTEGER NOT NULL,
-                x INTEGER NOT NULL,
-                y INTEGER NOT NULL,
-                terrain_type TEXT NOT NULL,
-                PRIMARY KEY (body_id, x, y),
-                FOREIGN KEY (body_id) REFERENCES celestial_bodies(body_id)
-            )""")
-            conn.commit()
+    # Migrate: update jump drive OC costs (was 150/100, now 50/40)
+    conn.execute("UPDATE universe.ship_components SET jump_oc_cost = 50 WHERE component_id = 160 AND jump_oc_cost > 50")
+    conn.execute("UPDATE universe.ship_components SET jump_oc_cost = 40 WHERE component_id = 161 AND jump_oc_cost > 40")
+    # Migrate: rebalance thruster thrust values (was 20/40, now 5/10)
+    conn.execute("UPDATE universe.ship_components SET thrust = 5 WHERE component_id = 110 AND thrust = 20")
+    conn.execute("UPDATE universe.ship_components SET thrust = 10 WHERE component_id = 111 AND thrust = 40")
+    conn.commit()
 
-        # Migrate planet_surface: if it exists in game_state.db, copy to universe and drop from main
-        main_has_planet_surface = conn.execute(
-            "SELECT name FROM main.sqlite_master WHERE type='table' AND name='planet_surface'"
-        ).fetchone()
-        if main_has_planet_surface:
-            for row in conn.execute("SELECT body_id, x, y, terrain_type FROM main.planet_surface").fetchall():
-                conn.execute(
-                    "INSERT OR REPLACE INTO universe.planet_surface (body_id, x, y, terrain_type) VALUES (?, ?, ?, ?)",
-                    (row['body_id'], row['x'], row['y'], row['terrain_type'])
-                )
-            conn.execute("DROP TABLE main.planet_surface")
+    # Migrate: add sensor_rating column to base_modules if missing,
+    # and seed the Sensor Suite / Deep Scan Array entries.
+    bm_cols = _columns(conn, 'base_modules', schema='universe')
+    if bm_cols and 'sensor_rating' not in bm_cols:
+        conn.execute("ALTER TABLE universe.base_modules ADD COLUMN sensor_rating INTEGER DEFAULT 0")
+        conn.commit()
+        bm_cols |= {'sensor_rating'}
+    if bm_cols:
+        # If prior seed runs inserted sensor modules with wrong column
+        # ordering (before this fix), clean them up so we can re-insert.
+        bad = conn.execute(
+            "SELECT module_id FROM universe.base_modules WHERE module_id IN (590, 591) "
+            "AND (category != 'sensor' OR sensor_rating NOT IN (15, 35) OR base_price NOT IN (4000, 9000))"
+        ).fetchall()
+        if bad:
+            conn.execute("DELETE FROM universe.base_modules WHERE module_id IN (590, 591)")
             conn.commit()
+        # Seed new sensor modules using explicit column names so the
+        # row survives any past or future ALTER TABLE column additions.
+        sensor_modules = [
+            {'module_id': 590, 'name': 'Sensor Suite', 'category': 'sensor',
+             'employees_required': 5, 'location_restriction': None,
+             'docking_slots': 0, 'mining_capacity': 0, 'factory_capacity': 0,
+             'repair_capacity': 0, 'market_income': 0, 'storage_capacity': 0,
+             'habitat_capacity': 0, 'defence_rating': 0,
+             'sensor_rating': 15, 'base_price': 4000,
+             'description': 'Passive sensor array. Detects nearby ships and objects. Multiple suites stack with diminishing returns.'},
+            {'module_id': 591, 'name': 'Deep Scan Array', 'category': 'sensor',
+             'employees_required': 10, 'location_restriction': None,
+             'docking_slots': 0, 'mining_capacity': 0, 'factory_capacity': 0,
+             'repair_capacity': 0, 'market_income': 0, 'storage_capacity': 0,
+             'habitat_capacity': 0, 'defence_rating': 0,
+             'sensor_rating': 35, 'base_price': 9000,
+             'description': 'High-power sensor array with greater range and accuracy.'},
+        ]
+        for m in sensor_modules:
+            cols = ', '.join(m.keys())
+            placeholders = ', '.join(['?'] * len(m))
+            conn.execute(
+                f"INSERT OR IGNORE INTO universe.base_modules ({cols}) VALUES ({placeholders})",
+                tuple(m.values())
+            )
+        conn.commit()
 
-    # Migrate game_state.db: add life_support_capacity to ships if missing
-    ship_cols = [r[1] for r in conn.execute("PRAGMA table_info(ships)").fetchall()]
-    if 'life_support_capacity' not in ship_cols:
-        conn.execute("ALTER TABLE ships ADD COLUMN life_support_capacity INTEGER DEFAULT 20")
+    # Migrate universe.db: create base_modules table if missing
+    has_base_modules = conn.execute(
+        "SELECT name FROM universe.sqlite_master WHERE type='table' AND name='base_modules'"
+    ).fetchone()
+    if not has_base_modules:
+        conn.execute("""CREATE TABLE IF NOT EXISTS universe.base_modules (
+            module_id INTEGER PRIMARY KEY, name TEXT NOT NULL, category TEXT NOT NULL,
+            employees_required INTEGER DEFAULT 10, location_restriction TEXT DEFAULT NULL,
+            docking_slots INTEGER DEFAULT 0, mining_capacity INTEGER DEFAULT 0,
+            factory_capacity INTEGER DEFAULT 0, repair_capacity INTEGER DEFAULT 0,
+            market_income INTEGER DEFAULT 0, storage_capacity INTEGER DEFAULT 0,
+            habitat_capacity INTEGER DEFAULT 0, defence_rating INTEGER DEFAULT 0,
+            base_price INTEGER DEFAULT 0, description TEXT DEFAULT ''
+        )""")
+        seed_modules = [
+            (500, 'Command Module', 'command', 10, None, 0, 0, 0, 0, 0, 0, 0, 0, 2000, '1 per 100 modules for 100% command efficiency.'),
+            (510, 'Docking Bay', 'dock', 20, 'starbase', 1, 0, 0, 0, 0, 0, 0, 0, 5000, 'Allows one ship to dock. Starbase only.'),
+            (511, 'Heavy Docking Bay', 'dock', 30, 'starbase', 1, 0, 0, 0, 0, 0, 0, 0, 8000, 'Reinforced bay. Starbase only.'),
+            (520, 'Mining Rig', 'mining', 15, 'surface', 0, 10, 0, 0, 0, 0, 0, 0, 3000, 'Extracts resources. Surface only.'),
+            (521, 'Deep Core Drill', 'mining', 25, 'surface', 0, 25, 0, 0, 0, 0, 0, 0, 7000, 'Heavy mining. Surface only.'),
+            (530, 'Assembly Plant', 'factory', 25, None, 0, 0, 10, 0, 0, 0, 0, 0, 6000, 'Constructs items.'),
+            (531, 'Advanced Fabricator', 'factory', 40, None, 0, 0, 25, 0, 0, 0, 0, 0, 12000, 'High-tech manufacturing.'),
+            (540, 'Repair Bay', 'maintenance', 15, 'starbase', 0, 0, 0, 5, 0, 0, 0, 0, 4000, 'Repairs ships. Starbase only.'),
+            (541, 'Shipyard', 'maintenance', 30, 'starbase', 0, 0, 0, 15, 0, 0, 0, 0, 10000, 'Full shipyard. Starbase only.'),
+            (550, 'Trade Market', 'market', 10, 'surface', 0, 0, 0, 0, 100, 0, 0, 0, 3000, 'Trade with population. Surface only.'),
+            (551, 'Commerce Hub', 'market', 20, 'surface', 0, 0, 0, 0, 250, 0, 0, 0, 8000, 'Large trade hub. Surface only.'),
+            (560, 'Storage Warehouse', 'storage', 5, None, 0, 0, 0, 0, 0, 500, 0, 0, 1500, 'Bulk storage. 500 ST.'),
+            (561, 'Secure Vault', 'storage', 8, None, 0, 0, 0, 0, 0, 200, 0, 0, 3000, 'Armoured storage. 200 ST.'),
+            (570, 'Habitat Block', 'habitat', 2, None, 0, 0, 0, 0, 0, 0, 50, 0, 2000, 'Housing for 50.'),
+            (571, 'Life Dome', 'habitat', 3, 'surface', 0, 0, 0, 0, 0, 0, 100, 0, 4000, 'Dome for 100. Surface only.'),
+            (580, 'Defence Turret', 'defence', 10, None, 0, 0, 0, 0, 0, 0, 0, 5, 3500, 'Defensive weapon.'),
+            (581, 'Shield Generator', 'defence', 15, None, 0, 0, 0, 0, 0, 0, 0, 10, 6000, 'Energy shield.'),
+        ]
+        for m in seed_modules:
+            conn.execute("""INSERT OR IGNORE INTO universe.base_modules VALUES
+                (?,?,?,?,?,?,?,?,?,?,?,?,?,?,?)""", m)
         conn.commit()
 
+    # Migrate planet_surface: create in universe.db if missing
+    has_planet_surface = conn.execute(
+        "SELECT name FROM universe.sqlite_master WHERE type='table' AND name='planet_surface'"
+    ).fetchone()
+    if not has_planet_surface:
+        conn.execute("""CREATE TABLE IF NOT EXISTS universe.planet_surface (
+            body_id INTEGER PRIMARY KEY,
+            size INTEGER NOT NULL,
+            tiles BLOB NOT NULL,
+            FOREIGN KEY (body_id) REFERENCES celestial_bodies(body_id)
+        )""")
+        conn.commit()
+
+    # Migrate planet_surface: pack the old one-row-per-tile layout
+    _pack_planet_surface(conn, 'universe')
+
+    # Migrate planet_surface: if it exists in game_state.db, copy to universe and drop from main
+    main_has_planet_surface = conn.execute(
+        "SELECT name FROM main.sqlite_master WHERE type='table' AND name='planet_surface'"
+    ).fetchone()
+    if main_has_planet_surface:
+        conn.executemany(
+            "INSERT OR REPLACE INTO universe.planet_surface (body_id, size, tiles) VALUES (?, ?, ?)",
+            _pack_surface_rows(conn.execute(
+                "SELECT body_id, x, y, terrain_type FROM main.planet_surface"
+            ).fetchall())
+        )
+        conn.execute("DROP TABLE main.planet_surface")
+        conn.commit()
+
+    # Migrate universe.db indexes (see UNIVERSE_SCHEMA)
+    conn.executescript(_UNIVERSE_INDEX_MIGRATION)
+
+
+def _pack_planet_surface(conn, schema):
+    """
+    Convert schema.planet_surface from one row per tile to one row per body
+    (grid size + one terrain code byte per tile), if it is still in the old
+    layout.
+    """
+    if 'terrain_type' not in _columns(conn, 'planet_surface', schema):
+        return
+    packed = _pack_surface_rows(conn.execute(
+        f"SELECT body_id, x, y, terrain_type FROM {schema}.planet_surface"
+    ).fetchall())
+    conn.execute("BEGIN IMMEDIATE")
+    conn.execute(f"DROP TABLE {schema}.planet_surface")
+    conn.execute(f"""CREATE TABLE {schema}.planet_surface (
+        body_id INTEGER PRIMARY KEY,
+        size INTEGER NOT NULL,
+        tiles BLOB NOT NULL,
+        FOREIGN KEY (body_id) REFERENCES celestial_bodies(body_id)
+    )""")
+    conn.executemany(
+        f"INSERT INTO {schema}.planet_surface (body_id, size, tiles) VALUES (?, ?, ?)", packed
+    )
+    conn.commit()
+
+
+def _pack_surface_rows(rows):
+    """
+    Group old-layout planet_surface rows (body_id, x, y, terrain_type) by
+    body and pack each into a (body_id, size, tiles) row.
+    """
+    from engine.maps.surface_gen import encode_surface
+    by_body = {}
+    for body_id, x, y, terrain in rows:
+        by_body.setdefault(body_id, []).append((x, y, terrain))
+    return [(body_id, *encode_surface(tiles)) for body_id, tiles in by_body.items()]
+
+
+def _market_row_rank(games='games'):
+    """
+    SQL ranking market_prices rows of one base and item when only one may be
+    kept: a row for its game's current market cycle first (cycles are four
+    weeks, keyed by their first week), then the most recent cycle.
+    """
+    return f"""(EXISTS (SELECT 1 FROM {games} g
+                WHERE g.game_id = market_prices.game_id
+                  AND g.current_year = market_prices.turn_year
+                  AND (g.current_week - 1) / 4 * 4 + 1 = market_prices.turn_week)
+            ) * 1000000 + market_prices.turn_year * 100 + market_prices.turn_week"""
+
+
+def _migrate_state(conn):
+    """Bring game_state.db up to date (universe.db attached where present)."""
+    # Migrate game_state.db: add life_support_capacity to ships if missing
+    _add_column(conn, 'ships', "life_support_capacity INTEGER DEFAULT 20")
+
     # Migrate game_state.db: add crew_type_id and wages to officers if missing
-    off_cols = [r[1] for r in conn.execute("PRAGMA table_info(officers)").fetchall()]
-    if 'crew_type_id' not in off_cols:
+    if not _has_column(conn, 'officers', 'crew_type_id'):
         conn.execute("ALTER TABLE officers ADD COLUMN crew_type_id INTEGER DEFAULT 401")
         conn.execute("ALTER TABLE officers ADD COLUMN wages INTEGER DEFAULT 5")
         conn.commit()
 
     # Migrate game_state.db: add turn_status to games if missing
-    game_cols = [r[1] for r in conn.execute("PRAGMA table_info(games)").fetchall()]
-    if 'turn_status' not in game_cols:
-        conn.execute("ALTER TABLE games ADD COLUMN turn_status TEXT NOT NULL DEFAULT 'open'")
-        conn.commit()
+    _add_column(conn, 'games', "turn_status TEXT NOT NULL DEFAULT 'open'")
 
     # Migrate: crew (item 401) should not occupy cargo space - fix existing cargo_items and ships
     crew_cargo = conn.execute(
@@ -322,8 +782,7 @@ def get_connection(state_db_path=None, universe_db_path=None):
         conn.commit()
 
     # Migrate game_state.db: add ship_size to ships if missing
-    ship_cols = [r[1] for r in conn.execute("PRAGMA table_info(ships)").fetchall()]
-    if 'ship_size' not in ship_cols:
+    if not _has_column(conn, 'ships', 'ship_size'):
         conn.execute("ALTER TABLE ships ADD COLUMN ship_size INTEGER DEFAULT 50")
         conn.execute("UPDATE ships SET ship_size = hull_count WHERE ship_size IS NULL OR ship_size = 0")
         conn.commit()
@@ -334,8 +793,8 @@ def get_connection(state_db_path=None, universe_db_path=None):
         conn.commit()
 
     # Migrate surface_port <-> starbase relationship: invert so starbase references surface_port
-    base_cols = [r[1] for r in conn.execute("PRAGMA table_info(starbases)").fetchall()]
-    sp_cols = [r[1] for r in conn.execute("PRAGMA table_info(surface_ports)").fetchall()]
+    base_cols = _columns(conn, 'starbases')
+    sp_cols = _columns(conn, 'surface_ports')
     if 'surface_port_id' not in base_cols:
         conn.execute("ALTER TABLE starbases ADD COLUMN surface_port_id INTEGER")
         conn.commit()
@@ -378,7 +837,7 @@ def get_connection(state_db_path=None, universe_db_path=None):
         conn.commit()
 
     # Migrate installed_items: if old schema (has item_type_id), rework to component_id
-    ii_cols = [r[1] for r in conn.execute("PRAGMA table_info(installed_items)").fetchall()]
+    ii_cols = _columns(conn, 'installed_items')
     if 'item_type_id' in ii_cols and 'component_id' not in ii_cols:
         # Old schema → new schema migration
         # Map old item_type_ids to new component_ids
@@ -411,7 +870,7 @@ def get_connection(state_db_path=None, universe_db_path=None):
 
     # Migrate: add employees and employee_capacity to base tables if missing
     for table, id_col in [('starbases', 'base_id'), ('surface_ports', 'port_id'), ('outposts', 'outpost_id')]:
-        cols = [r[1] for r in conn.execute(f"PRAGMA table_info({table})").fetchall()]
+        cols = _columns(conn, table)
         if 'employees' not in cols:
             conn.execute(f"ALTER TABLE {table} ADD COLUMN employees INTEGER DEFAULT 0")
             conn.commit()
@@ -452,39 +911,32 @@ def get_connection(state_db_path=None, universe_db_path=None):
     """)
 
     # Migrate: add sensor_profile column to ships if missing
-    ship_cols = [r[1] for r in conn.execute("PRAGMA table_info(ships)").fetchall()]
-    if 'sensor_profile' not in ship_cols:
+    if not _has_column(conn, 'ships', 'sensor_profile'):
         conn.execute("ALTER TABLE ships ADD COLUMN sensor_profile REAL DEFAULT 0.5")
         conn.execute("UPDATE ships SET sensor_profile = ship_size / 100.0 WHERE ship_size > 0")
     conn.commit()
 
     # Migrate: add sensor_profile column to bases if missing
     for table in ('starbases', 'surface_ports', 'outposts'):
-        cols = [r[1] for r in conn.execute(f"PRAGMA table_info({table})").fetchall()]
-        if 'sensor_profile' not in cols:
+        if not _has_column(conn, table, 'sensor_profile'):
             conn.execute(f"ALTER TABLE {table} ADD COLUMN sensor_profile REAL DEFAULT 1.0")
     conn.commit()
 
     # Migrate: add sensor_rating column to bases if missing
     for table in ('starbases', 'surface_ports', 'outposts'):
-        cols = [r[1] for r in conn.execute(f"PRAGMA table_info({table})").fetchall()]
-        if 'sensor_rating' not in cols:
+        if not _has_column(conn, table, 'sensor_rating'):
             conn.execute(f"ALTER TABLE {table} ADD COLUMN sensor_rating INTEGER DEFAULT 0")
     conn.commit()
 
     # Migrate: add combat_doctrine to ships
-    ship_cols = [r[1] for r in conn.execute("PRAGMA table_info(ships)").fetchall()]
-    if 'combat_doctrine' not in ship_cols:
-        conn.execute("ALTER TABLE ships ADD COLUMN combat_doctrine TEXT DEFAULT 'defensive'")
-        conn.commit()
+    _add_column(conn, 'ships', "combat_doctrine TEXT DEFAULT 'defensive'")
 
     # Migrate: add max_integrity to ships (scales with ship_size).
     # Integrity is no longer 0-100; it's an absolute HP pool equal to ship_size.
     # For existing ships, set max_integrity = ship_size and scale current
     # integrity proportionally so a ship at 100% health stays at 100% health,
     # but with the new absolute value.
-    ship_cols = [r[1] for r in conn.execute("PRAGMA table_info(ships)").fetchall()]
-    if 'max_integrity' not in ship_cols:
+    if not _has_column(conn, 'ships', 'max_integrity'):
         conn.execute("ALTER TABLE ships ADD COLUMN max_integrity REAL DEFAULT 50.0")
         # For each existing ship, set max_integrity = ship_size and scale
         # current integrity from the old 0-100 scale to 0-ship_size scale.
@@ -529,7 +981,7 @@ def get_connection(state_db_path=None, universe_db_path=None):
     conn.commit()
 
     # Migrate: add armour and shield columns to ships
-    ship_cols_now = [r[1] for r in conn.execute("PRAGMA table_info(ships)").fetchall()]
+    ship_cols_now = _columns(conn, 'ships')
     for col, typ_default in [
         ('armour',           'INTEGER DEFAULT 0'),
         ('shield_sp',        'INTEGER DEFAULT 0'),
@@ -545,8 +997,7 @@ def get_connection(state_db_path=None, universe_db_path=None):
 
     # Migrate: add shield-generator columns to ship_components (in universe.db).
     # shield_sp_capacity is the SP each unit of this component provides.
-    sc_cols_pre = [r[1] for r in conn.execute("PRAGMA universe.table_info(ship_components)").fetchall()]
-    if 'shield_sp_capacity' not in sc_cols_pre:
+    if not _has_column(conn, 'ship_components', 'shield_sp_capacity', schema='universe'):
         conn.execute("ALTER TABLE universe.ship_components ADD COLUMN shield_sp_capacity INTEGER DEFAULT 0")
     conn.commit()
 
@@ -607,7 +1058,7 @@ def get_connection(state_db_path=None, universe_db_path=None):
         conn.commit()
 
     # Migrate: add weapon columns to ship_components (in universe.db)
-    sc_cols = [r[1] for r in conn.execute("PRAGMA universe.table_info(ship_components)").fetchall()]
+    sc_cols = _columns(conn, 'ship_components', schema='universe')
     weapon_col_defs = [
         ('weapon_damage',               'INTEGER DEFAULT 0'),
         ('weapon_range',                'INTEGER DEFAULT 0'),
@@ -627,8 +1078,7 @@ def get_connection(state_db_path=None, universe_db_path=None):
 
     # Seed/update Beam Cannon Mk1 (idempotent). If the row already exists but
     # has stale values, set the canonical current ones.
-    sc_cols_now = [r[1] for r in conn.execute(
-        "PRAGMA universe.table_info(ship_components)").fetchall()]
+    sc_cols_now = _columns(conn, 'ship_components', schema='universe')
     if sc_cols_now:
         beam_cannon = {
             'component_id': 200, 'name': 'Beam Cannon Mk1', 'category': 'weapon',
@@ -740,104 +1190,9 @@ def get_connection(state_db_path=None, universe_db_path=None):
     conn.commit()
 
     # Migrate: create combat tables if missing (idempotent)
-    combat_tables_ddl = [
-        """CREATE TABLE IF NOT EXISTS ship_combat_lists (
-            list_entry_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            game_id TEXT NOT NULL,
-            ship_id INTEGER NOT NULL,
-            list_type TEXT NOT NULL,
-            entry_type TEXT NOT NULL,
-            entry_id INTEGER NOT NULL,
-            added_turn_year INTEGER,
-            added_turn_week INTEGER,
-            UNIQUE(game_id, ship_id, list_type, entry_type, entry_id)
-        )""",
-        """CREATE TABLE IF NOT EXISTS base_combat_lists (
-            list_entry_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            game_id TEXT NOT NULL,
-            base_kind TEXT NOT NULL,
-            base_id INTEGER NOT NULL,
-            list_type TEXT NOT NULL,
-            entry_type TEXT NOT NULL,
-            entry_id INTEGER NOT NULL,
-            added_turn_year INTEGER,
-            added_turn_week INTEGER,
-            UNIQUE(game_id, base_kind, base_id, list_type, entry_type, entry_id)
-        )""",
-        """CREATE TABLE IF NOT EXISTS combat_engagements (
-            engagement_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            game_id TEXT NOT NULL,
-            started_turn_year INTEGER NOT NULL,
-            started_turn_week INTEGER NOT NULL,
-            started_on_round INTEGER NOT NULL,
-            last_active_turn_year INTEGER,
-            last_active_turn_week INTEGER,
-            system_id INTEGER NOT NULL,
-            grid_col TEXT,
-            grid_row INTEGER,
-            status TEXT DEFAULT 'active',
-            resolution TEXT
-        )""",
-        """CREATE TABLE IF NOT EXISTS combat_participants (
-            participant_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            engagement_id INTEGER NOT NULL,
-            participant_kind TEXT NOT NULL,
-            participant_id_value INTEGER NOT NULL,
-            owner_prefect_id INTEGER,
-            joined_turn_year INTEGER,
-            joined_turn_week INTEGER,
-            joined_on_round INTEGER,
-            left_turn_year INTEGER,
-            left_turn_week INTEGER,
-            left_on_round INTEGER,
-            integrity_at_join REAL,
-            integrity_at_end REAL,
-            status TEXT DEFAULT 'active',
-            UNIQUE(engagement_id, participant_kind, participant_id_value)
-        )""",
-        """CREATE TABLE IF NOT EXISTS combat_log (
-            log_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            engagement_id INTEGER NOT NULL,
-            turn_year INTEGER NOT NULL,
-            turn_week INTEGER NOT NULL,
-            round_number INTEGER NOT NULL,
-            actor_kind TEXT NOT NULL,
-            actor_id INTEGER,
-            action TEXT NOT NULL,
-            target_kind TEXT,
-            target_id INTEGER,
-            damage REAL,
-            integrity_after REAL,
-            detail TEXT
-        )""",
-        """CREATE TABLE IF NOT EXISTS combat_projectiles (
-            projectile_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            engagement_id INTEGER NOT NULL,
-            launched_turn_year INTEGER,
-            launched_turn_week INTEGER,
-            launched_on_round INTEGER,
-            arrives_on_round INTEGER,
-            attacker_kind TEXT,
-            attacker_id INTEGER,
-            attacker_name TEXT,
-            target_kind TEXT,
-            target_id INTEGER,
-            damage INTEGER,
-            accuracy REAL,
-            ammo_type TEXT,
-            status TEXT DEFAULT 'in-flight'
-        )""",
-    ]
-    for ddl in combat_tables_ddl:
+    for ddl in COMBAT_TABLES_DDL:
         conn.execute(ddl)
-    for idx in [
-        "CREATE INDEX IF NOT EXISTS idx_combat_lists_ship ON ship_combat_lists(game_id, ship_id)",
-        "CREATE INDEX IF NOT EXISTS idx_combat_lists_base ON base_combat_lists(game_id, base_kind, base_id)",
-        "CREATE INDEX IF NOT EXISTS idx_engagement_active ON combat_engagements(game_id, status)",
-        "CREATE INDEX IF NOT EXISTS idx_participants_engagement ON combat_participants(engagement_id)",
-        "CREATE INDEX IF NOT EXISTS idx_combat_log_engagement ON combat_log(engagement_id, turn_year, turn_week, round_number)",
-        "CREATE INDEX IF NOT EXISTS idx_projectiles_engagement ON combat_projectiles(engagement_id, status, arrives_on_round)",
-    ]:
+    for idx in COMBAT_INDEXES:
         conn.execute(idx)
     conn.commit()
 
@@ -892,6 +1247,27 @@ def get_connection(state_db_path=None, universe_db_path=None):
                 )
     conn.commit()
 
+    # Migrate: market_prices holds one row per (game, base, item), updated
+    # in place each cycle. Older files kept a row per cycle: keep only the
+    # best-ranked one and replace the per-cycle lookup index with the key.
+    if not conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'index' AND name = 'idx_market_prices_key'"
+    ).fetchone():
+        conn.execute("BEGIN IMMEDIATE")
+        conn.execute(f"""
+            DELETE FROM market_prices WHERE price_id NOT IN (
+                SELECT price_id FROM (
+                    SELECT price_id, MAX({_market_row_rank()})
+                    FROM market_prices GROUP BY game_id, base_id, item_id
+                )
+            )
+        """)
+        conn.execute("DROP INDEX IF EXISTS idx_market_prices_lookup")
+        conn.execute(
+            "CREATE UNIQUE INDEX idx_market_prices_key ON market_prices(game_id, base_id, item_id)"
+        )
+        conn.commit()
+
     # Populate market_prices for missile/torpedo at each base's current cycle
     # so they're immediately available. Idempotent: only inserts if missing.
     # Uses fixed-price values (100/60 for missiles, 500/300 for torpedoes).
@@ -899,28 +1275,23 @@ def get_connection(state_db_path=None, universe_db_path=None):
         501: {'buy': 100, 'sell': 60, 'stock': 500, 'demand': 100},
         502: {'buy': 500, 'sell': 300, 'stock': 100, 'demand': 50},
     }
-    existing_cycles = conn.execute(
-        "SELECT DISTINCT game_id, base_id, turn_year, turn_week FROM market_prices"
-    ).fetchall()
-    for c_row in existing_cycles:
+    # Each base's current cycle (bare columns come from the MAX row)
+    current_cycles = conn.execute(f"""
+        SELECT game_id, base_id, turn_year, turn_week, MAX({_market_row_rank()})
+        FROM market_prices GROUP BY game_id, base_id
+    """).fetchall()
+    for c_row in current_cycles:
         for ammo_id, fp in fixed_ammo.items():
-            already = conn.execute(
-                """SELECT price_id FROM market_prices
-                   WHERE game_id = ? AND base_id = ? AND item_id = ?
-                         AND turn_year = ? AND turn_week = ?""",
+            conn.execute(
+                """INSERT INTO market_prices
+                   (game_id, base_id, item_id, turn_year, turn_week,
+                    buy_price, sell_price, stock, demand)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+                   ON CONFLICT (game_id, base_id, item_id) DO NOTHING""",
                 (c_row['game_id'], c_row['base_id'], ammo_id,
-                 c_row['turn_year'], c_row['turn_week'])
-            ).fetchone()
-            if not already:
-                conn.execute(
-                    """INSERT INTO market_prices
-                       (game_id, base_id, item_id, turn_year, turn_week,
-                        buy_price, sell_price, stock, demand)
-                       VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)""",
-                    (c_row['game_id'], c_row['base_id'], ammo_id,
-                     c_row['turn_year'], c_row['turn_week'],
-                     fp['buy'], fp['sell'], fp['stock'], fp['demand'])
-                )
+                 c_row['turn_year'], c_row['turn_week'],
+                 fp['buy'], fp['sell'], fp['stock'], fp['demand'])
+            )
     conn.commit()
 
     # ======================================================================
@@ -928,7 +1299,7 @@ def get_connection(state_db_path=None, universe_db_path=None):
     # ======================================================================
 
     # Add combat-related columns to starbases
-    sb_cols = [r[1] for r in conn.execute("PRAGMA table_info(starbases)").fetchall()]
+    sb_cols = _columns(conn, 'starbases')
     for col, typ_default in [
         ('integrity',       'REAL DEFAULT 0'),
         ('max_integrity',   'REAL DEFAULT 0'),
@@ -943,7 +1314,7 @@ def get_connection(state_db_path=None, universe_db_path=None):
 
     # Add combat-related columns to base_modules (weapon stats + shield/armour
     # capacity, for modules that provide defensive or offensive capability).
-    bm_cols = [r[1] for r in conn.execute("PRAGMA universe.table_info(base_modules)").fetchall()]
+    bm_cols = _columns(conn, 'base_modules', schema='universe')
     for col, typ_default in [
         ('weapon_damage',           'INTEGER DEFAULT 0'),
         ('weapon_range',            'INTEGER DEFAULT 0'),
@@ -1070,13 +1441,11 @@ def get_connection(state_db_path=None, universe_db_path=None):
         ('starbases',         0),
         ('celestial_bodies',  0),
     ]:
-        cols = [r[1] for r in conn.execute(f"PRAGMA table_info({tbl})").fetchall()]
-        if 'is_public' not in cols:
+        if not _has_column(conn, tbl, 'is_public'):
             conn.execute(f"ALTER TABLE {tbl} ADD COLUMN is_public INTEGER DEFAULT {default}")
 
     # trade_goods lives in universe DB and defaults public (1)
-    cols = [r[1] for r in conn.execute("PRAGMA universe.table_info(trade_goods)").fetchall()]
-    if 'is_public' not in cols:
+    if not _has_column(conn, 'trade_goods', 'is_public', schema='universe'):
         conn.execute("ALTER TABLE universe.trade_goods ADD COLUMN is_public INTEGER DEFAULT 1")
 
     # Also add is_public to surface_ports and outposts (both private by default —
@@ -1084,7 +1453,7 @@ def get_connection(state_db_path=None, universe_db_path=None):
     # knowledge flag applies.
     for tbl in ('surface_ports', 'outposts'):
         try:
-            cols = [r[1] for r in conn.execute(f"PRAGMA table_info({tbl})").fetchall()]
+            cols = _columns(conn, tbl)
             if cols and 'is_public' not in cols:
                 conn.execute(f"ALTER TABLE {tbl} ADD COLUMN is_public INTEGER DEFAULT 0")
         except Exception:
@@ -1353,15 +1722,14 @@ def get_connection(state_db_path=None, universe_db_path=None):
     #  - Surface Missile Magazine (#586) NEW
     #  - Per-module-type HP defaults in base_modules.module_hp
 
-    im_cols = [r[1] for r in conn.execute("PRAGMA table_info(installed_modules)").fetchall()]
+    im_cols = _columns(conn, 'installed_modules')
     if 'current_hp' not in im_cols:
         conn.execute("ALTER TABLE installed_modules ADD COLUMN current_hp REAL DEFAULT 0")
     if 'max_hp_per_unit' not in im_cols:
         conn.execute("ALTER TABLE installed_modules ADD COLUMN max_hp_per_unit REAL DEFAULT 0")
     conn.commit()
 
-    bm_cols = [r[1] for r in conn.execute("PRAGMA universe.table_info(base_modules)").fetchall()]
-    if 'module_hp' not in bm_cols:
+    if not _has_column(conn, 'base_modules', 'module_hp', schema='universe'):
         conn.execute("ALTER TABLE universe.base_modules ADD COLUMN module_hp INTEGER DEFAULT 50")
     conn.commit()
 
@@ -1490,7 +1858,7 @@ def get_connection(state_db_path=None, universe_db_path=None):
     conn.commit()
 
     # Add silo magazine columns to surface installations (parallel to ships)
-    sp_cols = [r[1] for r in conn.execute("PRAGMA table_info(surface_ports)").fetchall()]
+    sp_cols = _columns(conn, 'surface_ports')
     if sp_cols:
         for col, ddl_type in [
             ('missiles_loaded',  'INTEGER DEFAULT 0'),
@@ -1498,7 +1866,7 @@ def get_connection(state_db_path=None, universe_db_path=None):
         ]:
             if col not in sp_cols:
                 conn.execute(f"ALTER TABLE surface_ports ADD COLUMN {col} {ddl_type}")
-    op_cols = [r[1] for r in conn.execute("PRAGMA table_info(outposts)").fetchall()]
+    op_cols = _columns(conn, 'outposts')
     if op_cols:
         for col, ddl_type in [
             ('missiles_loaded',  'INTEGER DEFAULT 0'),
@@ -1514,8 +1882,8 @@ def get_connection(state_db_path=None, universe_db_path=None):
     # Pooled combat stats: shield SP and armour are recomputed from surviving
     # modules whenever damage lands, but the columns must exist on both tables.
     # Re-read columns after the previous alters.
-    sp_cols = [r[1] for r in conn.execute("PRAGMA table_info(surface_ports)").fetchall()]
-    op_cols = [r[1] for r in conn.execute("PRAGMA table_info(outposts)").fetchall()]
+    sp_cols = _columns(conn, 'surface_ports')
+    op_cols = _columns(conn, 'outposts')
     for tbl, cols in (('surface_ports', sp_cols), ('outposts', op_cols)):
         for col, ddl in [
             ('max_shield_sp', 'INTEGER DEFAULT 0'),
@@ -1539,7 +1907,7 @@ def get_connection(state_db_path=None, universe_db_path=None):
         conn.commit()
 
     # Migrate: add detection detail columns to known_contacts
-    kc_cols = [r[1] for r in conn.execute("PRAGMA table_info(known_contacts)").fetchall()]
+    kc_cols = _columns(conn, 'known_contacts')
     for col, ddl in [
         ('scanner_ship_id',   'ALTER TABLE known_contacts ADD COLUMN scanner_ship_id INTEGER'),
         ('target_faction_id', 'ALTER TABLE known_contacts ADD COLUMN target_faction_id INTEGER'),
@@ -1554,16 +1922,10 @@ def get_connection(state_db_path=None, universe_db_path=None):
     conn.commit()
 
     # Migrate: add is_gm to players if missing
-    player_cols = [r[1] for r in conn.execute("PRAGMA table_info(players)").fetchall()]
-    if 'is_gm' not in player_cols:
-        conn.execute("ALTER TABLE players ADD COLUMN is_gm INTEGER NOT NULL DEFAULT 0")
-        conn.commit()
+    _add_column(conn, 'players', "is_gm INTEGER NOT NULL DEFAULT 0")
 
     # Migrate: add unlimited_credits to prefects if missing
-    prefect_cols = [r[1] for r in conn.execute("PRAGMA table_info(prefects)").fetchall()]
-    if 'unlimited_credits' not in prefect_cols:
-        conn.execute("ALTER TABLE prefects ADD COLUMN unlimited_credits INTEGER NOT NULL DEFAULT 0")
-        conn.commit()
+    _add_column(conn, 'prefects', "unlimited_credits INTEGER NOT NULL DEFAULT 0")
 
     # Cleanup: if prefects_old exists from a previous failed migration, drop it
     stale_old = conn.execute(
@@ -1582,6 +1944,8 @@ def get_connection(state_db_path=None, universe_db_path=None):
     if create_sql and 'UNIQUE' in create_sql['sql'] and 'player_id' in create_sql['sql']:
         # Temporarily disable foreign keys for table rebuild
         conn.execute("PRAGMA foreign_keys = OFF")
+        # RENAME would repoint ship_full at prefects_old; it is recreated below
+        conn.execute("DROP VIEW IF EXISTS ship_full")
         conn.execute("ALTER TABLE prefects RENAME TO prefects_old")
         conn.execute("""CREATE TABLE prefects (
             prefect_id INTEGER PRIMARY KEY,
@@ -1600,7 +1964,7 @@ def get_connection(state_db_path=None, universe_db_path=None):
             FOREIGN KEY (player_id) REFERENCES players(player_id),
             FOREIGN KEY (game_id) REFERENCES games(game_id)
         )""")
-        old_cols = [r[1] for r in conn.execute("PRAGMA table_info(prefects_old)").fetchall()]
+        old_cols = _columns(conn, 'prefects_old')
         new_cols = [r[1] for r in conn.execute("PRAGMA table_info(prefects)").fetchall()]
         shared = [c for c in new_cols if c in old_cols]
         cols_str = ', '.join(shared)
@@ -1609,16 +1973,117 @@ def get_connection(state_db_path=None, universe_db_path=None):
         conn.commit()
         conn.execute("PRAGMA foreign_keys = ON")
 
+    # Migrate: composite indexes for the hot per-ship / per-turn lookups.
+    # idx_contacts_object leads with prefect_id, so it replaces the old
+    # single-column contacts index.
+    conn.execute("DROP INDEX IF EXISTS idx_contacts_prefect")
+    for idx in STATE_LOOKUP_INDEXES:
+        conn.execute(idx)
+    conn.execute(SHIP_FULL_VIEW)
+    conn.commit()
+
+
+# Read-only connections, one per thread per database pair. Under WAL these
+# read alongside the single writer from get_connection() without blocking it.
+_READERS = threading.local()
+_READER_CONNS = []
+_READER_CONNS_LOCK = threading.Lock()
+
+
+class _ReaderConnection(sqlite3.Connection):
+    """Thread-local read-only connection; close() leaves it open for reuse."""
+
+    cache_key = None
+
+    def close(self):
+        if self.in_transaction:
+            self.rollback()
+        self.row_factory = sqlite3.Row
+
+    def close_for_real(self):
+        super().close()
+
+
+def get_reader(state_db_path=None, universe_db_path=None):
+    """
+    Read-only counterpart to get_connection() for report generation and
+    other query-only work. Each thread gets its own connection (opened with
+    mode=ro, so any write raises), reused for the life of the thread.
+    Callers may close() it as usual.
+    """
+    state_path = Path(state_db_path) if state_db_path else STATE_DB_PATH
+    uni_path = _resolve_universe_path(state_path, universe_db_path)
+    key = (str(state_path), str(uni_path))
+
+    readers = getattr(_READERS, 'conns', None)
+    if readers is None:
+        readers = _READERS.conns = {}
+    conn = readers.get(key)
+    if conn is not None:
+        return conn
+
+    # Readers never migrate: let a writer bring the schema up to date first
+    get_connection(state_path, uni_path).close()
+
+    conn = sqlite3.connect(_db_uri(state_path, "ro"), uri=True,
+                           factory=_ReaderConnection, check_same_thread=False,
+                           cached_statements=STATEMENT_CACHE_SIZE)
+    conn.row_factory = sqlite3.Row
+    conn.executescript(_CONNECTION_PRAGMAS)
+    if uni_path.exists() and _resolved(uni_path) != _resolved(state_path):
+        conn.execute("ATTACH DATABASE ? AS universe", (_db_uri(uni_path, "ro"),))
+    conn.cache_key = key
+    readers[key] = conn
+    with _READER_CONNS_LOCK:
+        _READER_CONNS.append(conn)
     return conn
 
 
-def get_universe_connection(universe_db_path=None):
-    """Direct connection to universe.db for admin/editing. No ATTACH."""
+def _close_readers():
+    with _READER_CONNS_LOCK:
+        conns = list(_READER_CONNS)
+        _READER_CONNS.clear()
+    for conn in conns:
+        conn.close_for_real()
+
+
+atexit.register(_close_readers)
+
+
+def get_universe_connection(universe_db_path=None, readonly=False):
+    """
+    Direct connection to universe.db for admin/editing. No ATTACH.
+    readonly=True opens the file mode=ro for listing commands, with only
+    the per-connection PRAGMAs: no WAL switch and no migration.
+
+    Pooled like get_connection(): close() parks the connection (keyed by
+    path and readonly) so a run of add_* calls reuses one handle.
+    """
     path = Path(universe_db_path) if universe_db_path else UNIVERSE_DB_PATH
-    path.parent.mkdir(parents=True, exist_ok=True)
-    conn = sqlite3.connect(str(path))
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON")
+    key = ('universe', str(path), readonly)
+    with _CONN_CACHE_LOCK:
+        pool = _CONN_CACHE.get(key)
+        conn = pool.pop() if pool else None
+    if conn is not None:
+        return conn
+
+    if readonly:
+        conn = sqlite3.connect(_db_uri(path, "ro"), uri=True,
+                               factory=_ReusableConnection,
+                               check_same_thread=False,
+                               cached_statements=STATEMENT_CACHE_SIZE)
+        conn.row_factory = sqlite3.Row
+        conn.executescript(_CONNECTION_PRAGMAS)
+    else:
+        _ensure_dir(path.parent)
+        conn = sqlite3.connect(str(path), factory=_ReusableConnection,
+                               check_same_thread=False,
+                               cached_statements=STATEMENT_CACHE_SIZE)
+        _configure_connection(conn, path)
+        # Surface tools may run before any game connection has migrated
+        # the file. Listing handles leave it alone; the writer paths pack it
+        _pack_planet_surface(conn, 'main')
+    conn.cache_key = key
     return conn
 
 
@@ -1680,21 +2145,23 @@ CREATE TABLE IF NOT EXISTS celestial_bodies (
 );
 
 -- Factions
+-- WITHOUT ROWID keys are not rowid aliases, so the CHECKs keep rejecting
+-- non-integer ids the way a rowid table's INTEGER PRIMARY KEY does
 CREATE TABLE IF NOT EXISTS factions (
-    faction_id INTEGER PRIMARY KEY,
+    faction_id INTEGER PRIMARY KEY CHECK(typeof(faction_id) = 'integer'),
     abbreviation TEXT NOT NULL UNIQUE,
     name TEXT NOT NULL,
     description TEXT DEFAULT ''
-);
+) WITHOUT ROWID;
 
 -- Trade goods catalogue (what items exist in the universe)
 CREATE TABLE IF NOT EXISTS trade_goods (
-    item_id INTEGER PRIMARY KEY,
+    item_id INTEGER PRIMARY KEY CHECK(typeof(item_id) = 'integer'),
     name TEXT NOT NULL,
     base_price INTEGER NOT NULL,
     mass_per_unit INTEGER NOT NULL,
     origin_system_id INTEGER DEFAULT NULL
-);
+) WITHOUT ROWID;
 
 -- Planetary resources (GM-only, not visible to players)
 -- Resources are separate from trade goods. When mined (future), a resource
@@ -1708,18 +2175,14 @@ CREATE TABLE IF NOT EXISTS resources (
 );
 
 -- Seed factions
-INSERT OR IGNORE INTO factions (faction_id, abbreviation, name, description)
-VALUES (11, 'STA', 'Stellar Training Academy', 'Default starting faction for new players');
-INSERT OR IGNORE INTO factions (faction_id, abbreviation, name, description)
-VALUES (12, 'MTG', 'Merchant Trade Guild', 'A coalition of traders and commerce-focused captains');
-INSERT OR IGNORE INTO factions (faction_id, abbreviation, name, description)
-VALUES (13, 'IMP', 'Imperial Navy', 'Military arm of the Terran Empire');
-INSERT OR IGNORE INTO factions (faction_id, abbreviation, name, description)
-VALUES (14, 'FRN', 'Frontier Coalition', 'Independent settlers and explorers of the outer systems');
-INSERT OR IGNORE INTO factions (faction_id, abbreviation, name, description)
-VALUES (15, 'SYN', 'Syndicate', 'A shadowy network of smugglers, pirates, and opportunists');
-INSERT OR IGNORE INTO factions (faction_id, abbreviation, name, description)
-VALUES (0, 'IND', 'Independent', 'No faction affiliation');
+INSERT INTO factions (faction_id, abbreviation, name, description) VALUES
+    (11, 'STA', 'Stellar Training Academy', 'Default starting faction for new players'),
+    (12, 'MTG', 'Merchant Trade Guild', 'A coalition of traders and commerce-focused captains'),
+    (13, 'IMP', 'Imperial Navy', 'Military arm of the Terran Empire'),
+    (14, 'FRN', 'Frontier Coalition', 'Independent settlers and explorers of the outer systems'),
+    (15, 'SYN', 'Syndicate', 'A shadowy network of smugglers, pirates, and opportunists'),
+    (0, 'IND', 'Independent', 'No faction affiliation')
+ON CONFLICT DO NOTHING;
 
 -- Ship component catalogue (what components can be installed on ships)
 -- 3-digit IDs for future trading. Category groups:
@@ -1750,40 +2213,26 @@ CREATE TABLE IF NOT EXISTS ship_components (
 );
 
 -- Seed ship components
-INSERT OR IGNORE INTO ship_components VALUES
-    (100, 'Standard Bridge', 'bridge', 50, 0, 0, 0, 0, 0, 0, 0, 0, NULL, 500, 0, 0, 0, NULL, 0, 'Basic command centre. Required for ship operation.');
-INSERT OR IGNORE INTO ship_components VALUES
-    (110, 'Thruster Array', 'thruster', 20, 0, 0, 0, 5, 0, 0, 0, 0, NULL, 800, 0, 0, 0, NULL, 0, 'Standard thruster pack. Provides thrust for gravity rating.');
-INSERT OR IGNORE INTO ship_components VALUES
-    (111, 'Heavy Thruster Pack', 'thruster', 30, 0, 0, 0, 10, 0, 0, 0, 0, NULL, 1500, 0, 0, 0, NULL, 0, 'High-output thrusters for larger vessels or heavy landing.');
-INSERT OR IGNORE INTO ship_components VALUES
-    (120, 'Commercial Sublight Engine', 'engine', 10, 0, 0, 0, 0, 1.0, 0, 0, 0, NULL, 1200, 0, 0, 0, NULL, 0, 'Standard propulsion. 1.0 efficiency.');
-INSERT OR IGNORE INTO ship_components VALUES
-    (121, 'Military Sublight Engine', 'engine', 10, 0, 0, 0, 0, 1.5, 0, 0, 0, 'military', 2500, 0, 0, 0, NULL, 0, 'High-performance drive. 1.5 efficiency. Military hulls only.');
-INSERT OR IGNORE INTO ship_components VALUES
-    (130, 'Cargo Bay', 'cargo', 25, 20, 0, 0, 0, 0, 0, 0, 0, NULL, 600, 0, 0, 0, NULL, 0, 'Standard modular cargo bay. 20 ST capacity.');
-INSERT OR IGNORE INTO ship_components VALUES
-    (131, 'Reinforced Cargo Bay', 'cargo', 30, 20, 0, 0, 0, 0, 0, 0, 0, NULL, 900, 0, 0, 0, NULL, 0, 'Armoured cargo storage. 20 ST capacity.');
-INSERT OR IGNORE INTO ship_components VALUES
-    (140, 'Crew Quarters', 'quarters', 30, 0, 20, 20, 0, 0, 0, 0, 0, NULL, 400, 0, 0, 0, NULL, 0, 'Standard crew accommodation with life support.');
-INSERT OR IGNORE INTO ship_components VALUES
-    (141, 'Military Bunks', 'quarters', 30, 0, 40, 25, 0, 0, 0, 0, 0, 'military', 500, 0, 0, 0, NULL, 0, 'Compact military berths. High crew capacity.');
-INSERT OR IGNORE INTO ship_components VALUES
-    (142, 'Luxury Cabins', 'quarters', 30, 0, 10, 15, 0, 0, 0, 0, 0, NULL, 700, 0, 0, 0, NULL, 0, 'Comfortable passenger cabins. Low density.');
-INSERT OR IGNORE INTO ship_components VALUES
-    (150, 'Basic Sensor Array', 'sensor', 10, 0, 0, 0, 0, 0, 5, 0, 0, NULL, 300, 0, 0, 0, NULL, 0, 'Standard detection and scanning suite.');
-INSERT OR IGNORE INTO ship_components VALUES
-    (151, 'Military Sensor Suite', 'sensor', 15, 0, 0, 0, 0, 0, 10, 0, 0, 'military', 1000, 0, 0, 0, NULL, 0, 'Advanced military-grade sensors.');
-INSERT OR IGNORE INTO ship_components VALUES
-    (152, 'Deep Space Scanner', 'sensor', 20, 0, 0, 0, 0, 0, 15, 0, 0, NULL, 1800, 0, 0, 0, NULL, 0, 'Long-range deep space detection system.');
-INSERT OR IGNORE INTO ship_components VALUES
-    (160, 'Jump Drive Mk1', 'jump_drive', 50, 0, 0, 0, 0, 0, 0, 5, 50, NULL, 5000, 0, 0, 0, NULL, 0, 'Basic hyperspace jump drive. Range 5 systems, 50 OC per activation.');
-INSERT OR IGNORE INTO ship_components VALUES
-    (161, 'Jump Drive Mk2', 'jump_drive', 60, 0, 0, 0, 0, 0, 0, 6, 40, NULL, 12000, 0, 0, 0, NULL, 0, 'Advanced jump drive. Range 6 systems, 40 OC per activation.');
-INSERT OR IGNORE INTO ship_components VALUES
+INSERT INTO ship_components VALUES
+    (100, 'Standard Bridge', 'bridge', 50, 0, 0, 0, 0, 0, 0, 0, 0, NULL, 500, 0, 0, 0, NULL, 0, 'Basic command centre. Required for ship operation.'),
+    (110, 'Thruster Array', 'thruster', 20, 0, 0, 0, 5, 0, 0, 0, 0, NULL, 800, 0, 0, 0, NULL, 0, 'Standard thruster pack. Provides thrust for gravity rating.'),
+    (111, 'Heavy Thruster Pack', 'thruster', 30, 0, 0, 0, 10, 0, 0, 0, 0, NULL, 1500, 0, 0, 0, NULL, 0, 'High-output thrusters for larger vessels or heavy landing.'),
+    (120, 'Commercial Sublight Engine', 'engine', 10, 0, 0, 0, 0, 1.0, 0, 0, 0, NULL, 1200, 0, 0, 0, NULL, 0, 'Standard propulsion. 1.0 efficiency.'),
+    (121, 'Military Sublight Engine', 'engine', 10, 0, 0, 0, 0, 1.5, 0, 0, 0, 'military', 2500, 0, 0, 0, NULL, 0, 'High-performance drive. 1.5 efficiency. Military hulls only.'),
+    (130, 'Cargo Bay', 'cargo', 25, 20, 0, 0, 0, 0, 0, 0, 0, NULL, 600, 0, 0, 0, NULL, 0, 'Standard modular cargo bay. 20 ST capacity.'),
+    (131, 'Reinforced Cargo Bay', 'cargo', 30, 20, 0, 0, 0, 0, 0, 0, 0, NULL, 900, 0, 0, 0, NULL, 0, 'Armoured cargo storage. 20 ST capacity.'),
+    (140, 'Crew Quarters', 'quarters', 30, 0, 20, 20, 0, 0, 0, 0, 0, NULL, 400, 0, 0, 0, NULL, 0, 'Standard crew accommodation with life support.'),
+    (141, 'Military Bunks', 'quarters', 30, 0, 40, 25, 0, 0, 0, 0, 0, 'military', 500, 0, 0, 0, NULL, 0, 'Compact military berths. High crew capacity.'),
+    (142, 'Luxury Cabins', 'quarters', 30, 0, 10, 15, 0, 0, 0, 0, 0, NULL, 700, 0, 0, 0, NULL, 0, 'Comfortable passenger cabins. Low density.'),
+    (150, 'Basic Sensor Array', 'sensor', 10, 0, 0, 0, 0, 0, 5, 0, 0, NULL, 300, 0, 0, 0, NULL, 0, 'Standard detection and scanning suite.'),
+    (151, 'Military Sensor Suite', 'sensor', 15, 0, 0, 0, 0, 0, 10, 0, 0, 'military', 1000, 0, 0, 0, NULL, 0, 'Advanced military-grade sensors.'),
+    (152, 'Deep Space Scanner', 'sensor', 20, 0, 0, 0, 0, 0, 15, 0, 0, NULL, 1800, 0, 0, 0, NULL, 0, 'Long-range deep space detection system.'),
+    (160, 'Jump Drive Mk1', 'jump_drive', 50, 0, 0, 0, 0, 0, 0, 5, 50, NULL, 5000, 0, 0, 0, NULL, 0, 'Basic hyperspace jump drive. Range 5 systems, 50 OC per activation.'),
+    (161, 'Jump Drive Mk2', 'jump_drive', 60, 0, 0, 0, 0, 0, 0, 6, 40, NULL, 12000, 0, 0, 0, NULL, 0, 'Advanced jump drive. Range 6 systems, 40 OC per activation.'),
     (200, 'Beam Cannon Mk1', 'weapon', 15, 0, 0, 0, 0, 0, 0, 0, 0, NULL, 2500,
      10, 2, 1, 'beam', 0,
-     'Standard energy beam weapon. Damage 10, range 2, 1 shot per combat round. No ammunition required.');
+     'Standard energy beam weapon. Damage 10, range 2, 1 shot per combat round. No ammunition required.')
+ON CONFLICT DO NOTHING;
 
 -- Base module catalogue (what modules can be installed on starbases/ports/outposts)
 -- 3-digit IDs in 500-599 range. Category groups:
@@ -1810,94 +2259,186 @@ CREATE TABLE IF NOT EXISTS base_modules (
 );
 
 -- Seed base modules
-INSERT OR IGNORE INTO base_modules VALUES
+INSERT INTO base_modules VALUES
     (500, 'Command Module', 'command', 10, NULL, 0, 0, 0, 0, 0, 0, 0, 0, 0, 2000,
-     '1 required per 100 modules for 100% command efficiency.');
-INSERT OR IGNORE INTO base_modules VALUES
+     '1 required per 100 modules for 100% command efficiency.'),
     (510, 'Docking Bay', 'dock', 20, 'starbase', 1, 0, 0, 0, 0, 0, 0, 0, 0, 5000,
-     'Allows one ship to dock. Starbase only.');
-INSERT OR IGNORE INTO base_modules VALUES
+     'Allows one ship to dock. Starbase only.'),
     (511, 'Heavy Docking Bay', 'dock', 30, 'starbase', 1, 0, 0, 0, 0, 0, 0, 0, 0, 8000,
-     'Reinforced bay for larger vessels. Starbase only.');
-INSERT OR IGNORE INTO base_modules VALUES
+     'Reinforced bay for larger vessels. Starbase only.'),
     (520, 'Mining Rig', 'mining', 15, 'surface', 0, 10, 0, 0, 0, 0, 0, 0, 0, 3000,
-     'Extracts planetary resources. Surface port or outpost only.');
-INSERT OR IGNORE INTO base_modules VALUES
+     'Extracts planetary resources. Surface port or outpost only.'),
     (521, 'Deep Core Drill', 'mining', 25, 'surface', 0, 25, 0, 0, 0, 0, 0, 0, 0, 7000,
-     'Heavy mining for deep deposits. Surface port or outpost only.');
-INSERT OR IGNORE INTO base_modules VALUES
+     'Heavy mining for deep deposits. Surface port or outpost only.'),
     (530, 'Assembly Plant', 'factory', 25, NULL, 0, 0, 10, 0, 0, 0, 0, 0, 0, 6000,
-     'Constructs items from raw materials.');
-INSERT OR IGNORE INTO base_modules VALUES
+     'Constructs items from raw materials.'),
     (531, 'Advanced Fabricator', 'factory', 40, NULL, 0, 0, 25, 0, 0, 0, 0, 0, 0, 12000,
-     'High-tech manufacturing facility.');
-INSERT OR IGNORE INTO base_modules VALUES
+     'High-tech manufacturing facility.'),
     (540, 'Repair Bay', 'maintenance', 15, 'starbase', 0, 0, 0, 5, 0, 0, 0, 0, 0, 4000,
-     'Repairs ship integrity. Starbase only.');
-INSERT OR IGNORE INTO base_modules VALUES
+     'Repairs ship integrity. Starbase only.'),
     (541, 'Shipyard', 'maintenance', 30, 'starbase', 0, 0, 0, 15, 0, 0, 0, 0, 0, 10000,
-     'Full shipyard for major repairs and refits. Starbase only.');
-INSERT OR IGNORE INTO base_modules VALUES
+     'Full shipyard for major repairs and refits. Starbase only.'),
     (550, 'Trade Market', 'market', 10, 'surface', 0, 0, 0, 0, 100, 0, 0, 0, 0, 3000,
-     'Enables trade with planetary population. Surface port only. Generates background income.');
-INSERT OR IGNORE INTO base_modules VALUES
+     'Enables trade with planetary population. Surface port only. Generates background income.'),
     (551, 'Commerce Hub', 'market', 20, 'surface', 0, 0, 0, 0, 250, 0, 0, 0, 0, 8000,
-     'Large-scale trading hub. Surface port only. Higher income.');
-INSERT OR IGNORE INTO base_modules VALUES
+     'Large-scale trading hub. Surface port only. Higher income.'),
     (560, 'Storage Warehouse', 'storage', 5, NULL, 0, 0, 0, 0, 0, 500, 0, 0, 0, 1500,
-     'Bulk storage for goods and materials. 500 ST capacity.');
-INSERT OR IGNORE INTO base_modules VALUES
+     'Bulk storage for goods and materials. 500 ST capacity.'),
     (561, 'Secure Vault', 'storage', 8, NULL, 0, 0, 0, 0, 0, 200, 0, 0, 0, 3000,
-     'Armoured storage for valuables. 200 ST capacity.');
-INSERT OR IGNORE INTO base_modules VALUES
+     'Armoured storage for valuables. 200 ST capacity.'),
     (570, 'Habitat Block', 'habitat', 2, NULL, 0, 0, 0, 0, 0, 0, 50, 0, 0, 2000,
-     'Housing for 50 employees.');
-INSERT OR IGNORE INTO base_modules VALUES
+     'Housing for 50 employees.'),
     (571, 'Life Dome', 'habitat', 3, 'surface', 0, 0, 0, 0, 0, 0, 100, 0, 0, 4000,
-     'Pressurised dome housing 100 employees. Surface only.');
-INSERT OR IGNORE INTO base_modules VALUES
+     'Pressurised dome housing 100 employees. Surface only.'),
     (580, 'Defence Turret', 'defence', 10, NULL, 0, 0, 0, 0, 0, 0, 0, 5, 0, 3500,
-     'Automated defensive weapon emplacement.');
-INSERT OR IGNORE INTO base_modules VALUES
+     'Automated defensive weapon emplacement.'),
     (581, 'Shield Generator', 'defence', 15, NULL, 0, 0, 0, 0, 0, 0, 0, 10, 0, 6000,
-     'Energy shield protecting the installation.');
-INSERT OR IGNORE INTO base_modules VALUES
+     'Energy shield protecting the installation.'),
     (590, 'Sensor Suite', 'sensor', 5, NULL, 0, 0, 0, 0, 0, 0, 0, 0, 15, 4000,
-     'Passive sensor array. Detects nearby ships and objects. Multiple suites stack with diminishing returns.');
-INSERT OR IGNORE INTO base_modules VALUES
+     'Passive sensor array. Detects nearby ships and objects. Multiple suites stack with diminishing returns.'),
     (591, 'Deep Scan Array', 'sensor', 10, NULL, 0, 0, 0, 0, 0, 0, 0, 0, 35, 9000,
-     'High-power sensor array with greater range and accuracy.');
+     'High-power sensor array with greater range and accuracy.')
+ON CONFLICT DO NOTHING;
 
--- Planet surface grid (31x31 terrain tiles per body, generated lazily)
+-- Planet surface grid (size x size terrain tiles per body, generated lazily)
 -- Intrinsic to the universe: terrain is world definition, not game state.
+-- tiles holds one terrain code per tile, row by row (see surface_gen).
 CREATE TABLE IF NOT EXISTS planet_surface (
-    body_id INTEGER NOT NULL,
-    x INTEGER NOT NULL,
-    y INTEGER NOT NULL,
-    terrain_type TEXT NOT NULL,
-    PRIMARY KEY (body_id, x, y),
+    body_id INTEGER PRIMARY KEY,
+    size INTEGER NOT NULL,
+    tiles BLOB NOT NULL,
     FOREIGN KEY (body_id) REFERENCES celestial_bodies(body_id)
 );
 
--- Indexes
-CREATE INDEX IF NOT EXISTS idx_bodies_system ON celestial_bodies(system_id);
-CREATE INDEX IF NOT EXISTS idx_links_a ON system_links(system_a);
+-- Indexes. Bodies are listed per system in grid order, so idx_bodies_grid
+-- serves that ORDER BY as well as plain system_id lookups. Lookups on
+-- system_a use UNIQUE(system_a, system_b); only system_b needs its own.
+DROP INDEX IF EXISTS idx_bodies_system;
+DROP INDEX IF EXISTS idx_links_a;
+CREATE INDEX IF NOT EXISTS idx_bodies_grid ON celestial_bodies(system_id, grid_row, grid_col);
 CREATE INDEX IF NOT EXISTS idx_links_b ON system_links(system_b);
 """
 
+# The same index changes for an already-attached universe.db
+_UNIVERSE_INDEX_MIGRATION = """
+DROP INDEX IF EXISTS universe.idx_bodies_system;
+DROP INDEX IF EXISTS universe.idx_links_a;
+CREATE INDEX IF NOT EXISTS universe.idx_bodies_grid ON celestial_bodies(system_id, grid_row, grid_col);
+"""
+
+
+# PRAGMA user_version stamps written once a schema script has been applied.
+# Bump the matching value whenever UNIVERSE_SCHEMA / STATE_SCHEMA changes so
+# existing files get the new script on their next init.
+UNIVERSE_SCHEMA_REVISION = 3
+STATE_SCHEMA_REVISION = 7
+
+
+# Storage layout for newly created files. Both settings only take effect
+# before the first table is written, so they are applied to empty files only.
+# Free pages are handed back at turn boundaries (see backup_state).
+_NEW_DATABASE_PRAGMAS = """
+PRAGMA page_size = 8192;
+PRAGMA auto_vacuum = INCREMENTAL;
+"""
+INCREMENTAL_VACUUM_PAGES = 256
+# Turn backups copy this many pages per step of the online backup, pausing
+# briefly between steps so other writers can get in
+BACKUP_PAGES_PER_STEP = 1024
+BACKUP_STEP_SLEEP = 0.001
+
+
+def _is_new_database(path):
+    return not path.exists() or path.stat().st_size == 0
+
+
+def _schema_is_current(conn, revision):
+    """True if this file has already had the schema script at this revision."""
+    return conn.execute("PRAGMA user_version").fetchone()[0] == revision
+
+
+# PRAGMA optimize mask for a freshly bulk-loaded file: 0x02 runs ANALYZE
+# where it would help, 0x10000 considers every table rather than only those
+# this connection has queried
+OPTIMIZE_AFTER_BULK_LOAD = 0x10002
+
+
+@contextmanager
+def _bulk_load(conn):
+    """
+    with _bulk_load(conn): ... — fill a database that can simply be rebuilt
+    if anything fails (split_legacy_db keeps its source file): no fsyncs,
+    an in-memory rollback journal and an exclusive lock for the duration.
+    WAL and the usual durability settings are restored on the way out.
+    """
+    conn.executescript("""
+PRAGMA synchronous = OFF;
+PRAGMA journal_mode = MEMORY;
+PRAGMA locking_mode = EXCLUSIVE;
+""")
+    try:
+        yield conn
+    finally:
+        if conn.in_transaction:
+            conn.rollback()
+        conn.executescript("""
+PRAGMA locking_mode = NORMAL;
+PRAGMA journal_mode = WAL;
+PRAGMA synchronous = NORMAL;
+""")
+
+
+def _drop_secondary_indexes(conn):
+    """
+    Drop a database's non-unique CREATE INDEX indexes before a bulk load and
+    return their CREATE statements, so they can be rebuilt once from the
+    loaded rows instead of being updated row by row. Unique indexes stay:
+    INSERT OR IGNORE relies on them to skip duplicates during the load.
+    """
+    indexes = conn.execute("""
+        SELECT name, sql FROM sqlite_master
+        WHERE type = 'index' AND sql IS NOT NULL AND sql NOT LIKE 'CREATE UNIQUE%'
+    """).fetchall()
+    for name, _ in indexes:
+        conn.execute(f"DROP INDEX {name}")
+    return [sql for _, sql in indexes]
+
+
+def _optimize_and_close(conn, mask=OPTIMIZE_AFTER_BULK_LOAD):
+    """Refresh the query planner's statistics, then close the connection."""
+    conn.execute(f"PRAGMA optimize = {mask:#x}")
+    conn.close()
+
+
+def _run_schema_script(conn, script):
+    """
+    Run a DDL/seed script inside one BEGIN IMMEDIATE transaction, so the
+    whole script costs a single journal flush and takes the write lock up
+    front instead of part-way through.
+    """
+    try:
+        conn.executescript(f"BEGIN IMMEDIATE;\n{script}\nCOMMIT;")
+    except sqlite3.Error:
+        if conn.in_transaction:
+            conn.rollback()
+        raise
+
 
 def init_universe_db(db_path=None):
     """Create/initialise universe.db with world definition tables."""
     path = Path(db_path) if db_path else UNIVERSE_DB_PATH
-    path.parent.mkdir(parents=True, exist_ok=True)
+    _ensure_dir(path.parent)
+    is_new = _is_new_database(path)
     conn = sqlite3.connect(str(path))
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON")
-    conn.executescript(UNIVERSE_SCHEMA)
-    conn.execute(
-        "INSERT OR REPLACE INTO universe_meta (key, value) VALUES ('schema_version', '1')"
-    )
-    conn.commit()
+    if is_new:
+        conn.executescript(_NEW_DATABASE_PRAGMAS)
+    _configure_connection(conn, path)
+    if _schema_is_current(conn, UNIVERSE_SCHEMA_REVISION):
+        return conn
+    _run_schema_script(conn, UNIVERSE_SCHEMA + f"""
+INSERT OR REPLACE INTO universe_meta (key, value) VALUES ('schema_version', '1');
+PRAGMA user_version = {UNIVERSE_SCHEMA_REVISION};
+""")
     return conn
 
 
@@ -2126,9 +2667,10 @@ CREATE TABLE IF NOT EXISTS base_trade_config (
     FOREIGN KEY (base_id) REFERENCES starbases(base_id)
 );
 
--- Market prices (current cycle, depleting)
+-- Market prices (current cycle, depleting): one row per base and item,
+-- overwritten in place when a new cycle starts
 CREATE TABLE IF NOT EXISTS market_prices (
-    price_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    price_id INTEGER PRIMARY KEY,
     game_id TEXT NOT NULL,
     base_id INTEGER NOT NULL,
     item_id INTEGER NOT NULL,
@@ -2366,19 +2908,57 @@ CREATE INDEX IF NOT EXISTS idx_ships_system ON ships(system_id);
 CREATE INDEX IF NOT EXISTS idx_ships_game ON ships(game_id);
 CREATE INDEX IF NOT EXISTS idx_bases_system ON starbases(system_id);
 CREATE INDEX IF NOT EXISTS idx_orders_turn ON turn_orders(game_id, turn_year, turn_week);
-CREATE INDEX IF NOT EXISTS idx_contacts_prefect ON known_contacts(prefect_id);
+CREATE INDEX IF NOT EXISTS idx_contacts_object ON known_contacts(prefect_id, object_type, object_id);
+CREATE INDEX IF NOT EXISTS idx_ships_game_system ON ships(game_id, system_id);
+CREATE INDEX IF NOT EXISTS idx_ships_owner ON ships(owner_prefect_id, game_id);
+CREATE INDEX IF NOT EXISTS idx_ships_docked ON ships(docked_at_base_id);
+CREATE INDEX IF NOT EXISTS idx_turn_log_turn ON turn_log(game_id, turn_year, turn_week);
+CREATE UNIQUE INDEX IF NOT EXISTS idx_market_prices_key ON market_prices(game_id, base_id, item_id);
+CREATE INDEX IF NOT EXISTS idx_cargo_ship ON cargo_items(ship_id, item_type_id);
+CREATE INDEX IF NOT EXISTS idx_installed_items_ship ON installed_items(ship_id, component_id);
+CREATE INDEX IF NOT EXISTS idx_officers_ship ON officers(ship_id);
+CREATE INDEX IF NOT EXISTS idx_players_email ON players(email, game_id);
+CREATE INDEX IF NOT EXISTS idx_prefects_player ON prefects(player_id);
+CREATE INDEX IF NOT EXISTS idx_prefects_game ON prefects(game_id);
+CREATE INDEX IF NOT EXISTS idx_starbases_game ON starbases(game_id);
+CREATE INDEX IF NOT EXISTS idx_starbases_port ON starbases(surface_port_id);
+CREATE INDEX IF NOT EXISTS idx_modules_starbase ON installed_modules(starbase_id);
+CREATE INDEX IF NOT EXISTS idx_modules_port ON installed_modules(port_id);
+CREATE INDEX IF NOT EXISTS idx_modules_outpost ON installed_modules(outpost_id);
+CREATE INDEX IF NOT EXISTS idx_inventory_starbase ON base_inventory(starbase_id);
+CREATE INDEX IF NOT EXISTS idx_inventory_port ON base_inventory(port_id);
+CREATE INDEX IF NOT EXISTS idx_inventory_outpost ON base_inventory(outpost_id);
+CREATE INDEX IF NOT EXISTS idx_trade_config_game ON base_trade_config(game_id, base_id);
+CREATE INDEX IF NOT EXISTS idx_pending_subject ON pending_orders(game_id, subject_type, subject_id);
+CREATE INDEX IF NOT EXISTS idx_starbases_owner ON starbases(owner_prefect_id, game_id);
+CREATE INDEX IF NOT EXISTS idx_ports_owner ON surface_ports(owner_prefect_id, game_id);
+CREATE INDEX IF NOT EXISTS idx_outposts_owner ON outposts(owner_prefect_id, game_id);
+CREATE INDEX IF NOT EXISTS idx_ports_body ON surface_ports(body_id);
+CREATE INDEX IF NOT EXISTS idx_outposts_body ON outposts(body_id);
+CREATE INDEX IF NOT EXISTS idx_messages_recipient ON messages(game_id, recipient_type, recipient_id, delivered);
+CREATE INDEX IF NOT EXISTS idx_faction_requests_prefect ON faction_requests(game_id, prefect_id, status);
+
+-- Ships with their owner's faction and name (see SHIP_FULL_VIEW)
+CREATE VIEW IF NOT EXISTS ship_full AS
+SELECT s.*, pp.faction_id, pp.name AS owner_name
+FROM ships s LEFT JOIN prefects pp ON s.owner_prefect_id = pp.prefect_id;
 """
 
 
 def init_state_db(db_path=None):
     """Create/initialise game_state.db with game state tables."""
     path = Path(db_path) if db_path else STATE_DB_PATH
-    path.parent.mkdir(parents=True, exist_ok=True)
+    _ensure_dir(path.parent)
+    is_new = _is_new_database(path)
     conn = sqlite3.connect(str(path))
-    conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON")
-    conn.executescript(STATE_SCHEMA)
-    conn.commit()
+    if is_new:
+        conn.executescript(_NEW_DATABASE_PRAGMAS)
+    _configure_connection(conn, path)
+    if _schema_is_current(conn, STATE_SCHEMA_REVISION):
+        return conn
+    _run_schema_script(conn, STATE_SCHEMA + f"""
+PRAGMA user_version = {STATE_SCHEMA_REVISION};
+""")
     return conn
 
 
@@ -2396,10 +2976,63 @@ def init_db(state_db_path=None, universe_db_path=None):
     else:
         uni_path = state_path.parent / "universe.db"
 
-    init_universe_db(uni_path)
-    init_state_db(state_path)
+    # Schema set-up only: everything after this goes through the one
+    # state connection with universe.db attached
+    init_universe_db(uni_path).close()
+    init_state_db(state_path).close()
+
+    # The schema may have just been (re)created: make sure the returned
+    # connection runs the attach-time migrations instead of reusing one.
+    _discard_cached_connection((str(state_path), str(uni_path)))
+    clear_faction_cache()
+    conn = get_connection(state_path, uni_path)
+    # Give the query planner statistics for the new indexes
+    conn.execute("ANALYZE")
+    conn.commit()
+    return conn
 
-    return get_connection(state_path, uni_path)
+
+# ======================================================================
+# BULK INSERT
+# ======================================================================
+
+# Bound parameters per multi-row INSERT in bulk_insert(). 999 is the
+# smallest SQLITE_MAX_VARIABLE_NUMBER any SQLite build ships with.
+BULK_INSERT_MAX_PARAMS = 999
+
+
+def bulk_insert(conn, table, rows, columns=None, or_ignore=False, upsert_key=None):
+    """
+    Insert many rows with multi-row VALUES statements: each statement
+    carries as many rows as fit in BULK_INSERT_MAX_PARAMS, so SQLite runs
+    one program per chunk rather than one per row. rows are dicts or
+    sqlite3.Row objects; columns defaults to the keys of the first row.
+    With upsert_key (a tuple of unique-key columns), rows that collide
+    overwrite the existing row's other columns in place. Takes the write
+    lock up front if no transaction is open; the caller commits. Returns
+    the number of rows passed in.
+    """
+    rows = list(rows)
+    if not rows:
+        return 0
+    cols = list(columns) if columns else list(rows[0].keys())
+    verb = "INSERT OR IGNORE" if or_ignore else "INSERT"
+    head = f"{verb} INTO {table} ({', '.join(cols)}) VALUES "
+    tail = ""
+    if upsert_key:
+        updates = ', '.join(f"{c} = excluded.{c}" for c in cols if c not in upsert_key)
+        tail = f" ON CONFLICT ({', '.join(upsert_key)}) DO UPDATE SET {updates}"
+    row_sql = f"({', '.join('?' * len(cols))})"
+    per_stmt = max(1, BULK_INSERT_MAX_PARAMS // len(cols))
+    if not conn.in_transaction:
+        conn.execute("BEGIN IMMEDIATE")
+    for start in range(0, len(rows), per_stmt):
+        chunk = rows[start:start + per_stmt]
+        # Full chunks all share one SQL string, so only the last chunk
+        # can miss the statement cache
+        sql = head + ', '.join([row_sql] * len(chunk)) + tail
+        conn.execute(sql, [r[c] for r in chunk for c in cols])
+    return len(rows)
 
 
 # ======================================================================
@@ -2417,7 +3050,7 @@ def backup_state(turn_label=None, state_db_path=None):
         return None
 
     saves_dir = state_path.parent / "saves"
-    saves_dir.mkdir(parents=True, exist_ok=True)
+    _ensure_dir(saves_dir)
 
     if turn_label:
         backup_name = f"game_state_{turn_label}.db"
@@ -2426,7 +3059,20 @@ def backup_state(turn_label=None, state_db_path=None):
         backup_name = f"game_state_{timestamp}.db"
 
     backup_path = saves_dir / backup_name
-    shutil.copy2(str(state_path), str(backup_path))
+    src = sqlite3.connect(str(state_path))
+    # Turn boundary: return a batch of free pages to the filesystem (no-op
+    # unless the file was created with auto_vacuum = INCREMENTAL). Each
+    # result row is one step, so the cursor must be drained.
+    src.execute(f"PRAGMA incremental_vacuum({INCREMENTAL_VACUUM_PAGES})").fetchall()
+    src.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+    # The online backup API reads a consistent snapshot, including commits
+    # still in the -wal file, and cooperates with other connections' locks.
+    dst = sqlite3.connect(str(backup_path))
+    try:
+        src.backup(dst, pages=BACKUP_PAGES_PER_STEP, sleep=BACKUP_STEP_SLEEP)
+    finally:
+        dst.close()
+        src.close()
     return backup_path
 
 
@@ -2786,16 +3432,13 @@ def grant_faction_knowledge(conn, faction_id, game_id, object_type, object_id,
 def faction_knowledge_set(conn, faction_id, game_id, object_type):
     """Return the set of object_ids of the given type known to the faction
     (faction-level rows only — does not include public objects)."""
-    ids = set()
     if faction_id is None:
-        return ids
-    for r in conn.execute(
+        return set()
+    return {r[0] for r in tuple_cursor(conn).execute(
         """SELECT object_id FROM faction_knowledge
            WHERE faction_id = ? AND game_id = ? AND object_type = ?""",
         (faction_id, game_id, object_type)
-    ).fetchall():
-        ids.add(r['object_id'])
-    return ids
+    )}
 
 
 def get_faction_knowledge_attribution(conn, faction_id, game_id,
@@ -2859,6 +3502,7 @@ def prefect_knowledge_set(conn, prefect_id, game_id, object_type):
     (public OR personal OR via current faction). Useful for filtering
     query results."""
     ids = set()
+    cur = tuple_cursor(conn)
     # Public
     if object_type in _KNOWLEDGE_TABLES:
         tbl, idcol, is_global = _KNOWLEDGE_TABLES[object_type]
@@ -2869,31 +3513,28 @@ def prefect_knowledge_set(conn, prefect_id, game_id, object_type):
             where += " AND game_id = ?"
             params = (game_id,)
         try:
-            for r in conn.execute(
+            ids.update(r[0] for r in cur.execute(
                 f"SELECT {idcol} FROM {schema}{tbl} WHERE {where}", params
-            ).fetchall():
-                ids.add(r[idcol])
+            ))
         except Exception:
             pass
     # Personal
-    for r in conn.execute(
+    ids.update(r[0] for r in cur.execute(
         """SELECT object_id FROM prefect_knowledge
            WHERE prefect_id = ? AND game_id = ? AND object_type = ?""",
         (prefect_id, game_id, object_type)
-    ).fetchall():
-        ids.add(r['object_id'])
+    ))
     # Faction (if member of one)
-    pf = conn.execute(
+    pf = cur.execute(
         "SELECT faction_id FROM prefects WHERE prefect_id = ?",
         (prefect_id,)
     ).fetchone()
-    if pf and pf['faction_id']:
-        for r in conn.execute(
+    if pf and pf[0]:
+        ids.update(r[0] for r in cur.execute(
             """SELECT object_id FROM faction_knowledge
                WHERE faction_id = ? AND game_id = ? AND object_type = ?""",
-            (pf['faction_id'], game_id, object_type)
-        ).fetchall():
-            ids.add(r['object_id'])
+            (pf[0], game_id, object_type)
+        ))
     return ids
 
 
@@ -2947,7 +3588,7 @@ def recalculate_surface_base_combat_stats(conn, port_id=None, outpost_id=None):
 
     # Add max_shield_sp / shield_sp / armour columns to surface tables if not present.
     # (Migration should have done this for ports/outposts, but be defensive.)
-    cols = [r[1] for r in conn.execute(f"PRAGMA table_info({tbl})").fetchall()]
+    cols = _columns(conn, tbl)
     for col, ddl in [
         ('max_shield_sp', 'INTEGER DEFAULT 0'),
         ('shield_sp',     'INTEGER DEFAULT 0'),
@@ -3159,16 +3800,101 @@ def recalculate_base_stats(conn, starbase_id=None, port_id=None, outpost_id=None
 # FACTION HELPERS
 # ======================================================================
 
+# Factions are static lookup data (a handful of rows), so the whole table is
+# snapshotted per database on first use and served from memory afterwards.
+# Only connections from get_connection()/get_reader() carry a stable
+# cache_key; any other connection falls through to a plain SELECT.
+# Faction records are the read-only sqlite3.Row objects themselves, shared
+# between callers rather than copied into fresh dicts on every lookup.
+# Only these columns are used by callers; description is never displayed
+_FACTION_COLUMNS = "faction_id, abbreviation, name"
+# Fixed SQL text, so every lookup hits the connection's statement cache
+_SQL_ALL_FACTIONS = f"SELECT {_FACTION_COLUMNS} FROM factions"
+_SQL_GET_FACTION = f"SELECT {_FACTION_COLUMNS} FROM factions WHERE faction_id = ?"
+_SQL_PREFECT_FACTION = """
+    SELECT p.faction_id, f.abbreviation, f.name
+    FROM prefects p LEFT JOIN factions f ON f.faction_id = p.faction_id
+    WHERE p.prefect_id = ?"""
+_FACTION_CACHE = {}
+
+
+# Shared by every unaffiliated lookup, so it is handed out read-only
+_INDEPENDENT_FACTION = MappingProxyType(
+    {'faction_id': None, 'abbreviation': 'IND', 'name': 'Independent'}
+)
+
+
+def _unknown_faction(faction_id):
+    return {'faction_id': faction_id, 'abbreviation': '???', 'name': 'Unknown'}
+
+
+def clear_faction_cache():
+    """Forget faction snapshots (call after writing to factions)."""
+    _FACTION_CACHE.clear()
+
+
+def load_faction_cache(conn):
+    """Snapshot the factions table for this connection's database."""
+    factions = {row['faction_id']: row for row in conn.execute(
+        _SQL_ALL_FACTIONS
+    ).fetchall()}
+    db_key = getattr(conn, 'cache_key', None)
+    if db_key:
+        _FACTION_CACHE[db_key] = factions
+    return factions
+
+
+def _faction_table(conn):
+    db_key = getattr(conn, 'cache_key', None)
+    if db_key:
+        factions = _FACTION_CACHE.get(db_key)
+        if factions is not None:
+            return factions
+        return load_faction_cache(conn)
+    return None
+
+
+def find_faction(conn, faction_id):
+    """Get faction details by ID, or None if there is no such faction."""
+    factions = _faction_table(conn)
+    if factions is not None:
+        return factions.get(faction_id)
+    return conn.execute(_SQL_GET_FACTION, (faction_id,)).fetchone()
+
+
 def get_faction(conn, faction_id):
     """Get faction details by ID."""
     if faction_id is None:
-        return {'faction_id': None, 'abbreviation': 'IND', 'name': 'Independent'}
-    result = conn.execute(
-        "SELECT * FROM factions WHERE faction_id = ?", (faction_id,)
-    ).fetchone()
-    if result:
-        return dict(result)
-    return {'faction_id': faction_id, 'abbreviation': '???', 'name': 'Unknown'}
+        return _INDEPENDENT_FACTION
+    return find_faction(conn, faction_id) or _unknown_faction(faction_id)
+
+
+def get_factions_bulk(conn, faction_ids):
+    """
+    Get faction details for many IDs with at most one query.
+    Returns {faction_id: faction record}, using the same fallbacks as
+    get_faction() for None and unknown IDs.
+    """
+    wanted = set(faction_ids)
+    factions = _faction_table(conn)
+    if factions is None:
+        ids = [fid for fid in wanted if fid is not None]
+        factions = {}
+        if ids:
+            placeholders = ",".join("?" * len(ids))
+            factions = {row['faction_id']: row for row in conn.execute(
+                f"SELECT {_FACTION_COLUMNS} FROM factions WHERE faction_id IN ({placeholders})",
+                ids
+            ).fetchall()}
+    result = {}
+    for faction_id in wanted:
+        if faction_id is None:
+            result[None] = _INDEPENDENT_FACTION
+        elif faction_id in factions:
+            result[faction_id] = factions[faction_id]
+        else:
+            result[faction_id] = _unknown_faction(faction_id)
+    return result
 
 
 def faction_display_name(conn, name, faction_id):
@@ -3178,20 +3904,62 @@ def faction_display_name(conn, name, faction_id):
 
 
 def get_faction_for_prefect(conn, prefect_id):
-    """Look up the faction for a prefect."""
-    result = conn.execute(
-        "SELECT faction_id FROM prefects WHERE prefect_id = ?",
-        (prefect_id,)
-    ).fetchone()
-    if result and result['faction_id']:
-        return get_faction(conn, result['faction_id'])
-    return {'faction_id': None, 'abbreviation': 'IND', 'name': 'Independent'}
+    """Look up the faction for a prefect (one query: prefect joined to faction)."""
+    result = conn.execute(_SQL_PREFECT_FACTION, (prefect_id,)).fetchone()
+    if not result or not result['faction_id']:
+        return _INDEPENDENT_FACTION
+    if result['abbreviation'] is None:
+        return _unknown_faction(result['faction_id'])
+    return result
 
 
 # ======================================================================
 # LEGACY DATABASE SPLIT (one-time migration from single DB)
 # ======================================================================
 
+# celestial_bodies columns copied by split_legacy_db, and the SQL used in
+# place of those an older legacy file lacks (surface_size by body type)
+_BODY_COPY_COLUMNS = (
+    'body_id', 'system_id', 'name', 'body_type', 'parent_body_id',
+    'grid_col', 'grid_row', 'gravity', 'temperature', 'atmosphere',
+    'tectonic_activity', 'hydrosphere', 'life', 'map_symbol', 'surface_size',
+)
+_LEGACY_BODY_DEFAULTS = {
+    'tectonic_activity': '0',
+    'hydrosphere': '0',
+    'life': "'None'",
+    'surface_size': ("CASE body_type WHEN 'gas_giant' THEN 50 WHEN 'moon' THEN 15 "
+                     "WHEN 'asteroid' THEN 11 ELSE 31 END"),
+}
+
+# Fixed universe copies from the legacy file, ATTACHed as "legacy"; ? is
+# the created_turn stamp where taken
+_SQL_COPY_STAR_SYSTEMS = """
+    INSERT OR IGNORE INTO star_systems
+    (system_id, name, star_name, star_spectral_type,
+     star_grid_col, star_grid_row, created_turn)
+    SELECT system_id, name, star_name, star_spectral_type,
+           star_grid_col, star_grid_row, ?
+    FROM legacy.star_systems"""
+_SQL_COPY_SYSTEM_LINKS = """
+    INSERT OR IGNORE INTO system_links (system_a, system_b, known_by_default, created_turn)
+    SELECT min(system_a, system_b), max(system_a, system_b), known_by_default, ?
+    FROM legacy.system_links"""
+_SQL_COPY_FACTIONS = """
+    INSERT OR REPLACE INTO factions (faction_id, abbreviation, name, description)
+    SELECT faction_id, abbreviation, name, description FROM legacy.factions"""
+_SQL_COPY_TRADE_GOODS = """
+    INSERT OR IGNORE INTO trade_goods (item_id, name, base_price, mass_per_unit)
+    SELECT item_id, name, base_price, mass_per_unit FROM legacy.trade_goods"""
+_SQL_INSERT_SURFACE = "INSERT OR REPLACE INTO planet_surface (body_id, size, tiles) VALUES (?, ?, ?)"
+
+# Tables whose legacy rows must arrive in a set order: market_prices now
+# keeps one row per base and item, so the row to keep has to be copied first
+_LEGACY_COPY_ORDER = {
+    'market_prices': f"ORDER BY {_market_row_rank('legacy.games')} DESC",
+}
+
+
 def split_legacy_db(legacy_path):
     """
     Split an old stellar_dominion.db into universe.db + game_state.db.
@@ -3212,149 +3980,134 @@ def split_legacy_db(legacy_path):
 
     print(f"Splitting {legacy_path.name} into universe.db + game_state.db ...")
 
-    # First: apply any pending legacy migrations
-    _apply_legacy_migrations(legacy_path)
+    # First: apply any pending legacy migrations. Nothing is written to the
+    # new files if they leave dangling references behind
+    try:
+        _apply_legacy_migrations(legacy_path)
+    except sqlite3.IntegrityError as e:
+        print(f"Error: {e}. Split aborted; fix {legacy_path.name} and re-run.")
+        return False
 
     legacy = sqlite3.connect(str(legacy_path))
     legacy.row_factory = sqlite3.Row
+    # The legacy file is only read from here on: take its layout once
+    legacy_schema = _schema_columns(legacy)
 
     # ---- Create universe.db ----
     uni_conn = init_universe_db(uni_path)
 
-    # Disable FK constraints during bulk import (parent_body_id ordering)
-    uni_conn.execute("PRAGMA foreign_keys = OFF")
-
-    # Get current turn for created_turn stamps
-    game = legacy.execute("SELECT * FROM games LIMIT 1").fetchone()
-    created_turn = f"{game['current_year']}.{game['current_week']}" if game else None
-
-    # Copy star_systems (drop game_id column, add created_turn)
-    for row in legacy.execute("SELECT * FROM star_systems").fetchall():
-        uni_conn.execute("""
-            INSERT OR IGNORE INTO star_systems
-            (system_id, name, star_name, star_spectral_type,
-             star_grid_col, star_grid_row, created_turn)
-            VALUES (?, ?, ?, ?, ?, ?, ?)
-        """, (row['system_id'], row['name'], row['star_name'],
-              row['star_spectral_type'], row['star_grid_col'],
-              row['star_grid_row'], created_turn))
-
-    # Copy celestial_bodies
-    cb_cols = [r[1] for r in legacy.execute("PRAGMA table_info(celestial_bodies)").fetchall()]
-    for row in legacy.execute("SELECT * FROM celestial_bodies").fetchall():
-        # Determine surface_size: from column if present, else defaults by type
-        if 'surface_size' in cb_cols:
-            ssize = row['surface_size']
-        else:
-            bt = row['body_type']
-            ssize = 50 if bt == 'gas_giant' else 15 if bt == 'moon' else 11 if bt == 'asteroid' else 31
-        uni_conn.execute("""
+    with _bulk_load(uni_conn):
+        # Disable FK constraints during bulk import (parent_body_id ordering),
+        # then copy every table inside one transaction, committed below
+        uni_conn.execute("PRAGMA foreign_keys = OFF")
+        uni_conn.execute("ATTACH DATABASE ? AS legacy", (str(legacy_path),))
+        uni_conn.execute("BEGIN IMMEDIATE")
+        deferred_indexes = _drop_secondary_indexes(uni_conn)
+
+        # Get current turn for created_turn stamps
+        game = legacy.execute("SELECT * FROM games LIMIT 1").fetchone()
+        created_turn = f"{game['current_year']}.{game['current_week']}" if game else None
+
+        # Each copy below is one INSERT ... SELECT from the attached legacy
+        # file, so rows are moved by SQLite without passing through Python.
+
+        # Copy star_systems (drop game_id column, add created_turn)
+        uni_conn.execute(_SQL_COPY_STAR_SYSTEMS, (created_turn,))
+
+        # Copy celestial_bodies; the SELECT list is fixed once for this file's
+        # layout, with SQL defaults standing in for any missing columns
+        cb_cols = legacy_schema.get('celestial_bodies', frozenset())
+        cb_select = ', '.join(
+            col if col in cb_cols else _LEGACY_BODY_DEFAULTS.get(col, col)
+            for col in _BODY_COPY_COLUMNS
+        )
+        uni_conn.execute(f"""
             INSERT OR IGNORE INTO celestial_bodies
-            (body_id, system_id, name, body_type, parent_body_id,
-             grid_col, grid_row, gravity, temperature, atmosphere,
-             tectonic_activity, hydrosphere, life, map_symbol, surface_size, created_turn)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (row['body_id'], row['system_id'], row['name'], row['body_type'],
-              row['parent_body_id'], row['grid_col'], row['grid_row'],
-              row['gravity'], row['temperature'], row['atmosphere'],
-              row['tectonic_activity'] if 'tectonic_activity' in cb_cols else 0,
-              row['hydrosphere'] if 'hydrosphere' in cb_cols else 0,
-              row['life'] if 'life' in cb_cols else 'None',
-              row['map_symbol'], ssize, created_turn))
-
-    # Copy system_links
-    if legacy.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='system_links'").fetchone():
-        for row in legacy.execute("SELECT * FROM system_links").fetchall():
-            a, b = min(row['system_a'], row['system_b']), max(row['system_a'], row['system_b'])
-            uni_conn.execute("""
-                INSERT OR IGNORE INTO system_links (system_a, system_b, known_by_default, created_turn)
-                VALUES (?, ?, ?, ?)
-            """, (a, b, row['known_by_default'], created_turn))
-
-    # Copy factions
-    if legacy.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='factions'").fetchone():
-        for row in legacy.execute("SELECT * FROM factions").fetchall():
-            uni_conn.execute("""
-                INSERT OR REPLACE INTO factions (faction_id, abbreviation, name, description)
-                VALUES (?, ?, ?, ?)
-            """, (row['faction_id'], row['abbreviation'], row['name'], row['description']))
-
-    # Copy trade_goods (drop game_id)
-    if legacy.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='trade_goods'").fetchone():
-        for row in legacy.execute("SELECT * FROM trade_goods").fetchall():
-            uni_conn.execute("""
-                INSERT OR IGNORE INTO trade_goods (item_id, name, base_price, mass_per_unit)
-                VALUES (?, ?, ?, ?)
-            """, (row['item_id'], row['name'], row['base_price'], row['mass_per_unit']))
-
-    # Copy planet_surface (terrain is universe data, not game state)
-    if legacy.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='planet_surface'").fetchone():
-        for row in legacy.execute("SELECT body_id, x, y, terrain_type FROM planet_surface").fetchall():
-            uni_conn.execute(
-                "INSERT OR REPLACE INTO planet_surface (body_id, x, y, terrain_type) VALUES (?, ?, ?, ?)",
-                (row['body_id'], row['x'], row['y'], row['terrain_type'])
+            ({', '.join(_BODY_COPY_COLUMNS)}, created_turn)
+            SELECT {cb_select}, ? FROM legacy.celestial_bodies
+        """, (created_turn,))
+
+        # Copy system_links (stored with system_a < system_b)
+        if 'system_links' in legacy_schema:
+            uni_conn.execute(_SQL_COPY_SYSTEM_LINKS, (created_turn,))
+
+        # Copy factions
+        if 'factions' in legacy_schema:
+            uni_conn.execute(_SQL_COPY_FACTIONS)
+            clear_faction_cache()
+
+        # Copy trade_goods (drop game_id)
+        if 'trade_goods' in legacy_schema:
+            uni_conn.execute(_SQL_COPY_TRADE_GOODS)
+
+        # Copy planet_surface (terrain is universe data, not game state);
+        # tiles are packed per body in Python, so this one is read out
+        if 'planet_surface' in legacy_schema:
+            uni_conn.executemany(
+                _SQL_INSERT_SURFACE,
+                _pack_surface_rows(legacy.execute(
+                    "SELECT body_id, x, y, terrain_type FROM planet_surface"
+                ).fetchall())
             )
 
-    uni_conn.commit()
-    uni_conn.close()
+        for index_sql in deferred_indexes:
+            uni_conn.execute(index_sql)
+        uni_conn.commit()
+        uni_conn.execute("DETACH DATABASE legacy")
+    _optimize_and_close(uni_conn)
     print(f"  Created {uni_path.name}")
 
     # ---- Create game_state.db ----
     state_conn = init_state_db(state_path)
 
-    # Disable FK constraints during bulk import
-    state_conn.execute("PRAGMA foreign_keys = OFF")
-
-    # Build port_id -> base_id mapping from legacy (for starbase.surface_port_id)
-    port_to_base = {}
-    if legacy.execute("SELECT name FROM sqlite_master WHERE type='table' AND name='surface_ports'").fetchone():
-        sp_cols = [r[1] for r in legacy.execute("PRAGMA table_info(surface_ports)").fetchall()]
-        if 'parent_base_id' in sp_cols:
-            for row in legacy.execute(
-                "SELECT port_id, parent_base_id FROM surface_ports WHERE parent_base_id IS NOT NULL"
-            ).fetchall():
-                port_to_base[row['parent_base_id']] = row['port_id']
-
-    state_tables = [
-        'games', 'players', 'prefects', 'ships', 'surface_ports', 'starbases', 'outposts',
-        'officers', 'installed_items', 'installed_modules', 'base_inventory', 'cargo_items',
-        'base_trade_config', 'market_prices',
-        'known_contacts', 'turn_orders', 'pending_orders', 'messages', 'faction_requests', 'moderator_actions', 'turn_log',
-    ]
-
-    for table in state_tables:
-        if not legacy.execute(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name=?", (table,)
-        ).fetchone():
-            continue
-
-        legacy_cols = [r[1] for r in legacy.execute(f"PRAGMA table_info({table})").fetchall()]
-        state_cols = [r[1] for r in state_conn.execute(f"PRAGMA table_info({table})").fetchall()]
-        common_cols = [c for c in state_cols if c in legacy_cols]
-        if not common_cols:
-            continue
+    with _bulk_load(state_conn):
+        # Disable FK constraints during bulk import; as for universe.db, the
+        # whole copy is one transaction
+        state_conn.execute("PRAGMA foreign_keys = OFF")
+        state_conn.execute("ATTACH DATABASE ? AS legacy", (str(legacy_path),))
+        state_conn.execute("BEGIN IMMEDIATE")
+        deferred_indexes = _drop_secondary_indexes(state_conn)
+
+        state_tables = [
+            'games', 'players', 'prefects', 'ships', 'surface_ports', 'starbases', 'outposts',
+            'officers', 'installed_items', 'installed_modules', 'base_inventory', 'cargo_items',
+            'base_trade_config', 'market_prices',
+            'known_contacts', 'turn_orders', 'pending_orders', 'messages', 'faction_requests', 'moderator_actions', 'turn_log',
+        ]
+
+        for table in state_tables:
+            legacy_cols = legacy_schema.get(table)
+            if legacy_cols is None:
+                continue
 
-        col_list = ', '.join(common_cols)
-        placeholders = ', '.join(['?'] * len(common_cols))
+            state_cols = [r[1] for r in state_conn.execute(f"PRAGMA table_info({table})").fetchall()]
+            common_cols = [c for c in state_cols if c in legacy_cols]
+            if not common_cols:
+                continue
 
-        for row in legacy.execute(f"SELECT {col_list} FROM {table}").fetchall():
-            try:
-                state_conn.execute(
-                    f"INSERT OR IGNORE INTO {table} ({col_list}) VALUES ({placeholders})",
-                    tuple(row)
-                )
-            except sqlite3.IntegrityError:
-                pass
-
-    # Set starbases.surface_port_id from legacy port->base mapping
-    for base_id, port_id in port_to_base.items():
-        state_conn.execute(
-            "UPDATE starbases SET surface_port_id = ? WHERE base_id = ?",
-            (port_id, base_id)
-        )
+            # Foreign keys are off for the import, and OR IGNORE skips rows
+            # breaking UNIQUE, NOT NULL or CHECK constraints, so this cannot
+            # raise IntegrityError
+            col_list = ', '.join(common_cols)
+            order = _LEGACY_COPY_ORDER.get(table, '')
+            state_conn.execute(
+                f"INSERT OR IGNORE INTO {table} ({col_list}) "
+                f"SELECT {col_list} FROM legacy.{table} {order}"
+            )
 
-    state_conn.commit()
-    state_conn.close()
+        # Set starbases.surface_port_id from the legacy port -> base link
+        if 'parent_base_id' in legacy_schema.get('surface_ports', ()):
+            state_conn.execute("""
+                UPDATE starbases SET surface_port_id = sp.port_id
+                FROM legacy.surface_ports sp
+                WHERE sp.parent_base_id = starbases.base_id
+            """)
+
+        for index_sql in deferred_indexes:
+            state_conn.execute(index_sql)
+        state_conn.commit()
+        state_conn.execute("DETACH DATABASE legacy")
+    _optimize_and_close(state_conn)
     legacy.close()
 
     print(f"  Created {state_path.name}")
@@ -3362,89 +4115,110 @@ def split_legacy_db(legacy_path):
     return True
 
 
+# Seed data for the legacy v1 -> v2 trade step: the three starter goods
+# (item_id, name, base_price, mass_per_unit) and the trade roles handed to
+# successive bases in turn
+_LEGACY_TRADE_GOODS = (
+    (101, 'Precious Metals', 20, 5),
+    (102, 'Advanced Computer Cores', 50, 2),
+    (103, 'Food Supplies', 30, 3),
+)
+_LEGACY_ROLE_ROTATIONS = (
+    (('produces', 101), ('average', 102), ('demands', 103)),
+    (('demands', 101), ('produces', 102), ('average', 103)),
+    (('average', 101), ('demands', 102), ('produces', 103)),
+)
+
+
 def _apply_legacy_migrations(db_path):
     """Apply schema migrations to a legacy single-file database before splitting."""
     conn = sqlite3.connect(str(db_path))
     conn.row_factory = sqlite3.Row
-    conn.execute("PRAGMA foreign_keys = ON")
-
-    has_games = conn.execute(
-        "SELECT name FROM sqlite_master WHERE type='table' AND name='games'"
-    ).fetchone()
-    if not has_games:
-        conn.close()
-        return
-
-    game = conn.execute("SELECT * FROM games LIMIT 1").fetchone()
+    # The steps below rewrite and seed whole tables from trusted data, so
+    # foreign keys are checked once at the end instead of on every insert;
+    # any dangling reference raises IntegrityError and stops the split
+    conn.execute("PRAGMA foreign_keys = OFF")
+
+    try:
+        game = conn.execute("SELECT schema_version FROM games LIMIT 1").fetchone()
+    except sqlite3.OperationalError:
+        # Either there is no games table, or it predates schema_version (v0)
+        try:
+            game = conn.execute("SELECT 0 FROM games LIMIT 1").fetchone()
+        except sqlite3.OperationalError:
+            game = None
+        if game:
+            conn.execute("ALTER TABLE games ADD COLUMN schema_version INTEGER NOT NULL DEFAULT 0")
+            conn.commit()
     if not game:
         conn.close()
         return
 
-    game_columns = [row[1] for row in conn.execute("PRAGMA table_info(games)").fetchall()]
-    if 'schema_version' not in game_columns:
-        conn.execute("ALTER TABLE games ADD COLUMN schema_version INTEGER NOT NULL DEFAULT 0")
-        conn.execute("UPDATE games SET schema_version = 0")
-        conn.commit()
-
-    version = conn.execute("SELECT schema_version FROM games LIMIT 1").fetchone()[0]
+    version = game[0]
+    landing_added = False
 
     if version < 1:
         # v0 -> v1: factions, player status
-        columns = [row[1] for row in conn.execute("PRAGMA table_info(players)").fetchall()]
-        if 'status' not in columns:
+        conn.execute("BEGIN IMMEDIATE")
+        if not _has_column(conn, 'players', 'status'):
             conn.execute("ALTER TABLE players ADD COLUMN status TEXT NOT NULL DEFAULT 'active'")
         conn.execute("""CREATE TABLE IF NOT EXISTS factions (
             faction_id INTEGER PRIMARY KEY, abbreviation TEXT NOT NULL UNIQUE,
             name TEXT NOT NULL, description TEXT DEFAULT '')""")
         conn.execute("""INSERT OR IGNORE INTO factions VALUES
             (11, 'STA', 'Stellar Training Academy', 'Default starting faction for new players')""")
-        pp_cols = [row[1] for row in conn.execute("PRAGMA table_info(prefects)").fetchall()]
-        if 'faction_id' not in pp_cols:
+        if not _has_column(conn, 'prefects', 'faction_id'):
+            # Existing rows read the DEFAULT without being rewritten
             conn.execute("ALTER TABLE prefects ADD COLUMN faction_id INTEGER DEFAULT 11")
-            conn.execute("UPDATE prefects SET faction_id = 11 WHERE faction_id IS NULL")
         conn.execute("UPDATE games SET schema_version = 1")
         conn.commit()
+        clear_faction_cache()
         print(f"  Legacy migration: v0 -> v1")
         version = 1
 
     if version < 2:
         # v1 -> v2: trade system + landing
         from engine.game_setup import generate_market_prices
-        ship_cols = [row[1] for row in conn.execute("PRAGMA table_info(ships)").fetchall()]
+        # Column adds and new tables commit together (executescript would
+        # commit after every statement)
+        conn.execute("BEGIN IMMEDIATE")
+        ship_cols = _columns(conn, 'ships')
         for col, typ in [('landed_body_id', 'INTEGER'), ('landed_x', 'INTEGER DEFAULT 1'),
                          ('landed_y', 'INTEGER DEFAULT 1'), ('gravity_rating', 'REAL DEFAULT 1.5')]:
             if col not in ship_cols:
                 conn.execute(f"ALTER TABLE ships ADD COLUMN {col} {typ}")
+        conn.execute("""CREATE TABLE IF NOT EXISTS trade_goods (
+            item_id INTEGER PRIMARY KEY, game_id TEXT, name TEXT NOT NULL,
+            base_price INTEGER NOT NULL, mass_per_unit INTEGER NOT NULL)""")
+        conn.execute("""CREATE TABLE IF NOT EXISTS base_trade_config (
+            config_id INTEGER PRIMARY KEY AUTOINCREMENT, base_id INTEGER NOT NULL,
+            game_id TEXT NOT NULL, item_id INTEGER NOT NULL, trade_role TEXT NOT NULL)""")
+        conn.execute("""CREATE TABLE IF NOT EXISTS market_prices (
+            price_id INTEGER PRIMARY KEY, game_id TEXT NOT NULL,
+            base_id INTEGER NOT NULL, item_id INTEGER NOT NULL,
+            turn_year INTEGER NOT NULL, turn_week INTEGER NOT NULL,
+            buy_price INTEGER NOT NULL, sell_price INTEGER NOT NULL,
+            stock INTEGER NOT NULL DEFAULT 0, demand INTEGER NOT NULL DEFAULT 0,
+            UNIQUE (game_id, base_id, item_id))""")
         conn.commit()
-        conn.executescript("""
-            CREATE TABLE IF NOT EXISTS trade_goods (
-                item_id INTEGER PRIMARY KEY, game_id TEXT, name TEXT NOT NULL,
-                base_price INTEGER NOT NULL, mass_per_unit INTEGER NOT NULL);
-            CREATE TABLE IF NOT EXISTS base_trade_config (
-                config_id INTEGER PRIMARY KEY AUTOINCREMENT, base_id INTEGER NOT NULL,
-                game_id TEXT NOT NULL, item_id INTEGER NOT NULL, trade_role TEXT NOT NULL);
-            CREATE TABLE IF NOT EXISTS market_prices (
-                price_id INTEGER PRIMARY KEY AUTOINCREMENT, game_id TEXT NOT NULL,
-                base_id INTEGER NOT NULL, item_id INTEGER NOT NULL,
-                turn_year INTEGER NOT NULL, turn_week INTEGER NOT NULL,
-                buy_price INTEGER NOT NULL, sell_price INTEGER NOT NULL,
-                stock INTEGER NOT NULL DEFAULT 0, demand INTEGER NOT NULL DEFAULT 0);""")
+        landing_added = True
         for g in conn.execute("SELECT * FROM games").fetchall():
             gid = g['game_id']
             if conn.execute("SELECT COUNT(*) FROM base_trade_config WHERE game_id = ?", (gid,)).fetchone()[0] > 0:
                 continue
-            for item in [(101, gid, 'Precious Metals', 20, 5), (102, gid, 'Advanced Computer Cores', 50, 2),
-                         (103, gid, 'Food Supplies', 30, 3)]:
-                conn.execute("INSERT OR IGNORE INTO trade_goods VALUES (?, ?, ?, ?, ?)", item)
+            # Goods, trade config and the first market cycle land in one
+            # transaction; generate_market_prices() commits it
+            conn.execute("BEGIN IMMEDIATE")
+            bulk_insert(conn, 'trade_goods', [
+                {'item_id': iid, 'game_id': gid, 'name': name, 'base_price': price, 'mass_per_unit': mass}
+                for iid, name, price, mass in _LEGACY_TRADE_GOODS
+            ], or_ignore=True)
             bases = conn.execute("SELECT base_id FROM starbases WHERE game_id = ? ORDER BY base_id", (gid,)).fetchall()
-            roles = [[('produces', 101), ('average', 102), ('demands', 103)],
-                     [('demands', 101), ('produces', 102), ('average', 103)],
-                     [('average', 101), ('demands', 102), ('produces', 103)]]
-            for i, base in enumerate(bases):
-                for role, iid in roles[i % 3]:
-                    conn.execute("INSERT INTO base_trade_config (base_id, game_id, item_id, trade_role) VALUES (?,?,?,?)",
-                                 (base['base_id'], gid, iid, role))
-            conn.commit()
+            rotations = len(_LEGACY_ROLE_ROTATIONS)
+            bulk_insert(conn, 'base_trade_config', [
+                {'base_id': base['base_id'], 'game_id': gid, 'item_id': iid, 'trade_role': role}
+                for i, base in enumerate(bases) for role, iid in _LEGACY_ROLE_ROTATIONS[i % rotations]
+            ])
             generate_market_prices(conn, gid, g['current_year'], g['current_week'])
         conn.execute("UPDATE games SET schema_version = 2")
         conn.commit()
@@ -3453,11 +4227,15 @@ def _apply_legacy_migrations(db_path):
 
     if version < 3:
         # v2 -> v3: planet surfaces
-        ship_cols = [row[1] for row in conn.execute("PRAGMA table_info(ships)").fetchall()]
-        for col, typ in [('landed_x', 'INTEGER DEFAULT 1'), ('landed_y', 'INTEGER DEFAULT 1')]:
-            if col not in ship_cols:
-                conn.execute(f"ALTER TABLE ships ADD COLUMN {col} {typ}")
-        cb_cols = [row[1] for row in conn.execute("PRAGMA table_info(celestial_bodies)").fetchall()]
+        conn.execute("BEGIN IMMEDIATE")
+        # Safety net for files whose v1 -> v2 step predates the landing
+        # columns; not needed when that step has just run above
+        if not landing_added:
+            ship_cols = _columns(conn, 'ships')
+            for col, typ in [('landed_x', 'INTEGER DEFAULT 1'), ('landed_y', 'INTEGER DEFAULT 1')]:
+                if col not in ship_cols:
+                    conn.execute(f"ALTER TABLE ships ADD COLUMN {col} {typ}")
+        cb_cols = _columns(conn, 'celestial_bodies')
         for col, typ in [('tectonic_activity', 'INTEGER DEFAULT 0'),
                          ('hydrosphere', 'INTEGER DEFAULT 0'), ('life', "TEXT DEFAULT 'None'")]:
             if col not in cb_cols:
@@ -3465,37 +4243,53 @@ def _apply_legacy_migrations(db_path):
         conn.execute("""CREATE TABLE IF NOT EXISTS planet_surface (
             body_id INTEGER NOT NULL, x INTEGER NOT NULL, y INTEGER NOT NULL,
             terrain_type TEXT NOT NULL, PRIMARY KEY (body_id, x, y))""")
-        for body in conn.execute("SELECT * FROM celestial_bodies").fetchall():
-            if body['body_type'] == 'gas_giant':
-                continue
-            temp, atmo = body['temperature'] or 300, (body['atmosphere'] or 'None').lower()
-            if atmo == 'standard' and 230 <= temp <= 310:     t, h, l = 4, 60, 'Sentient'
-            elif atmo == 'dense' and temp > 310:              t, h, l = 7, 15, 'Microbial'
-            elif atmo == 'thin' and temp < 230:
-                t = 1 if body['body_type'] == 'moon' else 2
-                h = 40 if temp < 150 else 10
-                l = 'None' if body['body_type'] == 'moon' else 'Plant'
-            elif atmo == 'thin':                              t, h, l = 2, 10, 'Plant'
-            else:                                             t, h, l = 1, 0, 'None'
-            conn.execute("UPDATE celestial_bodies SET tectonic_activity=?, hydrosphere=?, life=? WHERE body_id=? AND tectonic_activity=0 AND hydrosphere=0",
-                         (t, h, l, body['body_id']))
+        # Rule-based surface stats in one pass: a missing temperature counts as
+        # 300 and a missing atmosphere as 'None'; gas giants and bodies that
+        # already have stats are left alone
+        temp = "COALESCE(NULLIF(temperature, 0), 300)"
+        atmo = "lower(COALESCE(NULLIF(atmosphere, ''), 'None'))"
+        conn.execute(f"""UPDATE celestial_bodies SET
+            tectonic_activity = CASE
+                WHEN {atmo} = 'standard' AND {temp} BETWEEN 230 AND 310 THEN 4
+                WHEN {atmo} = 'dense' AND {temp} > 310 THEN 7
+                WHEN {atmo} = 'thin' AND {temp} < 230 AND body_type = 'moon' THEN 1
+                WHEN {atmo} = 'thin' THEN 2
+                ELSE 1 END,
+            hydrosphere = CASE
+                WHEN {atmo} = 'standard' AND {temp} BETWEEN 230 AND 310 THEN 60
+                WHEN {atmo} = 'dense' AND {temp} > 310 THEN 15
+                WHEN {atmo} = 'thin' AND {temp} < 150 THEN 40
+                WHEN {atmo} = 'thin' THEN 10
+                ELSE 0 END,
+            life = CASE
+                WHEN {atmo} = 'standard' AND {temp} BETWEEN 230 AND 310 THEN 'Sentient'
+                WHEN {atmo} = 'dense' AND {temp} > 310 THEN 'Microbial'
+                WHEN {atmo} = 'thin' AND {temp} < 230 AND body_type = 'moon' THEN 'None'
+                WHEN {atmo} = 'thin' THEN 'Plant'
+                ELSE 'None' END
+            WHERE body_type IS NOT 'gas_giant' AND tectonic_activity = 0 AND hydrosphere = 0""")
         conn.execute("UPDATE games SET schema_version = 3")
         conn.commit()
         print(f"  Legacy migration: v2 -> v3")
 
     # v3 -> v4: surface_size on celestial_bodies
-    cb_cols = [row[1] for row in conn.execute("PRAGMA table_info(celestial_bodies)").fetchall()]
-    if 'surface_size' not in cb_cols:
+    if not _has_column(conn, 'celestial_bodies', 'surface_size'):
+        conn.execute("BEGIN IMMEDIATE")
         conn.execute("ALTER TABLE celestial_bodies ADD COLUMN surface_size INTEGER NOT NULL DEFAULT 31")
-        # Set sensible defaults by body type
-        conn.execute("UPDATE celestial_bodies SET surface_size = 50 WHERE body_type = 'gas_giant'")
-        conn.execute("UPDATE celestial_bodies SET surface_size = 15 WHERE body_type = 'moon'")
-        conn.execute("UPDATE celestial_bodies SET surface_size = 11 WHERE body_type = 'asteroid'")
-        # Planets stay at 31 (the default)
+        # Set sensible defaults by body type in one pass; planets stay at 31
+        # (the default)
+        conn.execute(f"""UPDATE celestial_bodies
+            SET surface_size = {_LEGACY_BODY_DEFAULTS['surface_size']}
+            WHERE body_type IN ('gas_giant', 'moon', 'asteroid')""")
         conn.commit()
         print(f"  Legacy migration: v3 -> v4 (surface_size)")
 
+    orphans = conn.execute("PRAGMA foreign_key_check").fetchall()
     conn.close()
+    if orphans:
+        tables = sorted({row[0] for row in orphans})
+        raise sqlite3.IntegrityError(
+            f"{len(orphans)} row(s) with dangling foreign keys in {', '.join(tables)}")
 
 
 # Legacy alias for old code that called migrate_db()
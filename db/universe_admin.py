@@ -6,6 +6,56 @@ Works directly on universe.db — no game state interaction needed.
 
 from db.database import get_universe_connection, UNIVERSE_DB_PATH
 from pathlib import Path
+from collections import defaultdict
+import sys
+
+
+# Fixed statements for the add_* helpers. Pooled universe connections keep
+# a prepared-statement cache (STATEMENT_CACHE_SIZE), so repeat calls reuse
+# the compiled SQL.
+_SQL_SYSTEM_NAME = "SELECT name FROM star_systems WHERE system_id = ?"
+
+_SQL_SYSTEM_NAMES = "SELECT system_id, name FROM star_systems WHERE system_id IN (?, ?)"
+
+# add_body defaults by body_type
+_MAP_SYMBOLS = {'planet': 'O', 'moon': 'o', 'gas_giant': 'G', 'asteroid': '*'}
+_DEFAULT_SIZES = {'planet': 31, 'moon': 15, 'gas_giant': 50, 'asteroid': 11}
+
+# Random body IDs are probed this many at a time, in one query
+BODY_ID_BATCH = 16
+_SQL_BODY_IDS_TAKEN = (
+    "SELECT body_id FROM celestial_bodies WHERE body_id IN "
+    f"({', '.join('?' * BODY_ID_BATCH)})"
+)
+
+# A NULL id takes the next one after the current maximum (first is 101),
+# allocated inside the INSERT itself
+_SQL_INSERT_SYSTEM = """
+    INSERT INTO star_systems
+    (system_id, name, star_name, star_spectral_type,
+     star_grid_col, star_grid_row, created_turn)
+    SELECT COALESCE(?, MAX(system_id) + 1, 101), ?, ?, ?, ?, ?, ?
+    FROM star_systems
+    RETURNING system_id"""
+
+_SQL_INSERT_BODY = """
+    INSERT INTO celestial_bodies
+    (body_id, system_id, name, body_type, parent_body_id,
+     grid_col, grid_row, gravity, temperature, atmosphere,
+     tectonic_activity, hydrosphere, life, map_symbol, surface_size,
+     resource_id, created_turn)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)"""
+
+_SQL_INSERT_LINK = """
+    INSERT INTO system_links (system_a, system_b, known_by_default, created_turn)
+    VALUES (?, ?, ?, ?)
+    ON CONFLICT (system_a, system_b) DO NOTHING"""
+
+_SQL_INSERT_TRADE_GOOD = """
+    INSERT INTO trade_goods (item_id, name, base_price, mass_per_unit)
+    SELECT COALESCE(?, MAX(item_id) + 1, 101), ?, ?, ?
+    FROM trade_goods
+    RETURNING item_id"""
 
 
 def add_system(universe_db_path=None, system_id=None, name=None,
@@ -21,10 +71,6 @@ def add_system(universe_db_path=None, system_id=None, name=None,
     """
     conn = get_universe_connection(universe_db_path)
 
-    if system_id is None:
-        max_id = conn.execute("SELECT MAX(system_id) FROM star_systems").fetchone()[0]
-        system_id = (max_id or 100) + 1
-
     if no_star:
         star_name = None
         spectral_type = None
@@ -33,12 +79,9 @@ def add_system(universe_db_path=None, system_id=None, name=None,
     elif star_name is None:
         star_name = f"{name} Prime"
 
-    conn.execute("""
-        INSERT INTO star_systems
-        (system_id, name, star_name, star_spectral_type,
-         star_grid_col, star_grid_row, created_turn)
-        VALUES (?, ?, ?, ?, ?, ?, ?)
-    """, (system_id, name, star_name, spectral_type, star_col, star_row, created_turn))
+    system_id = conn.execute(_SQL_INSERT_SYSTEM, (
+        system_id, name, star_name, spectral_type, star_col, star_row, created_turn
+    )).fetchone()[0]
     conn.commit()
     conn.close()
 
@@ -70,33 +113,25 @@ def add_body(universe_db_path=None, body_id=None, system_id=None, name=None,
     conn = get_universe_connection(universe_db_path)
 
     # Verify system exists
-    sys = conn.execute("SELECT name FROM star_systems WHERE system_id = ?", (system_id,)).fetchone()
+    sys = conn.execute(_SQL_SYSTEM_NAME, (system_id,)).fetchone()
     if not sys:
         print(f"Error: System {system_id} not found.")
         conn.close()
         return None
 
-    if body_id is None:
-        while True:
-            body_id = random.randint(100000, 999999)
-            if not conn.execute("SELECT 1 FROM celestial_bodies WHERE body_id = ?", (body_id,)).fetchone():
-                break
+    while body_id is None:
+        candidates = random.sample(range(100000, 1000000), BODY_ID_BATCH)
+        taken = {r[0] for r in conn.execute(_SQL_BODY_IDS_TAKEN, candidates)}
+        body_id = next((c for c in candidates if c not in taken), None)
 
     if map_symbol is None:
-        map_symbol = {'planet': 'O', 'moon': 'o', 'gas_giant': 'G', 'asteroid': '*'}.get(body_type, '?')
+        map_symbol = _MAP_SYMBOLS.get(body_type, '?')
 
     if surface_size is None:
-        surface_size = {'planet': 31, 'moon': 15, 'gas_giant': 50, 'asteroid': 11}.get(body_type, 31)
+        surface_size = _DEFAULT_SIZES.get(body_type, 31)
     surface_size = max(5, min(50, surface_size))
 
-    conn.execute("""
-        INSERT INTO celestial_bodies
-        (body_id, system_id, name, body_type, parent_body_id,
-         grid_col, grid_row, gravity, temperature, atmosphere,
-         tectonic_activity, hydrosphere, life, map_symbol, surface_size,
-         resource_id, created_turn)
-        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
-    """, (body_id, system_id, name, body_type, parent_body_id,
+    conn.execute(_SQL_INSERT_BODY, (body_id, system_id, name, body_type, parent_body_id,
           grid_col, grid_row, gravity, temperature, atmosphere,
           tectonic_activity, hydrosphere, life, map_symbol, surface_size,
           resource_id, created_turn))
@@ -132,32 +167,23 @@ def add_link(universe_db_path=None, system_a=None, system_b=None,
     a, b = min(system_a, system_b), max(system_a, system_b)
 
     # Verify both systems exist
-    sa = conn.execute("SELECT name FROM star_systems WHERE system_id = ?", (a,)).fetchone()
-    sb = conn.execute("SELECT name FROM star_systems WHERE system_id = ?", (b,)).fetchone()
-    if not sa or not sb:
-        missing = a if not sa else b
+    names = dict(conn.execute(_SQL_SYSTEM_NAMES, (a, b)).fetchall())
+    if a not in names or b not in names:
+        missing = a if a not in names else b
         print(f"Error: System {missing} not found.")
         conn.close()
         return False
 
-    # Check for duplicate
-    existing = conn.execute(
-        "SELECT 1 FROM system_links WHERE system_a = ? AND system_b = ?", (a, b)
-    ).fetchone()
-    if existing:
-        print(f"  Link {sa['name']} ({a}) <-> {sb['name']} ({b}) already exists.")
-        conn.close()
-        return True
-
-    conn.execute("""
-        INSERT INTO system_links (system_a, system_b, known_by_default, created_turn)
-        VALUES (?, ?, ?, ?)
-    """, (a, b, known_by_default, created_turn))
+    # UNIQUE(system_a, system_b) turns a duplicate into a no-op insert
+    inserted = conn.execute(_SQL_INSERT_LINK, (a, b, known_by_default, created_turn)).rowcount
     conn.commit()
     conn.close()
+    if not inserted:
+        print(f"  Link {names[a]} ({a}) <-> {names[b]} ({b}) already exists.")
+        return True
 
     vis = "known" if known_by_default else "hidden"
-    print(f"  Added link: {sa['name']} ({a}) <-> {sb['name']} ({b}) [{vis}]")
+    print(f"  Added link: {names[a]} ({a}) <-> {names[b]} ({b}) [{vis}]")
     return True
 
 
@@ -166,14 +192,8 @@ def add_trade_good(universe_db_path=None, item_id=None, name=None,
     """Add a trade good to the universe catalogue."""
     conn = get_universe_connection(universe_db_path)
 
-    if item_id is None:
-        max_id = conn.execute("SELECT MAX(item_id) FROM trade_goods").fetchone()[0]
-        item_id = (max_id or 100) + 1
-
-    conn.execute("""
-        INSERT INTO trade_goods (item_id, name, base_price, mass_per_unit)
-        VALUES (?, ?, ?, ?)
-    """, (item_id, name, base_price, mass_per_unit))
+    item_id = conn.execute(_SQL_INSERT_TRADE_GOOD,
+                           (item_id, name, base_price, mass_per_unit)).fetchone()[0]
     conn.commit()
     conn.close()
 
@@ -181,40 +201,92 @@ def add_trade_good(universe_db_path=None, item_id=None, name=None,
     return item_id
 
 
+# Surface ports / outposts with their body, system and owner faction, for
+# list_universe (runs on universe.db with game_state.db attached as 'state')
+_LIST_SURFACE_SQL = """
+    SELECT t.*, cb.name AS body_name, cb.system_id, ss.name AS system_name,
+           f.abbreviation{extra}
+    FROM state.{table} t
+    LEFT JOIN celestial_bodies cb ON cb.body_id = t.body_id
+    LEFT JOIN star_systems ss ON ss.system_id = cb.system_id
+    LEFT JOIN state.prefects pp ON pp.prefect_id = t.owner_prefect_id
+    LEFT JOIN factions f ON f.faction_id = pp.faction_id
+    {join}
+    ORDER BY t.{id_col}
+"""
+
+
+def _present_tables(conn, schema, *names):
+    """Which of the given tables exist in one schema of conn (one query)."""
+    return {r[0] for r in conn.execute(
+        f"SELECT name FROM {schema}.sqlite_master WHERE type = 'table' "
+        f"AND name IN ({', '.join('?' * len(names))})", names)}
+
+
+def _surface_labels(row):
+    """Body name, system suffix and faction tag for a _LIST_SURFACE_SQL row."""
+    body_name = row['body_name'] or f"#{row['body_id']}"
+    system_name = ""
+    if row['body_name'] is not None and row['system_name']:
+        system_name = f" - {row['system_name']} ({row['system_id']})"
+    faction_tag = f"[{row['abbreviation']}] " if row['abbreviation'] else ""
+    return body_name, system_name, faction_tag
+
+
 def list_universe(universe_db_path=None):
     """Print a summary of all universe content."""
-    conn = get_universe_connection(universe_db_path)
-
-    print("\n=== UNIVERSE CONTENTS ===\n")
+    from db.database import STATE_DB_PATH
+    uni_path = Path(universe_db_path) if universe_db_path else None
+    state_path = uni_path.parent / "game_state.db" if uni_path else STATE_DB_PATH
+    # Both files are opened mode=ro: listing never migrates either one or
+    # switches it to WAL
+    conn = get_universe_connection(universe_db_path, readonly=True)
+
+    # Collected and written once at the end rather than one print per line
+    out = ["\n=== UNIVERSE CONTENTS ===\n"]
+
+    # Planetary resources may be missing from a universe.db no game
+    # connection has migrated yet (table_info searches attached schemas too)
+    has_res_table = conn.execute("PRAGMA main.table_info(resources)").fetchone() is not None
+    body_cols = {c[1] for c in conn.execute("PRAGMA main.table_info(celestial_bodies)")}
+    if has_res_table and 'resource_id' in body_cols:
+        body_sql = """
+            SELECT b.*, r.name AS res_name FROM celestial_bodies b
+            LEFT JOIN resources r ON r.resource_id = b.resource_id
+            ORDER BY b.system_id, b.grid_row, b.grid_col
+        """
+    else:
+        body_sql = """
+            SELECT b.*, NULL AS resource_id, NULL AS res_name FROM celestial_bodies b
+            ORDER BY b.system_id, b.grid_row, b.grid_col
+        """
+    bodies_by_system = defaultdict(list)
+    for b in conn.execute(body_sql):
+        bodies_by_system[b['system_id']].append(b)
 
     # Systems
     systems = conn.execute("SELECT * FROM star_systems ORDER BY system_id").fetchall()
-    print(f"Star Systems ({len(systems)}):")
+    out.append(f"Star Systems ({len(systems)}):")
     for s in systems:
         ct = f"  [added {s['created_turn']}]" if s['created_turn'] else ""
         if s['star_name'] and s['star_grid_col'] and s['star_grid_row'] is not None:
             loc = f"{s['star_grid_col']}{s['star_grid_row']:02d}"
-            print(f"  {s['system_id']:>4d}  {s['name']:<20s}  Star: {s['star_name']} [{s['star_spectral_type']}] at {loc}{ct}")
+            out.append(f"  {s['system_id']:>4d}  {s['name']:<20s}  Star: {s['star_name']} [{s['star_spectral_type']}] at {loc}{ct}")
         elif s['star_name']:
-            print(f"  {s['system_id']:>4d}  {s['name']:<20s}  Star: {s['star_name']} [{s['star_spectral_type'] or '?'}]{ct}")
+            out.append(f"  {s['system_id']:>4d}  {s['name']:<20s}  Star: {s['star_name']} [{s['star_spectral_type'] or '?'}]{ct}")
         else:
-            print(f"  {s['system_id']:>4d}  {s['name']:<20s}  Nexus (no star){ct}")
+            out.append(f"  {s['system_id']:>4d}  {s['name']:<20s}  Nexus (no star){ct}")
 
         # Bodies in this system
-        bodies = conn.execute(
-            "SELECT * FROM celestial_bodies WHERE system_id = ? ORDER BY grid_row, grid_col",
-            (s['system_id'],)
-        ).fetchall()
-        for b in bodies:
+        for b in bodies_by_system[s['system_id']]:
             loc = f"{b['grid_col']}{b['grid_row']:02d}"
             parent = f" (moon of {b['parent_body_id']})" if b['parent_body_id'] else ""
-            res_id = b['resource_id'] if 'resource_id' in b.keys() and b['resource_id'] else None
+            res_id = b['resource_id']
             res_str = ""
             if res_id:
-                res = conn.execute("SELECT name FROM resources WHERE resource_id = ?", (res_id,)).fetchone()
-                res_name = res['name'] if res else f"#{res_id}"
+                res_name = b['res_name'] or f"#{res_id}"
                 res_str = f"  res={res_name} ({res_id})"
-            print(f"         {b['body_id']:>6d}  {b['name']:<16s} {b['body_type']:<10s} at {loc}"
+            out.append(f"         {b['body_id']:>6d}  {b['name']:<16s} {b['body_type']:<10s} at {loc}"
                   f"  {b['gravity']}g {b['temperature']}K {b['atmosphere']}  [{b['surface_size']}x{b['surface_size']}]{parent}{res_str}")
 
     # Links
@@ -226,146 +298,91 @@ def list_universe(universe_db_path=None):
         ORDER BY sl.system_a, sl.system_b
     """).fetchall()
     if links:
-        print(f"\nSystem Links ({len(links)}):")
+        out.append(f"\nSystem Links ({len(links)}):")
         for l in links:
             vis = "known" if l['known_by_default'] else "hidden"
-            print(f"  {l['name_a']} ({l['system_a']}) <-> {l['name_b']} ({l['system_b']}) [{vis}]")
+            out.append(f"  {l['name_a']} ({l['system_a']}) <-> {l['name_b']} ({l['system_b']}) [{vis}]")
 
     # Trade goods
     goods = conn.execute("SELECT * FROM trade_goods ORDER BY item_id").fetchall()
     if goods:
-        print(f"\nTrade Goods ({len(goods)}):")
+        out.append(f"\nTrade Goods ({len(goods)}):")
+        # Older universe files lack the column; check once, not per row
+        has_origin = 'origin_system_id' in goods[0].keys()
         for g in goods:
-            origin = g['origin_system_id'] if 'origin_system_id' in g.keys() and g['origin_system_id'] else None
+            origin = g['origin_system_id'] if has_origin else None
             origin_str = f"  origin={origin}" if origin else ""
-            print(f"  {g['item_id']:>6d}  {g['name']:<30s}  base={g['base_price']}cr  mass={g['mass_per_unit']}ST{origin_str}")
+            out.append(f"  {g['item_id']:>6d}  {g['name']:<30s}  base={g['base_price']}cr  mass={g['mass_per_unit']}ST{origin_str}")
 
     # Planetary resources (GM-only, hidden from players)
-    has_res_table = conn.execute(
-        "SELECT name FROM sqlite_master WHERE type='table' AND name='resources'"
-    ).fetchone()
     if has_res_table:
-        res_list = conn.execute("SELECT * FROM resources ORDER BY resource_id").fetchall()
+        res_list = conn.execute("""
+            SELECT r.*, tg.name AS item_name FROM resources r
+            LEFT JOIN trade_goods tg ON tg.item_id = r.produces_item_id
+            ORDER BY r.resource_id
+        """).fetchall()
         if res_list:
-            print(f"\nPlanetary Resources ({len(res_list)}):")
-            print(f"  (GM-only -- not visible to players)")
+            out.append(f"\nPlanetary Resources ({len(res_list)}):")
+            out.append(f"  (GM-only -- not visible to players)")
             for r in res_list:
                 produces = ""
                 if r['produces_item_id']:
-                    item = conn.execute("SELECT name FROM trade_goods WHERE item_id = ?",
-                                        (r['produces_item_id'],)).fetchone()
-                    produces = f"  -> {item['name']} ({r['produces_item_id']})" if item else f"  -> item {r['produces_item_id']}"
-                print(f"  {r['resource_id']:>6d}  {r['name']:<30s}  {r['description']}{produces}")
+                    produces = (f"  -> {r['item_name']} ({r['produces_item_id']})" if r['item_name']
+                                else f"  -> item {r['produces_item_id']}")
+                out.append(f"  {r['resource_id']:>6d}  {r['name']:<30s}  {r['description']}{produces}")
 
     # Factions
     factions = conn.execute("SELECT * FROM factions ORDER BY faction_id").fetchall()
     if factions:
-        print(f"\nFactions ({len(factions)}):")
+        out.append(f"\nFactions ({len(factions)}):")
         for f in factions:
-            print(f"  {f['faction_id']:>3d}  [{f['abbreviation']}] {f['name']}")
+            out.append(f"  {f['faction_id']:>3d}  [{f['abbreviation']}] {f['name']}")
 
-    # Surface ports and outposts (in game_state.db — open combined connection if available)
-    from db.database import STATE_DB_PATH
-    uni_path = Path(universe_db_path) if universe_db_path else None
-    state_path = uni_path.parent / "game_state.db" if uni_path else STATE_DB_PATH
+    # Surface ports and outposts (in game_state.db, attached so they join
+    # straight to bodies, systems and factions)
     if state_path.exists():
-        import sqlite3
-        sc = sqlite3.connect(str(state_path))
-        sc.row_factory = sqlite3.Row
-        # Check if surface_ports table exists
-        has_sp = sc.execute(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name='surface_ports'"
-        ).fetchone()
-        if has_sp:
-            ports = sc.execute("SELECT * FROM surface_ports ORDER BY port_id").fetchall()
-            if ports:
-                print(f"\nSurface Ports ({len(ports)}):")
-                base_cols = [c[1] for c in sc.execute("PRAGMA table_info(starbases)").fetchall()]
-                sp_cols = [c[1] for c in sc.execute("PRAGMA table_info(surface_ports)").fetchall()]
-                for p in ports:
-                    # Look up body -> system
-                    body = conn.execute(
-                        "SELECT name, system_id FROM celestial_bodies WHERE body_id = ?",
-                        (p['body_id'],)
-                    ).fetchone()
-                    body_name = body['name'] if body else f"#{p['body_id']}"
-                    system_name = ""
-                    if body:
-                        sys_row = conn.execute(
-                            "SELECT name FROM star_systems WHERE system_id = ?",
-                            (body['system_id'],)
-                        ).fetchone()
-                        system_name = f" - {sys_row['name']} ({body['system_id']})" if sys_row else ""
-
-                    # Look up faction from owner
-                    faction_tag = ""
-                    if p['owner_prefect_id']:
-                        pref = sc.execute(
-                            "SELECT faction_id FROM prefects WHERE prefect_id = ?",
-                            (p['owner_prefect_id'],)
-                        ).fetchone()
-                        if pref:
-                            fac = conn.execute(
-                                "SELECT abbreviation FROM factions WHERE faction_id = ?",
-                                (pref['faction_id'],)
-                            ).fetchone()
-                            if fac:
-                                faction_tag = f"[{fac['abbreviation']}] "
-
-                    # Starbase built above this port
-                    base = None
-                    if 'surface_port_id' in base_cols:
-                        base = sc.execute(
-                            "SELECT base_id, name FROM starbases WHERE surface_port_id = ?",
-                            (p['port_id'],)
-                        ).fetchone()
-                    elif 'parent_base_id' in sp_cols and p.get('parent_base_id'):
-                        base = sc.execute(
-                            "SELECT base_id, name FROM starbases WHERE base_id = ?",
-                            (p['parent_base_id'],)
-                        ).fetchone()
-                    above = f"  <- {base['name']} ({base['base_id']})" if base else ""
-                    print(f"  {p['port_id']:>8d}  {faction_tag}{p['name']:<20s}  on {body_name} ({p['body_id']})  "
-                          f"at ({p['surface_x']},{p['surface_y']}){system_name}{above}")
-        # Outposts
-        has_op = sc.execute(
-            "SELECT name FROM sqlite_master WHERE type='table' AND name='outposts'"
-        ).fetchone()
-        if has_op:
-            ops = sc.execute("SELECT * FROM outposts ORDER BY outpost_id").fetchall()
-            if ops:
-                print(f"\nOutposts ({len(ops)}):")
-                for o in ops:
-                    body = conn.execute(
-                        "SELECT name, system_id FROM celestial_bodies WHERE body_id = ?",
-                        (o['body_id'],)
-                    ).fetchone()
-                    body_name = body['name'] if body else f"#{o['body_id']}"
-                    system_name = ""
-                    if body:
-                        sys_row = conn.execute(
-                            "SELECT name FROM star_systems WHERE system_id = ?",
-                            (body['system_id'],)
-                        ).fetchone()
-                        system_name = f" - {sys_row['name']} ({body['system_id']})" if sys_row else ""
-
-                    faction_tag = ""
-                    if o['owner_prefect_id']:
-                        pref = sc.execute(
-                            "SELECT faction_id FROM prefects WHERE prefect_id = ?",
-                            (o['owner_prefect_id'],)
-                        ).fetchone()
-                        if pref:
-                            fac = conn.execute(
-                                "SELECT abbreviation FROM factions WHERE faction_id = ?",
-                                (pref['faction_id'],)
-                            ).fetchone()
-                            if fac:
-                                faction_tag = f"[{fac['abbreviation']}] "
-
-                    print(f"  {o['outpost_id']:>8d}  {faction_tag}{o['name']:<24s}  on {body_name} ({o['body_id']})  "
-                          f"at ({o['surface_x']},{o['surface_y']}){system_name}  "
-                          f"type={o['outpost_type']}  wk={o['workers']}")
-        sc.close()
+        conn.execute("ATTACH DATABASE ? AS state",
+                     (f"{state_path.resolve().as_uri()}?mode=ro",))
+        try:
+            state_tables = _present_tables(conn, 'state', 'surface_ports', 'outposts')
+            if 'surface_ports' in state_tables:
+                # Starbase built above the port; older state files link it the
+                # other way round (surface_ports.parent_base_id)
+                base_cols = {c[1] for c in conn.execute("PRAGMA state.table_info(starbases)")}
+                port_cols = {c[1] for c in conn.execute("PRAGMA state.table_info(surface_ports)")}
+                if 'surface_port_id' in base_cols:
+                    above_join = ("LEFT JOIN state.starbases sb ON sb.base_id = (SELECT base_id "
+                             "FROM state.starbases WHERE surface_port_id = t.port_id LIMIT 1)")
+                elif 'parent_base_id' in port_cols:
+                    above_join = "LEFT JOIN state.starbases sb ON sb.base_id = t.parent_base_id"
+                else:
+                    above_join = "LEFT JOIN (SELECT NULL AS base_id, NULL AS name) sb ON 0"
+                ports = conn.execute(_LIST_SURFACE_SQL.format(
+                    table='surface_ports', id_col='port_id',
+                    extra=", sb.base_id AS above_id, sb.name AS above_name",
+                    join=above_join,
+                )).fetchall()
+                if ports:
+                    out.append(f"\nSurface Ports ({len(ports)}):")
+                    for p in ports:
+                        body_name, system_name, faction_tag = _surface_labels(p)
+                        above = f"  <- {p['above_name']} ({p['above_id']})" if p['above_id'] else ""
+                        out.append(f"  {p['port_id']:>8d}  {faction_tag}{p['name']:<20s}  on {body_name} ({p['body_id']})  "
+                              f"at ({p['surface_x']},{p['surface_y']}){system_name}{above}")
+            # Outposts
+            if 'outposts' in state_tables:
+                ops = conn.execute(_LIST_SURFACE_SQL.format(
+                    table='outposts', id_col='outpost_id', extra="", join="",
+                )).fetchall()
+                if ops:
+                    out.append(f"\nOutposts ({len(ops)}):")
+                    for o in ops:
+                        body_name, system_name, faction_tag = _surface_labels(o)
+                        out.append(f"  {o['outpost_id']:>8d}  {faction_tag}{o['name']:<24s}  on {body_name} ({o['body_id']})  "
+                              f"at ({o['surface_x']},{o['surface_y']}){system_name}  "
+                              f"type={o['outpost_type']}  wk={o['workers']}")
+        finally:
+            conn.execute("DETACH DATABASE state")
 
     conn.close()
+    sys.stdout.write("\n".join(out) + "\n")
@@ -325,10 +325,7 @@ def get_participant_state(conn, game_id, kind, entity_id):
     """
     if kind == 'ship':
         row = conn.execute(
-            """SELECT s.*, pp.faction_id
-               FROM ships s
-               LEFT JOIN prefects pp ON s.owner_prefect_id = pp.prefect_id
-               WHERE s.ship_id = ? AND s.game_id = ?""",
+            "SELECT * FROM ship_full WHERE ship_id = ? AND game_id = ?",
             (entity_id, game_id)
         ).fetchone()
         if not row:
@@ -525,9 +522,7 @@ def pick_combat_target(conn, game_id, actor, all_participants_state,
             tfaction = None
             if tk == 'ship':
                 trow = conn.execute(
-                    "SELECT pp.faction_id FROM ships s "
-                    "LEFT JOIN prefects pp ON s.owner_prefect_id = pp.prefect_id "
-                    "WHERE s.ship_id = ?", (ti,)
+                    "SELECT faction_id FROM ship_full WHERE ship_id = ?", (ti,)
                 ).fetchone()
                 tfaction = trow['faction_id'] if trow else None
             if entity_matches_list(tk, ti, tfaction, defends):
@@ -1258,11 +1253,8 @@ def propagate_defend_responses(conn, game_id, engagement, turn_year, turn_week,
 
     # Find ships in same system within DEFEND_RESPONSE_RANGE of engagement loc
     candidate_ships = conn.execute(
-        """SELECT s.*, pp.faction_id
-           FROM ships s
-           LEFT JOIN prefects pp ON s.owner_prefect_id = pp.prefect_id
-           WHERE s.game_id = ? AND s.system_id = ?
-             AND s.integrity > 0""",
+        """SELECT * FROM ship_full
+           WHERE game_id = ? AND system_id = ? AND integrity > 0""",
         (game_id, sys_id)
     ).fetchall()
 
@@ -1281,9 +1273,7 @@ def propagate_defend_responses(conn, game_id, engagement, turn_year, turn_week,
         for vkind, vid in victim_set:
             if vkind == 'ship':
                 vrow = conn.execute(
-                    "SELECT s.ship_id, pp.faction_id FROM ships s "
-                    "LEFT JOIN prefects pp ON s.owner_prefect_id = pp.prefect_id "
-                    "WHERE s.ship_id = ?", (vid,)
+                    "SELECT ship_id, faction_id FROM ship_full WHERE ship_id = ?", (vid,)
                 ).fetchone()
                 vfaction = vrow['faction_id'] if vrow else None
             else:
@@ -1341,9 +1331,7 @@ def propagate_defend_responses(conn, game_id, engagement, turn_year, turn_week,
         for vkind, vid in victim_set:
             if vkind == 'ship':
                 vrow = conn.execute(
-                    "SELECT pp.faction_id FROM ships s "
-                    "LEFT JOIN prefects pp ON s.owner_prefect_id = pp.prefect_id "
-                    "WHERE s.ship_id = ?", (vid,)
+                    "SELECT faction_id FROM ship_full WHERE ship_id = ?", (vid,)
                 ).fetchone()
                 vfaction = vrow['faction_id'] if vrow else None
             else:
@@ -1397,9 +1385,7 @@ def propagate_defend_responses(conn, game_id, engagement, turn_year, turn_week,
             for vkind, vid in victim_set:
                 if vkind == 'ship':
                     vrow = conn.execute(
-                        "SELECT pp.faction_id FROM ships s "
-                        "LEFT JOIN prefects pp ON s.owner_prefect_id = pp.prefect_id "
-                        "WHERE s.ship_id = ?", (vid,)
+                        "SELECT faction_id FROM ship_full WHERE ship_id = ?", (vid,)
                     ).fetchone()
                     vfaction = vrow['faction_id'] if vrow else None
                 else:
@@ -5,7 +5,7 @@ Creates initial game state with star systems, celestial bodies, bases, and playe
 
 import random
 from pathlib import Path
-from db.database import init_db, get_connection, get_faction, faction_display_name
+from db.database import init_db, get_connection, get_faction, faction_display_name, bulk_insert
 from engine.resolution.resolver import TurnResolver
 from engine.reports.report_gen import generate_ship_report, generate_prefect_report
 from engine.turn_folders import TurnFolders
@@ -84,7 +84,8 @@ def generate_market_prices(conn, game_id, turn_year, turn_week):
     Stock and demand deplete over the cycle as players trade.
     Fixed-price items (e.g. crew) get constant prices and refreshing stock.
     
-    Only call this at the start of a new cycle (or game setup).
+    Only call this at the start of a new cycle (or game setup); re-running
+    it for the same cycle regenerates the same prices.
     """
     import hashlib
     cycle_start = get_market_cycle_start(turn_week)
@@ -109,26 +110,18 @@ def generate_market_prices(conn, game_id, turn_year, turn_week):
         (game_id,)
     ).fetchall()
 
-    # Clear any existing prices for this cycle start (idempotent)
-    conn.execute("""
-        DELETE FROM market_prices
-        WHERE game_id = ? AND turn_year = ? AND turn_week = ?
-    """, (game_id, turn_year, cycle_start))
-
+    prices = []
     for cfg in configs:
         item_id = cfg['item_id']
+        price = {'game_id': game_id, 'base_id': cfg['base_id'], 'item_id': item_id,
+                 'turn_year': turn_year, 'turn_week': cycle_start}
 
         # Fixed-price items bypass normal price generation
         if item_id in FIXED_PRICE_ITEMS:
             fp = FIXED_PRICE_ITEMS[item_id]
-            conn.execute("""
-                INSERT INTO market_prices
-                (game_id, base_id, item_id, turn_year, turn_week,
-                 buy_price, sell_price, stock, demand)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-            """, (game_id, cfg['base_id'], item_id,
-                  turn_year, cycle_start,
-                  fp['buy'], fp['sell'], fp['stock'], fp['demand']))
+            price.update(buy_price=fp['buy'], sell_price=fp['sell'],
+                         stock=fp['stock'], demand=fp['demand'])
+            prices.append(price)
             continue
 
         avg = week_averages[item_id]
@@ -143,37 +136,100 @@ def generate_market_prices(conn, game_id, turn_year, turn_week):
         stock = max(1, round(role_qty['stock'] * rng.uniform(0.85, 1.15)))
         demand = max(1, round(role_qty['demand'] * rng.uniform(0.85, 1.15)))
 
-        conn.execute("""
-            INSERT INTO market_prices
-            (game_id, base_id, item_id, turn_year, turn_week,
-             buy_price, sell_price, stock, demand)
-            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
-        """, (game_id, cfg['base_id'], cfg['item_id'],
-              turn_year, cycle_start, buy_price, sell_price, stock, demand))
+        price.update(buy_price=buy_price, sell_price=sell_price,
+                     stock=stock, demand=demand)
+        prices.append(price)
 
+    # One row per base and item: a new cycle overwrites the last one in place
+    bulk_insert(conn, 'market_prices', prices,
+                upsert_key=('game_id', 'base_id', 'item_id'))
     conn.commit()
 
 
+# Random IDs are drawn this many at a time and checked with one query
+ID_PROBE_BATCH = 16
+
+
+def _first_free(conn, table, column, candidates):
+    """The first candidate not already used in table.column, or None."""
+    taken = {r[0] for r in conn.execute(
+        f"SELECT {column} FROM {table} "
+        f"WHERE {column} IN ({', '.join('?' * len(candidates))})", candidates
+    )}
+    return next((c for c in candidates if c not in taken), None)
+
+
 def _generate_unique_id(conn, table, column, min_val=10000000, max_val=99999999):
     """Generate a unique random integer ID for the given table/column."""
-    while True:
-        candidate = random.randint(min_val, max_val)
-        exists = conn.execute(
-            f"SELECT 1 FROM {table} WHERE {column} = ?", (candidate,)
-        ).fetchone()
-        if not exists:
-            return candidate
+    candidate = None
+    while candidate is None:
+        candidate = _first_free(conn, table, column,
+                                random.sample(range(min_val, max_val + 1), ID_PROBE_BATCH))
+    return candidate
 
 
 def _generate_account_number(conn):
     """Generate a unique 8-digit account number (stored as text for leading zeros)."""
-    while True:
-        candidate = f"{random.randint(10000000, 99999999)}"
-        exists = conn.execute(
-            "SELECT 1 FROM players WHERE account_number = ?", (candidate,)
-        ).fetchone()
-        if not exists:
-            return candidate
+    candidate = None
+    while candidate is None:
+        candidate = _first_free(conn, 'players', 'account_number', [
+            f"{n}" for n in random.sample(range(10000000, 100000000), ID_PROBE_BATCH)
+        ])
+    return candidate
+
+
+# Omicron (101) seed rows for create_game. Port, starbase and outpost rows
+# get the game_id spliced in after their id column.
+
+# (body_id, name, body_type, parent_body_id, grid_col, grid_row, gravity,
+#  temperature, atmosphere, tectonic_activity, hydrosphere, life,
+#  map_symbol, surface_size, resource_id)
+_CELESTIAL_SEED = [
+    # Planet: Orion at H04 -- temperate, habitable, Earth-like
+    (247985, 'Orion', 'planet', None, 'H', 4, 0.9, 295, 'Standard',
+     4, 65, 'Sentient', 'O', 31, 200002),
+    # Planet: Tartarus at R08 -- hot, volcanic, dense atmosphere
+    (301442, 'Tartarus', 'planet', None, 'R', 8, 1.2, 340, 'Dense',
+     7, 15, 'Microbial', 'O', 25, 200001),
+    # Gas Giant: Leviathan at E18
+    (155230, 'Leviathan', 'gas_giant', None, 'E', 18, 2.5, 120, 'Hydrogen',
+     0, 0, 'None', 'G', 50, None),
+    # Moon: Callyx at F19 (moon of Leviathan) -- cold, barren, icy
+    (88341, 'Callyx', 'moon', 155230, 'F', 19, 0.3, 95, 'Thin',
+     1, 40, 'None', 'o', 11, None),
+    # Planet: Meridian at T20 -- cold, arid, thin atmosphere, sparse life
+    (412003, 'Meridian', 'planet', None, 'T', 20, 0.7, 210, 'Thin',
+     2, 10, 'Plant', 'O', 21, 200003),
+]
+
+# (port_id, name, body_id, surface_x, surface_y, complexes, workers, troops, employees)
+_SURFACE_PORT_SEED = [
+    # Orion Landing (on Orion, 31x31 grid) - Citadel Station built above
+    (30100001, 'Orion Landing', 247985, 16, 16, 10, 200, 50, 40),
+    # Tartarus Foundry (on Tartarus, 31x31 grid) - Tartarus Depot built above
+    (30100002, 'Tartarus Foundry', 301442, 13, 13, 5, 100, 25, 50),
+    # Meridian Harbour (on Meridian, 31x31 grid) - Meridian Waystation built above
+    (30100003, 'Meridian Harbour', 412003, 11, 11, 4, 80, 15, 20),
+]
+
+# (base_id, name, grid_col, grid_row, orbiting_body_id, surface_port_id,
+#  complexes, workers, troops, docking_capacity, employees)
+_STARBASE_SEED = [
+    # Citadel Station - orbiting Orion at H04, above Orion Landing
+    (45687590, 'Citadel Station', 'H', 4, 247985, 30100001, 25, 500, 100, 5, 120),
+    # Tartarus Depot - orbiting Tartarus at R08, above Tartarus Foundry
+    (12340001, 'Tartarus Depot', 'R', 8, 301442, 30100002, 10, 200, 50, 3, 85),
+    # Meridian Waystation - orbiting Meridian at T20, above Meridian Harbour
+    (78901234, 'Meridian Waystation', 'T', 20, 412003, 30100003, 8, 150, 30, 3, 75),
+]
+
+# (outpost_id, name, body_id, surface_x, surface_y, outpost_type, workers, employees)
+_OUTPOST_SEED = [
+    # Callyx Relay (on Callyx moon, 11x11 grid)
+    (40100001, 'Callyx Relay', 88341, 6, 6, 'Communications', 15, 10),
+    # Tartarus Mining Camp (on Tartarus, 25x25 grid)
+    (40100002, 'Tartarus Mining Camp', 301442, 8, 19, 'Mining', 30, 25),
+]
 
 
 def create_game(db_path=None, game_id="OMICRON101", game_name="Stellar Dominion - Omicron Campaign"):
@@ -182,12 +238,17 @@ def create_game(db_path=None, game_id="OMICRON101", game_name="Stellar Dominion
     c = conn.cursor()
 
     # Check if game already exists
-    existing = c.execute("SELECT game_id FROM games WHERE game_id = ?", (game_id,)).fetchone()
+    existing = c.execute(
+        "SELECT EXISTS (SELECT 1 FROM games WHERE game_id = ?)", (game_id,)
+    ).fetchone()[0]
     if existing:
         print(f"Game {game_id} already exists. Use --force to recreate.")
         conn.close()
         return False
 
+    # All setup inserts share one write transaction, committed at the end
+    conn.execute("BEGIN IMMEDIATE")
+
     # Create game
     c.execute("""
         INSERT INTO games (game_id, game_name, current_year, current_week, rng_seed)
@@ -205,134 +266,43 @@ def create_game(db_path=None, game_id="OMICRON101", game_name="Stellar Dominion
     # =============================================
     # CELESTIAL BODIES in Omicron System
     # =============================================
-
-    # Planet: Orion at H04 -- temperate, habitable, Earth-like
-    c.execute("""
-        INSERT INTO celestial_bodies 
-        (body_id, system_id, name, body_type, grid_col, grid_row, gravity, temperature, atmosphere, 
-         tectonic_activity, hydrosphere, life, map_symbol, surface_size, resource_id)
-        VALUES (247985, 101, 'Orion', 'planet', 'H', 4, 0.9, 295, 'Standard',
-                4, 65, 'Sentient', 'O', 31, 200002)
-    """)
-
-    # Planet: Tartarus at R08 -- hot, volcanic, dense atmosphere
-    c.execute("""
-        INSERT INTO celestial_bodies 
-        (body_id, system_id, name, body_type, grid_col, grid_row, gravity, temperature, atmosphere,
-         tectonic_activity, hydrosphere, life, map_symbol, surface_size, resource_id)
-        VALUES (301442, 101, 'Tartarus', 'planet', 'R', 8, 1.2, 340, 'Dense',
-                7, 15, 'Microbial', 'O', 25, 200001)
-    """)
-
-    # Gas Giant: Leviathan at E18
-    c.execute("""
-        INSERT INTO celestial_bodies 
-        (body_id, system_id, name, body_type, grid_col, grid_row, gravity, temperature, atmosphere, map_symbol, surface_size)
-        VALUES (155230, 101, 'Leviathan', 'gas_giant', 'E', 18, 2.5, 120, 'Hydrogen', 'G', 50)
-    """)
-
-    # Moon: Callyx at F19 (moon of Leviathan) -- cold, barren, icy
-    c.execute("""
-        INSERT INTO celestial_bodies 
+    c.executemany("""
+        INSERT INTO celestial_bodies
         (body_id, system_id, name, body_type, parent_body_id, grid_col, grid_row, gravity, temperature, atmosphere,
-         tectonic_activity, hydrosphere, life, map_symbol, surface_size)
-        VALUES (88341, 101, 'Callyx', 'moon', 155230, 'F', 19, 0.3, 95, 'Thin',
-                1, 40, 'None', 'o', 11)
-    """)
-
-    # Planet: Meridian at T20 -- cold, arid, thin atmosphere, sparse life
-    c.execute("""
-        INSERT INTO celestial_bodies 
-        (body_id, system_id, name, body_type, grid_col, grid_row, gravity, temperature, atmosphere,
          tectonic_activity, hydrosphere, life, map_symbol, surface_size, resource_id)
-        VALUES (412003, 101, 'Meridian', 'planet', 'T', 20, 0.7, 210, 'Thin',
-                2, 10, 'Plant', 'O', 21, 200003)
-    """)
+        VALUES (?, 101, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, _CELESTIAL_SEED)
 
     # =============================================
     # SURFACE PORTS (ground facilities; built first, starbase above)
     # =============================================
     # One per planet that will have a starbase; placed near centre of surface grid
-
-    # Orion Landing (on Orion, 31x31 grid) - Citadel Station built above
-    c.execute("""
-        INSERT INTO surface_ports
-        (port_id, game_id, name, body_id, surface_x, surface_y,
-         complexes, workers, troops, employees)
-        VALUES (30100001, ?, 'Orion Landing', 247985, 16, 16,
-                10, 200, 50, 40)
-    """, (game_id,))
-
-    # Tartarus Foundry (on Tartarus, 31x31 grid) - Tartarus Depot built above
-    c.execute("""
+    c.executemany("""
         INSERT INTO surface_ports
         (port_id, game_id, name, body_id, surface_x, surface_y,
          complexes, workers, troops, employees)
-        VALUES (30100002, ?, 'Tartarus Foundry', 301442, 13, 13,
-                5, 100, 25, 50)
-    """, (game_id,))
-
-    # Meridian Harbour (on Meridian, 31x31 grid) - Meridian Waystation built above
-    c.execute("""
-        INSERT INTO surface_ports
-        (port_id, game_id, name, body_id, surface_x, surface_y,
-         complexes, workers, troops, employees)
-        VALUES (30100003, ?, 'Meridian Harbour', 412003, 11, 11,
-                4, 80, 15, 20)
-    """, (game_id,))
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, [(port_id, game_id, *rest) for port_id, *rest in _SURFACE_PORT_SEED])
 
     # =============================================
     # STARBASES (3 dockable bases; built above surface ports)
     # =============================================
-
-    # Citadel Station - orbiting Orion at H04, above Orion Landing
-    c.execute("""
-        INSERT INTO starbases 
-        (base_id, game_id, name, base_type, system_id, grid_col, grid_row, orbiting_body_id,
-         surface_port_id, complexes, workers, troops, has_market, docking_capacity, employees)
-        VALUES (45687590, ?, 'Citadel Station', 'Starbase', 101, 'H', 4, 247985,
-                30100001, 25, 500, 100, 1, 5, 120)
-    """, (game_id,))
-
-    # Tartarus Depot - orbiting Tartarus at R08, above Tartarus Foundry
-    c.execute("""
-        INSERT INTO starbases 
+    c.executemany("""
+        INSERT INTO starbases
         (base_id, game_id, name, base_type, system_id, grid_col, grid_row, orbiting_body_id,
          surface_port_id, complexes, workers, troops, has_market, docking_capacity, employees)
-        VALUES (12340001, ?, 'Tartarus Depot', 'Starbase', 101, 'R', 8, 301442,
-                30100002, 10, 200, 50, 1, 3, 85)
-    """, (game_id,))
-
-    # Meridian Waystation - orbiting Meridian at T20, above Meridian Harbour
-    c.execute("""
-        INSERT INTO starbases 
-        (base_id, game_id, name, base_type, system_id, grid_col, grid_row, orbiting_body_id,
-         surface_port_id, complexes, workers, troops, has_market, docking_capacity, employees)
-        VALUES (78901234, ?, 'Meridian Waystation', 'Starbase', 101, 'T', 20, 412003,
-                30100003, 8, 150, 30, 1, 3, 75)
-    """, (game_id,))
+        VALUES (?, ?, ?, 'Starbase', 101, ?, ?, ?, ?, ?, ?, ?, 1, ?, ?)
+    """, [(base_id, game_id, *rest) for base_id, *rest in _STARBASE_SEED])
 
     # =============================================
     # OUTPOSTS (lightweight surface installations)
     # =============================================
-
-    # Callyx Relay (on Callyx moon, 11x11 grid)
-    c.execute("""
+    c.executemany("""
         INSERT INTO outposts
         (outpost_id, game_id, name, body_id, surface_x, surface_y,
          outpost_type, workers, employees)
-        VALUES (40100001, ?, 'Callyx Relay', 88341, 6, 6,
-                'Communications', 15, 10)
-    """, (game_id,))
-
-    # Tartarus Mining Camp (on Tartarus, 25x25 grid)
-    c.execute("""
-        INSERT INTO outposts
-        (outpost_id, game_id, name, body_id, surface_x, surface_y,
-         outpost_type, workers, employees)
-        VALUES (40100002, ?, 'Tartarus Mining Camp', 301442, 8, 19,
-                'Mining', 30, 25)
-    """, (game_id,))
+        VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+    """, [(outpost_id, game_id, *rest) for outpost_id, *rest in _OUTPOST_SEED])
 
     # =============================================
     # BASE MODULES (installed on starbases/ports/outposts)
@@ -372,21 +342,10 @@ def create_game(db_path=None, game_id="OMICRON101", game_name="Stellar Dominion
         (None, None, 40100002, 500, 1),   # Command Module
         (None, None, 40100002, 520, 1),   # Mining Rig
     ]
-    for sb, sp, op, mod_id, qty in base_module_installs:
-        c.execute("""
-            INSERT INTO installed_modules (starbase_id, port_id, outpost_id, module_id, quantity)
-            VALUES (?, ?, ?, ?, ?)
-        """, (sb, sp, op, mod_id, qty))
-
-    # Recalculate all base stats from modules
-    conn.commit()
-    from db.database import recalculate_base_stats
-    for base_id in [45687590, 12340001, 78901234]:
-        recalculate_base_stats(conn, starbase_id=base_id)
-    for port_id in [30100001, 30100002, 30100003]:
-        recalculate_base_stats(conn, port_id=port_id)
-    for outpost_id in [40100001, 40100002]:
-        recalculate_base_stats(conn, outpost_id=outpost_id)
+    c.executemany("""
+        INSERT INTO installed_modules (starbase_id, port_id, outpost_id, module_id, quantity)
+        VALUES (?, ?, ?, ?, ?)
+    """, base_module_installs)
 
     # =============================================
     # TRADE GOODS & MARKET CONFIGURATION
@@ -397,11 +356,10 @@ def create_game(db_path=None, game_id="OMICRON101", game_name="Stellar Dominion
         (100103, 'Meridian Food Supplies', 30, 3, 101),
         (401, 'Human Crew', 5, 1, None),
     ]
-    for item in trade_goods:
-        c.execute("""
-            INSERT OR IGNORE INTO trade_goods (item_id, name, base_price, mass_per_unit, origin_system_id)
-            VALUES (?, ?, ?, ?, ?)
-        """, item)
+    c.executemany("""
+        INSERT OR IGNORE INTO trade_goods (item_id, name, base_price, mass_per_unit, origin_system_id)
+        VALUES (?, ?, ?, ?, ?)
+    """, trade_goods)
 
     # Planetary resources (GM-only, not visible to players)
     # These are separate from trade goods. When mined, they produce the linked item.
@@ -410,11 +368,10 @@ def create_game(db_path=None, game_id="OMICRON101", game_name="Stellar Dominion
         (200002, 'Silicon Lattice Crystals', 'High-purity crystalline structures for computation', 100102),
         (200003, 'Fertile Biomass', 'Nutrient-dense organic matter supporting agriculture', 100103),
     ]
-    for res in resources:
-        c.execute("""
-            INSERT OR IGNORE INTO resources (resource_id, name, description, produces_item_id)
-            VALUES (?, ?, ?, ?)
-        """, res)
+    c.executemany("""
+        INSERT OR IGNORE INTO resources (resource_id, name, description, produces_item_id)
+        VALUES (?, ?, ?, ?)
+    """, resources)
 
     # Base trade roles: (base_id, item_id, role)
     # Citadel:  produces Orion Computer Cores, average Food, demands Precious Metals
@@ -434,17 +391,24 @@ def create_game(db_path=None, game_id="OMICRON101", game_name="Stellar Dominion
         (78901234, 100103, 'produces'),
         (78901234, 401, 'average'),
     ]
-    for base_id, item_id, role in base_trade:
-        c.execute("""
-            INSERT INTO base_trade_config (base_id, game_id, item_id, trade_role)
-            VALUES (?, ?, ?, ?)
-        """, (base_id, game_id, item_id, role))
+    c.executemany("""
+        INSERT INTO base_trade_config (base_id, game_id, item_id, trade_role)
+        VALUES (?, ?, ?, ?)
+    """, [(base_id, game_id, item_id, role) for base_id, item_id, role in base_trade])
 
-    conn.commit()
+    # Recalculate all base stats from modules
+    from db.database import recalculate_base_stats
+    for base_id in [45687590, 12340001, 78901234]:
+        recalculate_base_stats(conn, starbase_id=base_id)
+    for port_id in [30100001, 30100002, 30100003]:
+        recalculate_base_stats(conn, port_id=port_id)
+    for outpost_id in [40100001, 40100002]:
+        recalculate_base_stats(conn, outpost_id=outpost_id)
 
     # Generate initial week's market prices
     generate_market_prices(conn, game_id, 500, 1)
 
+    conn.commit()
     conn.close()
 
     # Create turn folder skeleton
@@ -452,8 +416,11 @@ def create_game(db_path=None, game_id="OMICRON101", game_name="Stellar Dominion
     turns_dir = db_dir / "turns"
     incoming = turns_dir / "incoming"
     processed = turns_dir / "processed"
-    incoming.mkdir(parents=True, exist_ok=True)
-    processed.mkdir(parents=True, exist_ok=True)
+    # A stat is enough once the folders exist (repeat setups); exist_ok
+    # still covers another process creating them in between
+    for folder in (incoming, processed):
+        if not folder.exists():
+            folder.mkdir(parents=True, exist_ok=True)
 
     print(f"Game '{game_name}' ({game_id}) created successfully.")
     print(f"  System: Omicron (101)")
@@ -635,6 +602,10 @@ def add_player(db_path=None, game_id="OMICRON101", player_name="Player 1",
         conn.close()
         return None
 
+    # Take the write lock before picking IDs so the whole player setup is
+    # one transaction
+    conn.execute("BEGIN IMMEDIATE")
+
     # Generate unique IDs
     account_number = _generate_account_number(conn)
     prefect_id = _generate_unique_id(conn, 'prefects', 'prefect_id')
@@ -647,7 +618,8 @@ def add_player(db_path=None, game_id="OMICRON101", player_name="Player 1",
     orbiting_body = None
     if dock_at_base:
         base = c.execute(
-            "SELECT * FROM starbases WHERE base_id = ? AND game_id = ?",
+            "SELECT grid_col, grid_row, system_id, orbiting_body_id FROM starbases "
+            "WHERE base_id = ? AND game_id = ? LIMIT 1",
             (dock_at_base, game_id)
         ).fetchone()
         if base:
@@ -674,11 +646,11 @@ def add_player(db_path=None, game_id="OMICRON101", player_name="Player 1",
             print(f"Warning: Body {start_orbit_body} not found, using default position.")
 
     # Create player
-    c.execute("""
+    player_id = c.execute("""
         INSERT INTO players (game_id, player_name, email, account_number)
         VALUES (?, ?, ?, ?)
-    """, (game_id, player_name, email, account_number))
-    player_id = c.lastrowid
+        RETURNING player_id
+    """, (game_id, player_name, email, account_number)).fetchone()[0]
 
     # Create prefect
     c.execute("""
@@ -719,16 +691,10 @@ def add_player(db_path=None, game_id="OMICRON101", player_name="Player 1",
         (ship_id, 150, 5),    # Basic Sensor Array ×5 (25 sensor rating)
         (ship_id, 160, 1),    # Jump Drive Mk1 ×1 (range 5, 50 OC)
     ]
-    for sid, comp_id, qty in starting_components:
-        c.execute("""
-            INSERT INTO installed_items (ship_id, component_id, quantity)
-            VALUES (?, ?, ?)
-        """, (sid, comp_id, qty))
-
-    # Recalculate ship stats from installed components
-    conn.commit()
-    from db.database import recalculate_ship_stats
-    recalculate_ship_stats(conn, ship_id)
+    c.executemany("""
+        INSERT INTO installed_items (ship_id, component_id, quantity)
+        VALUES (?, ?, ?)
+    """, starting_components)
 
     # Add starting crew as cargo (Human Crew item 401) - mass 0 as crew use life support
     # 60 crew + 1 captain = 61 total (well above the 25 required for size 50)
@@ -740,6 +706,10 @@ def add_player(db_path=None, game_id="OMICRON101", player_name="Player 1",
     # Sync crew_count
     c.execute("UPDATE ships SET crew_count = 61 WHERE ship_id = ?", (ship_id,))
 
+    # Recalculate ship stats from installed components
+    from db.database import recalculate_ship_stats
+    recalculate_ship_stats(conn, ship_id)
+
     conn.commit()
     conn.close()
 
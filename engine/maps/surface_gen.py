@@ -47,6 +47,12 @@ TERRAIN_SYMBOLS = {
     'Gas':        '*',
 }
 
+# One byte per tile when a surface is stored: the code is the terrain's
+# position in TERRAIN_SYMBOLS (append new terrain types, never reorder)
+TERRAIN_NAMES = list(TERRAIN_SYMBOLS)
+TERRAIN_CODES = {name: code for code, name in enumerate(TERRAIN_NAMES)}
+NO_TILE = 0xFF
+
 
 def _get_size(body):
     """Extract grid size from body, clamped to valid range."""
@@ -449,25 +455,58 @@ def render_surface_map(tiles, body_name, body_id, planetary_data=None, ship_pos=
     return lines
 
 
+def encode_surface(tiles):
+    """
+    Pack (x, y, terrain_type) tiles into (size, bytes): one terrain code per
+    tile, row by row from y=1. Positions with no tile hold NO_TILE.
+    """
+    size = max(max(t[0] for t in tiles), max(t[1] for t in tiles)) if tiles else 0
+    packed = bytearray([NO_TILE]) * (size * size)
+    for x, y, terrain in tiles:
+        packed[(y - 1) * size + (x - 1)] = TERRAIN_CODES[terrain]
+    return size, bytes(packed)
+
+
+def decode_surface(size, packed):
+    """Unpack a stored surface back into (x, y, terrain_type) tiles, ordered by y, x."""
+    return [(i % size + 1, i // size + 1, TERRAIN_NAMES[code])
+            for i, code in enumerate(packed) if code != NO_TILE]
+
+
 def store_surface(conn, body_id, tiles):
     """Store generated surface tiles to database."""
-    conn.execute("DELETE FROM planet_surface WHERE body_id = ?", (body_id,))
-    conn.executemany(
-        "INSERT INTO planet_surface (body_id, x, y, terrain_type) VALUES (?, ?, ?, ?)",
-        [(body_id, x, y, t) for x, y, t in tiles]
+    size, packed = encode_surface(tiles)
+    conn.execute(
+        "INSERT OR REPLACE INTO planet_surface (body_id, size, tiles) VALUES (?, ?, ?)",
+        (body_id, size, packed)
     )
     conn.commit()
 
 
+def load_surface(conn, body_id):
+    """Stored surface tiles for a body, or None if it has no terrain yet."""
+    row = conn.execute(
+        "SELECT size, tiles FROM planet_surface WHERE body_id = ?", (body_id,)
+    ).fetchone()
+    return decode_surface(row[0], row[1]) if row else None
+
+
+def terrain_at(conn, body_id, x, y):
+    """Terrain type of one stored tile, or None if there is none."""
+    row = conn.execute(
+        "SELECT size, tiles FROM planet_surface WHERE body_id = ?", (body_id,)
+    ).fetchone()
+    if not row or not (1 <= x <= row[0] and 1 <= y <= row[0]):
+        return None
+    code = row[1][(y - 1) * row[0] + (x - 1)]
+    return None if code == NO_TILE else TERRAIN_NAMES[code]
+
+
 def get_or_generate_surface(conn, body):
     """Get surface from DB, or generate and store it."""
-    existing = conn.execute(
-        "SELECT x, y, terrain_type FROM planet_surface WHERE body_id = ? ORDER BY y, x",
-        (body['body_id'],)
-    ).fetchall()
-
+    existing = load_surface(conn, body['body_id'])
     if existing:
-        return [(r['x'], r['y'], r['terrain_type']) for r in existing]
+        return existing
 
     tiles = generate_surface(body)
     store_surface(conn, body['body_id'], tiles)
@@ -4,7 +4,8 @@ Generates Phoenix-BSE-style ASCII turn reports for email delivery.
 """
 
 from datetime import datetime
-from db.database import get_connection, get_faction, faction_display_name, get_faction_for_prefect
+from db.database import get_connection, get_reader, get_faction, find_faction, get_faction_for_prefect
+from engine.maps.surface_gen import terrain_at
 
 
 REPORT_WIDTH = 78
@@ -119,7 +120,7 @@ def generate_ship_report(turn_result, db_path=None, game_id="OMICRON101",
     turn_result: dict from TurnResolver.resolve_ship_turn()
     between_turn_messages: optional list of strings to show in between-turn section
     """
-    conn = get_connection(db_path)
+    conn = get_reader(db_path)
 
     ship_id = turn_result['ship_id']
     ship_name = turn_result['ship_name']
@@ -149,7 +150,8 @@ def generate_ship_report(turn_result, db_path=None, game_id="OMICRON101",
         "SELECT * FROM cargo_items WHERE ship_id = ? AND item_type_id != 401", (ship_id,)
     ).fetchall()
     contacts = conn.execute(
-        "SELECT * FROM known_contacts WHERE prefect_id = ? AND location_system = ?",
+        "SELECT * FROM known_contacts WHERE prefect_id = ? AND location_system = ? "
+        "ORDER BY contact_id",
         (ship['owner_prefect_id'], system_id)
     ).fetchall()
 
@@ -184,11 +186,8 @@ def generate_ship_report(turn_result, db_path=None, game_id="OMICRON101",
             lx = turn_result.get('landed_x', 1)
             ly = turn_result.get('landed_y', 1)
             # Look up terrain at landing site
-            terrain_row = conn.execute(
-                "SELECT terrain_type FROM planet_surface WHERE body_id = ? AND x = ? AND y = ?",
-                (turn_result['landed'], lx, ly)
-            ).fetchone()
-            terrain_str = f" - {terrain_row['terrain_type']}" if terrain_row else ""
+            terrain = terrain_at(conn, turn_result['landed'], lx, ly)
+            terrain_str = f" - {terrain}" if terrain else ""
             landed_name = (f"{body['body_type'].title()} {body['name']} ({body['body_id']}) "
                           f"[{body['gravity']}g] at ({lx},{ly}){terrain_str}")
 
@@ -198,7 +197,7 @@ def generate_ship_report(turn_result, db_path=None, game_id="OMICRON101",
     final_loc = f"{turn_result['final_col']}{turn_result['final_row']:02d}"
     faction = get_faction(conn, prefect['faction_id']) if prefect else {'abbreviation': 'IND', 'name': 'Independent'}
     faction_str = faction['name']
-    display_name = faction_display_name(conn, ship_name, prefect['faction_id']) if prefect else ship_name
+    display_name = f"{faction['abbreviation']} {ship_name}" if prefect else ship_name
 
     # Look up player account number
     player = conn.execute(
@@ -266,11 +265,8 @@ def generate_ship_report(turn_result, db_path=None, game_id="OMICRON101",
         if start_body:
             slx = turn_result.get('start_landed_x', 1)
             sly = turn_result.get('start_landed_y', 1)
-            terrain_row = conn.execute(
-                "SELECT terrain_type FROM planet_surface WHERE body_id = ? AND x = ? AND y = ?",
-                (start_landed, slx, sly)
-            ).fetchone()
-            terrain_str = f" - {terrain_row['terrain_type']}" if terrain_row else ""
+            terrain = terrain_at(conn, start_landed, slx, sly)
+            terrain_str = f" - {terrain}" if terrain else ""
             lines.append(f"    Landed on {start_body['body_type'].title()} {start_body['name']} "
                           f"({start_body['body_id']}) [{start_body['gravity']}g] "
                           f"at ({slx},{sly}){terrain_str} - {ss_name} System ({ss_id})")
@@ -612,9 +608,9 @@ def generate_ship_report(turn_result, db_path=None, game_id="OMICRON101",
                     return f"{r['name']} (base {entry_id})"
             return f"base {entry_id}"
         if entry_type == 'faction':
-            r = conn.execute("SELECT name FROM factions WHERE faction_id = ?", (entry_id,)).fetchone()
-            if r:
-                return f"{r['name']} (faction {entry_id})"
+            faction = find_faction(conn, entry_id)
+            if faction:
+                return f"{faction['name']} (faction {entry_id})"
             return f"faction {entry_id}"
         return f"{entry_type} {entry_id}"
 
@@ -1317,8 +1313,8 @@ def generate_base_report(base_type, base_id, db_path=None, game_id="OMICRON101",
                     return f"{r['name']} (base {entry_id})"
             return f"base {entry_id}"
         if entry_type == 'faction':
-            r = conn.execute("SELECT name FROM factions WHERE faction_id = ?", (entry_id,)).fetchone()
-            return f"{r['name']} (faction {entry_id})" if r else f"faction {entry_id}"
+            faction = find_faction(conn, entry_id)
+            return f"{faction['name']} (faction {entry_id})" if faction else f"faction {entry_id}"
         return f"{entry_type} {entry_id}"
 
     lines.append(section_header("Combat Lists"))
@@ -1444,7 +1440,7 @@ def generate_prefect_report(prefect_id, db_path=None, game_id="OMICRON101",
     
     trade_summary: {ship_id: {'income': N, 'expenses': N, 'trades': [...]}}
     """
-    conn = get_connection(db_path)
+    conn = get_reader(db_path)
 
     prefect = conn.execute(
         "SELECT * FROM prefects WHERE prefect_id = ?",
@@ -1540,7 +1536,7 @@ def generate_prefect_report(prefect_id, db_path=None, game_id="OMICRON101",
             (prefect['location_id'],)
         ).fetchone()
         if loc_ship:
-            ship_display = faction_display_name(conn, loc_ship['name'], prefect['faction_id'])
+            ship_display = f"{faction['abbreviation']} {loc_ship['name']}"
             if loc_ship['docked_at_base_id']:
                 base = conn.execute("SELECT * FROM starbases WHERE base_id = ?",
                                      (loc_ship['docked_at_base_id'],)).fetchone()
@@ -1626,7 +1622,7 @@ def generate_prefect_report(prefect_id, db_path=None, game_id="OMICRON101",
         net = income - expenses
         total_income += income
         total_expenses += expenses
-        ship_display = faction_display_name(conn, s['name'], prefect['faction_id'])
+        ship_display = f"{faction['abbreviation']} {s['name']}"
         lines.append(section_line(
             f"{ship_display} ({s['ship_id']})".ljust(38) +
             f"{income:>8,}  {expenses:>8,}  {net:>8,}"
@@ -1651,7 +1647,7 @@ def generate_prefect_report(prefect_id, db_path=None, game_id="OMICRON101",
     lines.append(section_line())
     for s in ships:
         loc = f"{s['grid_col']}{s['grid_row']:02d}"
-        ship_display = faction_display_name(conn, s['name'], prefect['faction_id'])
+        ship_display = f"{faction['abbreviation']} {s['name']}"
         dock_info = ""
         if s['docked_at_base_id']:
             base = conn.execute("SELECT name FROM starbases WHERE base_id = ?",
@@ -8,7 +8,7 @@ import hashlib
 import heapq
 import math
 from datetime import datetime
-from db.database import get_connection, get_faction
+from db.database import get_connection, get_faction, get_factions_bulk, tuple_cursor
 from engine.maps.system_map import (
     col_to_index, index_to_col, grid_distance, render_system_map, render_location_scan
 )
@@ -678,31 +678,33 @@ class TurnResolver:
             })
 
         # Celestial bodies
-        bodies = self.conn.execute(
-            "SELECT * FROM celestial_bodies WHERE system_id = ?", (system_id,)
-        ).fetchall()
-        for b in bodies:
+        for body_type, body_id, name, col, row, symbol in tuple_cursor(self.conn).execute(
+            """SELECT body_type, body_id, name, grid_col, grid_row, map_symbol
+               FROM celestial_bodies WHERE system_id = ?
+               ORDER BY body_id""", (system_id,)
+        ):
             objects.append({
-                'type': b['body_type'], 'id': b['body_id'],
-                'name': b['name'],
-                'col': b['grid_col'], 'row': b['grid_row'],
-                'symbol': b['map_symbol']
+                'type': body_type, 'id': body_id,
+                'name': name,
+                'col': col, 'row': row,
+                'symbol': symbol
             })
 
         # Bases (active only; destroyed bases are wreckage and don't appear
         # in scan object listings)
-        bases = self.conn.execute(
-            """SELECT * FROM starbases WHERE system_id = ? AND game_id = ?
-                 AND (status IS NULL OR status = 'active')""",
+        for base_id, name, col, row, base_type in tuple_cursor(self.conn).execute(
+            """SELECT base_id, name, grid_col, grid_row, base_type
+               FROM starbases WHERE system_id = ? AND game_id = ?
+                 AND (status IS NULL OR status = 'active')
+               ORDER BY base_id""",
             (system_id, self.game_id)
-        ).fetchall()
-        for base in bases:
+        ):
             objects.append({
-                'type': 'base', 'id': base['base_id'],
-                'name': base['name'],
-                'col': base['grid_col'], 'row': base['grid_row'],
+                'type': 'base', 'id': base_id,
+                'name': name,
+                'col': col, 'row': row,
                 'symbol': 'B',
-                'base_type': base['base_type']
+                'base_type': base_type
             })
 
         # Other ships (exclude suspended players' ships)
@@ -710,12 +712,14 @@ class TurnResolver:
             """SELECT s.*, pp.faction_id FROM ships s
                JOIN prefects pp ON s.owner_prefect_id = pp.prefect_id
                JOIN players p ON pp.player_id = p.player_id
-               WHERE s.system_id = ? AND s.game_id = ? AND p.status = 'active'""",
+               WHERE s.system_id = ? AND s.game_id = ? AND p.status = 'active'
+               ORDER BY s.ship_id""",
             (system_id, self.game_id)
         ).fetchall()
+        factions = get_factions_bulk(self.conn, (s['faction_id'] for s in ships))
         for s in ships:
             # Build faction-prefixed display name
-            faction = self._get_faction(s['faction_id'])
+            faction = factions[s['faction_id']]
             display_name = f"{faction['abbreviation']} {s['name']}"
             objects.append({
                 'type': 'ship', 'id': s['ship_id'],
@@ -1264,14 +1268,16 @@ class TurnResolver:
                    JOIN players p ON pp.player_id = p.player_id
                    WHERE s.system_id = ? AND s.game_id = ?
                      AND p.status = 'active'
-                     AND s.ship_id != ?""",
+                     AND s.ship_id != ?
+                   ORDER BY s.ship_id""",
                 (system_id, self.game_id, ship_id)
             ).fetchall()
 
             candidate_starbases = self.conn.execute(
                 """SELECT *, 'starbase' AS kind, base_id FROM starbases
                    WHERE system_id = ? AND game_id = ?
-                     AND (status IS NULL OR status = 'active')""",
+                     AND (status IS NULL OR status = 'active')
+                   ORDER BY base_id""",
                 (system_id, self.game_id)
             ).fetchall()
 
@@ -1285,13 +1291,15 @@ class TurnResolver:
                 ports = self.conn.execute(
                     """SELECT *, 'port' AS kind, port_id AS base_id FROM surface_ports
                        WHERE body_id = ? AND game_id = ?
-                         AND (status IS NULL OR status = 'active')""",
+                         AND (status IS NULL OR status = 'active')
+                       ORDER BY port_id""",
                     (orbit_body, self.game_id)
                 ).fetchall()
                 outposts = self.conn.execute(
                     """SELECT *, 'outpost' AS kind, outpost_id AS base_id FROM outposts
                        WHERE body_id = ? AND game_id = ?
-                         AND (status IS NULL OR status = 'active')""",
+                         AND (status IS NULL OR status = 'active')
+                       ORDER BY outpost_id""",
                     (orbit_body, self.game_id)
                 ).fetchall()
                 for p in ports:
@@ -2096,13 +2104,12 @@ class TurnResolver:
 
         # Find all neighbours of current system
         neighbours = set()
-        for r in self.conn.execute(
+        for system_a, system_b in tuple_cursor(self.conn).execute(
             "SELECT system_a, system_b FROM system_links "
             "WHERE system_a = ? OR system_b = ?",
             (sys_id, sys_id)
-        ).fetchall():
-            other = r['system_b'] if r['system_a'] == sys_id else r['system_a']
-            neighbours.add(other)
+        ):
+            neighbours.add(system_b if system_a == sys_id else system_a)
 
         # Categorise each neighbour: already known vs newly discovered
         from db.database import prefect_knows, grant_knowledge
@@ -4532,9 +4539,8 @@ class TurnResolver:
         for kind, table, id_col in [
             ('starbase', 'starbases', 'base_id'),
         ]:
-            cols = [r[1] for r in self.conn.execute(f"PRAGMA table_info({table})").fetchall()]
-            if 'grid_col' not in cols or 'grid_row' not in cols:
-                continue
+            # grid_col / grid_row are NOT NULL columns of every table listed
+            # here, so no per-scan schema probe is needed
             rows = self.conn.execute(
                 f"SELECT *, '{kind}' AS kind, {id_col} AS base_id FROM {table} WHERE system_id = ? AND game_id = ?",
                 (active_system, self.game_id)
@@ -4563,6 +4569,7 @@ class TurnResolver:
         game = self.get_game()
 
         # --- 3. Active ship rolls to detect each candidate ---
+        factions = get_factions_bulk(self.conn, (s['faction_id'] for s in candidate_ships))
         for s in candidate_ships:
             dist = grid_distance(active_col, active_row,
                                   s['grid_col'], s['grid_row'])
@@ -4571,7 +4578,7 @@ class TurnResolver:
             target_profile = s['sensor_profile'] or (s['ship_size'] / 100.0 if s['ship_size'] else 0.5)
             spotted, _chance = try_detect(active_rating, target_profile, dist)
             if spotted:
-                faction = self._get_faction(s['faction_id'])
+                faction = factions[s['faction_id']]
                 display_name = f"{faction['abbreviation']} {s['name']}"
                 contact = {
                     'type': 'ship', 'id': s['ship_id'],
@@ -4820,7 +4827,7 @@ class TurnResolver:
         Writes detections directly to known_contacts.
         """
         ships = self.conn.execute(
-            "SELECT * FROM ships WHERE game_id = ?", (self.game_id,)
+            "SELECT * FROM ships WHERE game_id = ? ORDER BY ship_id", (self.game_id,)
         ).fetchall()
 
         for s in ships:
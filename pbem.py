@@ -25,7 +25,7 @@ from datetime import datetime
 # Add project root to path
 sys.path.insert(0, str(Path(__file__).parent))
 
-from db.database import init_db, get_connection, get_faction, faction_display_name, backup_state, split_legacy_db, migrate_db
+from db.database import init_db, get_connection, get_faction, find_faction, get_faction_for_prefect, get_factions_bulk, faction_display_name, backup_state, split_legacy_db, migrate_db
 from db.universe_admin import add_system, add_body, add_link, add_trade_good, list_universe
 from engine.game_setup import create_game, add_player, setup_demo_game, join_game, suspend_player, reinstate_player, list_players
 from engine.orders.parser import parse_orders_file, parse_yaml_orders, parse_text_orders
@@ -367,34 +367,23 @@ def _resolve_setprice(conn, subject_type, subject_id, params, game_id, price_typ
     cycle_week = ((game['current_week'] - 1) // cycle_length) * cycle_length + 1
     cycle_year = game['current_year']
 
-    # Find or create market_prices row
-    mp = conn.execute("""
-        SELECT price_id FROM market_prices
+    # Set the price on this cycle's row. market_prices keeps one row per base
+    # and item, so a row left from an earlier cycle is reset to this one.
+    column = 'buy_price' if price_type == 'buy' else 'sell_price'
+    conn.execute("""
+        INSERT INTO market_prices (game_id, base_id, item_id, turn_year, turn_week,
+            buy_price, sell_price, stock, demand)
+        VALUES (?, ?, ?, ?, ?, 0, 0, 0, 0)
+        ON CONFLICT (game_id, base_id, item_id) DO UPDATE SET
+            turn_year = excluded.turn_year, turn_week = excluded.turn_week,
+            buy_price = excluded.buy_price, sell_price = excluded.sell_price,
+            stock = excluded.stock, demand = excluded.demand
+        WHERE turn_year != excluded.turn_year OR turn_week != excluded.turn_week
+    """, (game_id, market_base_id, item_id, cycle_year, cycle_week))
+    conn.execute(f"""
+        UPDATE market_prices SET {column} = ?
         WHERE game_id = ? AND base_id = ? AND item_id = ?
-          AND turn_year = ? AND turn_week = ?
-    """, (game_id, market_base_id, item_id, cycle_year, cycle_week)).fetchone()
-
-    if mp:
-        if price_type == 'buy':
-            conn.execute("UPDATE market_prices SET buy_price = ? WHERE price_id = ?",
-                         (price, mp['price_id']))
-        else:
-            conn.execute("UPDATE market_prices SET sell_price = ? WHERE price_id = ?",
-                         (price, mp['price_id']))
-    else:
-        # Create new price entry
-        if price_type == 'buy':
-            conn.execute("""
-                INSERT INTO market_prices (game_id, base_id, item_id, turn_year, turn_week,
-                    buy_price, sell_price, stock, demand)
-                VALUES (?, ?, ?, ?, ?, ?, 0, 0, 0)
-            """, (game_id, market_base_id, item_id, cycle_year, cycle_week, price))
-        else:
-            conn.execute("""
-                INSERT INTO market_prices (game_id, base_id, item_id, turn_year, turn_week,
-                    buy_price, sell_price, stock, demand)
-                VALUES (?, ?, ?, ?, ?, 0, ?, 0, 0)
-            """, (game_id, market_base_id, item_id, cycle_year, cycle_week, price))
+    """, (price, game_id, market_base_id, item_id))
 
     # Ensure base_trade_config exists
     btc = conn.execute(
@@ -482,11 +471,7 @@ def cmd_run_turn(args):
         ship_id = ship['ship_id']
         prefect_id = ship['owner_prefect_id']
 
-        prefect = conn.execute(
-            "SELECT faction_id FROM prefects WHERE prefect_id = ?",
-            (prefect_id,)
-        ).fetchone()
-        faction = get_faction(conn, prefect['faction_id']) if prefect else {'abbreviation': 'IND'}
+        faction = get_faction_for_prefect(conn, prefect_id)
         display_name = f"{faction['abbreviation']} {ship['name']}"
         account_number = folders.get_account_for_prefect(prefect_id)
 
@@ -2086,8 +2071,9 @@ def cmd_list_ships(args):
         print(f"\nShips in game {args.game}:")
         print(f"{'ID':<12} {'Name':<24} {'Owner':<16} {'System':<14} {'Position':<10} {'State':<28} {'OC'}")
         print("-" * 120)
+        factions = get_factions_bulk(conn, (s['faction_id'] for s in ships))
         for s in ships:
-            faction = get_faction(conn, s['faction_id'])
+            faction = factions.get(s['faction_id'])
             fac = faction['abbreviation'] if faction else '?'
             display_name = f"{fac} {s['name']}"
             if len(display_name) > 23:
@@ -2328,8 +2314,7 @@ def cmd_add_gm_prefect(args):
           game['current_year'], game['current_week']))
     conn.commit()
 
-    faction = conn.execute("SELECT abbreviation, name FROM factions WHERE faction_id = ?",
-                            (args.faction,)).fetchone()
+    faction = find_faction(conn, args.faction)
     faction_str = f"{faction['abbreviation']} - {faction['name']}" if faction else str(args.faction)
 
     # List how many GM prefects exist now
@@ -2431,9 +2416,7 @@ def cmd_add_gm_ship(args):
     )
     conn.commit()
 
-    faction = conn.execute(
-        "SELECT abbreviation FROM factions WHERE faction_id = ?", (prefect['faction_id'],)
-    ).fetchone()
+    faction = find_faction(conn, prefect['faction_id'])
     fac = faction['abbreviation'] if faction else 'IND'
 
     print(f"GM ship created:")
@@ -3210,7 +3193,7 @@ def cmd_regen_surface(args):
 
     # Delete existing surface data
     old_count = conn.execute(
-        "SELECT COUNT(*) FROM planet_surface WHERE body_id = ?", (args.body_id,)
+        "SELECT COALESCE(SUM(length(tiles)), 0) FROM planet_surface WHERE body_id = ?", (args.body_id,)
     ).fetchone()[0]
 
     conn.execute("DELETE FROM planet_surface WHERE body_id = ?", (args.body_id,))
@@ -3264,7 +3247,7 @@ def cmd_gen_surfaces(args):
 def cmd_list_factions(args):
     """List all available factions."""
     from db.database import get_universe_connection
-    conn = get_universe_connection()
+    conn = get_universe_connection(readonly=True)
     factions = conn.execute("SELECT * FROM factions ORDER BY faction_id").fetchall()
     print(f"\nAvailable Factions:")
     print(f"{'ID':<6} {'Abbr':<6} {'Name':<30} Description")
@@ -3277,7 +3260,7 @@ def cmd_list_factions(args):
 def cmd_list_components(args):
     """List all ship components in the catalogue."""
     from db.database import get_universe_connection
-    conn = get_universe_connection()
+    conn = get_universe_connection(readonly=True)
     components = conn.execute("SELECT * FROM ship_components ORDER BY component_id").fetchall()
 
     cat_labels = {
@@ -3322,7 +3305,7 @@ def cmd_list_components(args):
 def cmd_list_modules(args):
     """List all base modules in the catalogue."""
     from db.database import get_universe_connection
-    conn = get_universe_connection()
+    conn = get_universe_connection(readonly=True)
     modules = conn.execute("SELECT * FROM base_modules ORDER BY module_id").fetchall()
 
     cat_labels = {
@@ -0,0 +1,33 @@
+"""Universe schema constraints."""
+
+import sqlite3
+
+import pytest
+
+from db.database import init_universe_db
+from db.universe_admin import add_trade_good
+
+
+@pytest.fixture
+def universe(tmp_path):
+    path = tmp_path / "universe.db"
+    init_universe_db(path).close()
+    return path
+
+
+def test_trade_good_rejects_non_integer_id(universe):
+    with pytest.raises(sqlite3.IntegrityError):
+        add_trade_good(universe, 'Widgets', 12, 1)
+
+
+def test_faction_rejects_non_integer_id(universe):
+    conn = sqlite3.connect(str(universe))
+    with pytest.raises(sqlite3.IntegrityError):
+        conn.execute("INSERT INTO factions (faction_id, abbreviation, name) "
+                      "VALUES ('X', 'XXX', 'Bad')")
+    conn.close()
+
+
+def test_integer_ids_still_accepted(universe):
+    assert add_trade_good(universe, None, 'Widgets', 12, 1) > 0
+    assert add_trade_good(universe, 9001, 'Gadgets', 5, 1) == 9001